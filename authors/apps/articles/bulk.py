@@ -0,0 +1,214 @@
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.utils.text import slugify
+
+from authors.apps.authentication.models import User
+from .cache import invalidate_articles
+from .models import SLUG_ATTEMPTS, ArticlesModel, Tags
+from .search import index_articles
+from .tag_stats import record_tagging
+from .serializers import ArticleImportSerializer
+
+# How many lines are imported per transaction and how many articles are
+# exported per round trip, which bounds the rows and lookups of each query
+CHUNK_SIZE = 500
+
+EXPORT_FIELDS = ('slug', 'title', 'description', 'body', 'image_url', 'created_at')
+
+ArticleTags = ArticlesModel.tags.through
+
+
+def parse_lines(lines):
+    """
+    Yields the line number and either the validated article or the errors
+    of every line of NDJSON in `lines` that is not blank
+    """
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as error:
+            yield number, None, {'line': ['Invalid JSON: {}'.format(error)]}
+            continue
+        if not isinstance(data, dict):
+            yield number, None, {'line': ['Expected a JSON object']}
+            continue
+        serializer = ArticleImportSerializer(data=data)
+        if serializer.is_valid():
+            yield number, serializer.validated_data, None
+        else:
+            yield number, None, serializer.errors
+
+
+def allocate_slugs(articles):
+    """
+    Gives every article its requested slug or the slug of its title, with a
+    random suffix when it is taken, looking them all up in one query.
+    Returns the slugs wanted.
+    """
+    wanted = [article.slug or slugify(article.title) for article in articles]
+    taken = set(ArticlesModel.objects.filter(slug__in=wanted).values_list('slug', flat=True))
+    for article, slug in zip(articles, wanted):
+        if not slug or slug in taken:
+            slug = ArticlesModel.suffix_slug(slug)
+        taken.add(slug)
+        article.slug = slug
+    return wanted
+
+
+def create_articles(numbers, articles, wanted):
+    """
+    Saves `articles` in bulk. Those whose slugs a concurrent writer took
+    meanwhile get another suffix and are tried again, and those still
+    clashing after SLUG_ATTEMPTS - 1 tries are left out. Returns the line
+    numbers and articles saved and the errors of those left out.
+    """
+    rows, errors = list(zip(numbers, articles, wanted)), []
+    for attempt in range(1, SLUG_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                ArticlesModel.objects.bulk_create([article for _, article, _ in rows])
+            break
+        except IntegrityError:
+            taken = set(ArticlesModel.objects.filter(
+                slug__in=[article.slug for _, article, _ in rows]).values_list('slug', flat=True))
+            if not taken or attempt == SLUG_ATTEMPTS:
+                raise
+        if attempt == SLUG_ATTEMPTS - 1:
+            errors = [
+                {'line': number, 'errors': {'slug': ['Could not allocate a free slug']}}
+                for number, article, _ in rows if article.slug in taken
+            ]
+            rows = [row for row in rows if row[1].slug not in taken]
+        for _, article, slug in rows:
+            if article.slug in taken:
+                article.slug = ArticlesModel.suffix_slug(slug)
+    return [number for number, _, _ in rows], [article for _, article, _ in rows], errors
+
+
+def import_chunk(rows, author=None):
+    """
+    Writes the validated `(line number, article)` rows in one transaction,
+    with a fixed number of queries however many rows there are unless slugs
+    are taken meanwhile. Returns the errors of rows naming an author who
+    does not exist or left without a free slug.
+    """
+    usernames = {row['author'] for _, row in rows if 'author' in row}
+    authors = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+    numbers, articles, article_tags, dates, errors = [], [], [], [], []
+    for number, row in rows:
+        row = dict(row)
+        username = row.pop('author', None)
+        author_id = authors.get(username) if username else getattr(author, 'pk', None)
+        if author_id is None:
+            errors.append({'line': number, 'errors': {'author': ['No such author']}})
+            continue
+        article_tags.append([slugify(tag) for tag in row.pop('tags', [])])
+        # Saving stamps articles with the time they are saved, so the dates
+        # of exported articles are written afterwards
+        dates.append(row.pop('created_at', None))
+        article = ArticlesModel(author_id=author_id, **row)
+        article.update_reading_time()
+        numbers.append(number)
+        articles.append(article)
+    if not articles:
+        return errors
+
+    with transaction.atomic():
+        wanted = allocate_slugs(articles)
+        tags = {tag.tag: tag for tag in Tags.objects.resolve(
+            name for names in article_tags for name in names)}
+        # Saving in bulk sends no post_save, so imported articles are not
+        # announced to followers nor written into their feeds
+        tags_of, dates_of = dict(zip(numbers, article_tags)), dict(zip(numbers, dates))
+        numbers, articles, slug_errors = create_articles(numbers, articles, wanted)
+        errors.extend(slug_errors)
+        article_tags = [tags_of[number] for number in numbers]
+        ids = dict(ArticlesModel.objects.filter(
+            slug__in=[article.slug for article in articles]).values_list('slug', 'id'))
+        dated = [
+            (article, dates_of[number]) for number, article in zip(numbers, articles)
+            if dates_of[number]
+        ]
+        if dated:
+            ArticlesModel.objects.filter(pk__in=[ids[article.slug] for article, _ in dated]).update(
+                created_at=models.Case(*(
+                    models.When(pk=ids[article.slug], then=models.Value(date))
+                    for article, date in dated
+                ), output_field=models.DateTimeField()))
+            for article, date in dated:
+                article.created_at = date
+        ArticleTags.objects.bulk_create([
+            ArticleTags(articlesmodel_id=ids[article.slug], tags_id=tags[name].pk)
+            for article, names in zip(articles, article_tags)
+            for name in set(names)
+        ])
+        record_tagging([
+            (tags[name].pk, article.created_at.date())
+            for article, names in zip(articles, article_tags)
+            for name in set(names)
+        ])
+        index_articles(list(ArticlesModel.objects.filter(pk__in=ids.values()).select_related(
+            'author').prefetch_related('tags').defer('search_vector')))
+    invalidate_articles()
+    return errors
+
+
+def import_articles(lines, author=None, chunk_size=CHUNK_SIZE):
+    """
+    Imports the articles in the NDJSON `lines` chunk by chunk. Lines may
+    name the username of their author, the rest are written by `author`.
+    Returns how many articles were imported and the errors of every line
+    that was not.
+    """
+    imported, errors, rows = 0, [], []
+
+    def flush():
+        nonlocal imported
+        chunk_errors = import_chunk(rows, author)
+        imported += len(rows) - len(chunk_errors)
+        errors.extend(chunk_errors)
+        rows.clear()
+
+    for number, row, row_errors in parse_lines(lines):
+        if row_errors:
+            errors.append({'line': number, 'errors': row_errors})
+            continue
+        rows.append((number, row))
+        if len(rows) == chunk_size:
+            flush()
+    if rows:
+        flush()
+    return {'imported': imported, 'errors': errors}
+
+
+def export_articles(chunk_size=CHUNK_SIZE):
+    """
+    Yields every article as a line of NDJSON in the format `import_articles`
+    reads, streaming them from a server-side cursor and looking up the tags
+    of each chunk of articles in one query
+    """
+    rows = ArticlesModel.objects.order_by('pk').values(
+        'pk', 'author__username', *EXPORT_FIELDS
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        tags = defaultdict(list)
+        for article_id, tag in ArticleTags.objects.filter(
+            articlesmodel_id__in=[row['pk'] for row in chunk]
+        ).order_by('pk').values_list('articlesmodel_id', 'tags__tag'):
+            tags[article_id].append(tag)
+        for row in chunk:
+            article = {field: row[field] for field in EXPORT_FIELDS}
+            article['tags'] = tags[row['pk']]
+            article['author'] = row['author__username']
+            yield json.dumps(article, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,140 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag, urlencode
+
+# Every cached response is keyed by the version of what it shows, the time
+# that last changed, so that invalidating is a single write and stale
+# responses are simply never looked up again. Lists show any article.
+LIST_VERSION_KEY = 'articles:version:list'
+# Tag clouds and trending tags show the counts of every tag
+TAGS_VERSION_KEY = 'tags:version'
+
+
+def shared_cache():
+    """
+    Returns the cache responses and their versions are kept in, shared by
+    every process so that a write in one invalidates them in all
+    """
+    return caches[settings.ARTICLE_CACHE_ALIAS]
+
+
+def article_version_key(slug):
+    return 'articles:version:{}'.format(slug)
+
+
+def get_version(key):
+    """Returns the version stored under `key`, starting it if it is missing"""
+    cache = shared_cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_articles(*slugs):
+    """
+    Marks the cached responses showing the articles with these slugs, and
+    every cached list of articles, as stale
+    """
+    keys = [LIST_VERSION_KEY] + [article_version_key(slug) for slug in slugs]
+
+    def touch():
+        now = time.time()
+        shared_cache().set_many({key: now for key in keys}, None)
+
+    # Once more after commit, in case a reader cached the uncommitted state
+    touch()
+    transaction.on_commit(touch)
+
+
+def invalidate_tags():
+    """Marks every cached tag cloud and list of trending tags as stale"""
+    def touch():
+        shared_cache().set(TAGS_VERSION_KEY, time.time(), None)
+
+    touch()
+    transaction.on_commit(touch)
+
+
+# How many anonymous reads this process has served from the cache and
+# missed, kept in memory so that a hit writes nothing
+outcomes = Counter()
+outcomes_lock = threading.Lock()
+
+
+def count(outcome):
+    with outcomes_lock:
+        outcomes[outcome] += 1
+
+
+def cache_stats():
+    """
+    Returns how many anonymous reads the cache has served and missed in
+    this process
+    """
+    with outcomes_lock:
+        return {'hits': outcomes['hits'], 'misses': outcomes['misses']}
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Serves GET requests from readers who are not logged in from the cache
+    for up to ARTICLE_CACHE_TTL seconds, with an ETag and Last-Modified so
+    that clients can revalidate their own copy and get a 304 back.
+
+    Views return the key of the version of what they show from
+    `get_cache_version_key`, the list version unless overridden.
+    """
+
+    def get_cache_version_key(self, **kwargs):
+        return LIST_VERSION_KEY
+
+    def dispatch(self, request, *args, **kwargs):
+        anonymous = (
+            'HTTP_AUTHORIZATION' not in request.META and
+            not request.user.is_authenticated
+        )
+        if request.method != 'GET' or not anonymous or not settings.ARTICLE_CACHE_TTL:
+            return super().dispatch(request, *args, **kwargs)
+
+        version = get_version(self.get_cache_version_key(**kwargs))
+        url = '{}{}?{}'.format(
+            request.get_host(), request.path, urlencode(sorted(request.GET.lists()), doseq=True))
+        key = 'articles:response:{}:{}'.format(
+            version, hashlib.md5(url.encode('utf-8')).hexdigest())
+
+        cache = shared_cache()
+        entry = cache.get(key)
+        if entry is None:
+            count('misses')
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response.render()
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': quote_etag(hashlib.md5(response.content).hexdigest()),
+                'last_modified': int(version),
+            }
+            cache.set(key, entry, settings.ARTICLE_CACHE_TTL)
+            response['X-Cache'] = 'MISS'
+        else:
+            count('hits')
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+            response['X-Cache'] = 'HIT'
+
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        patch_vary_headers(response, ('Authorization',))
+        return get_conditional_response(
+            request, etag=entry['etag'], last_modified=entry['last_modified'], response=response)
@@ -0,0 +1,147 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from authors.apps.profiles.models import Profile
+from .models import ArticlesModel, TimelineEntry
+
+# How many of the latest articles of an author are written into the feed
+# of a reader who starts following them, older ones are not backfilled
+BACKFILL_ARTICLES = 100
+
+Follow = Profile.isfollowing.through
+
+
+def is_widely_followed(profile):
+    """
+    Whether the articles of `profile` are merged into feeds when read
+    rather than written into every feed when published
+    """
+    return profile.followers_count >= settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def add_entries(entries):
+    """
+    Writes timeline `entries`, skipping any a concurrent writer already
+    wrote
+    """
+    try:
+        with transaction.atomic():
+            TimelineEntry.objects.bulk_create(entries)
+    except IntegrityError:
+        for entry in entries:
+            TimelineEntry.objects.get_or_create(
+                owner_id=entry.owner_id, article_id=entry.article_id,
+                defaults={'created_at': entry.created_at})
+
+
+def fan_out_article(article):
+    """
+    Writes a new article into the feed of every follower of its author and
+    returns how many feeds it was written into, none if the author is
+    widely followed. Run by the `process_notifications` worker, off the
+    request publishing the article.
+    """
+    profile = Profile.objects.only('followers_count').get(user_id=article.author_id)
+    if is_widely_followed(profile):
+        return 0
+    followers = Follow.objects.filter(
+        to_profile=profile).values_list('from_profile__user_id', flat=True)
+    entries = [
+        TimelineEntry(owner_id=user_id, article_id=article.pk, created_at=article.created_at)
+        for user_id in followers
+    ]
+    add_entries(entries)
+    return len(entries)
+
+
+def backfill_follow(follower_id, author_id):
+    """
+    Writes the latest articles of the author with profile `author_id` into
+    the feed of the new follower with profile `follower_id`
+    """
+    follower, author = (
+        Profile.objects.only('user_id', 'followers_count').get(pk=pk)
+        for pk in (follower_id, author_id)
+    )
+    if is_widely_followed(author):
+        return
+    articles = ArticlesModel.objects.filter(author_id=author.user_id).exclude(
+        timeline_entries__owner_id=follower.user_id
+    ).order_by('-created_at', '-id').values_list('id', 'created_at')[:BACKFILL_ARTICLES]
+    add_entries([
+        TimelineEntry(owner_id=follower.user_id, article_id=pk, created_at=created_at)
+        for pk, created_at in articles
+    ])
+
+
+def drop_follow(follower_id, author_id):
+    """
+    Removes the articles of the author with profile `author_id` from the
+    feed of the former follower with profile `follower_id`. An author whose
+    followers drop back under FEED_FANOUT_MAX_FOLLOWERS stops being merged
+    into feeds when read, so their articles are written into the feeds of
+    the followers they have left.
+    """
+    TimelineEntry.objects.filter(
+        owner__profile=follower_id, article__author__profile=author_id).delete()
+    author = Profile.objects.only('user_id', 'followers_count').get(pk=author_id)
+    if author.followers_count == settings.FEED_FANOUT_MAX_FOLLOWERS - 1:
+        with transaction.atomic():
+            write_author_timelines(author)
+
+
+def timeline_entries(user):
+    """Returns the entries written into the feed of `user`"""
+    return TimelineEntry.objects.filter(owner=user)
+
+
+def merged_articles(user):
+    """
+    Returns the articles of the widely followed authors `user` follows,
+    which are merged into their feed when it is read
+    """
+    return ArticlesModel.objects.filter(author__in=Follow.objects.filter(
+        from_profile__user=user,
+        to_profile__followers_count__gte=settings.FEED_FANOUT_MAX_FOLLOWERS
+    ).values('to_profile__user'))
+
+
+def write_author_timelines(profile):
+    """
+    Rewrites the latest articles of the author with `profile` into the
+    feeds of their followers, none if they are widely followed, and
+    returns how many entries were written. Their latest articles and
+    followers are read once.
+    """
+    TimelineEntry.objects.filter(article__author_id=profile.user_id).delete()
+    if is_widely_followed(profile):
+        return 0
+    articles = list(ArticlesModel.objects.filter(author_id=profile.user_id).order_by(
+        '-created_at', '-id').values_list('id', 'created_at')[:BACKFILL_ARTICLES])
+    followers = Follow.objects.filter(
+        to_profile=profile).values_list('from_profile__user_id', flat=True)
+    entries = [
+        TimelineEntry(owner_id=user_id, article_id=pk, created_at=created_at)
+        for user_id in followers
+        for pk, created_at in articles
+    ]
+    add_entries(entries)
+    return len(entries)
+
+
+def rebuild_timelines():
+    """
+    Rewrites every feed from the follows and returns how many entries were
+    written. Each author's articles are rewritten in a transaction of their
+    own. Run by the migration adding timelines and by `rebuild_timelines`,
+    for after FEED_FANOUT_MAX_FOLLOWERS has been changed.
+    """
+    written = 0
+    authors = ArticlesModel.objects.order_by('author_id').values_list(
+        'author_id', flat=True).distinct()
+    for author_id in authors.iterator():
+        with transaction.atomic():
+            profile = Profile.objects.only('user_id', 'followers_count').get(
+                user_id=author_id)
+            written += write_author_timelines(profile)
+    return written
@@ -1,5 +1,21 @@
 import django_filters
+from rest_framework.filters import BaseFilterBackend
+
 from .models import ArticlesModel
+from .search import search_articles
+
+
+class ArticleSearchFilter(BaseFilterBackend):
+    """
+    Full-text searches articles with `?search=`, best matches first. Every
+    word has to match the title, description, tags, author or body of an
+    article, a word matching any word it is the start of.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        return search_articles(queryset, query)
 
 
 class ArticlesFilter(django_filters.FilterSet):
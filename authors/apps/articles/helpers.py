@@ -3,13 +3,36 @@ from math import ceil
 
 from authors.settings import WPM
 
+WORD = re.compile('[A-Za-z0-9]+')
+
+
+def count_words(text):
+    '''
+    This function counts the words of a text in a single pass over it,
+    without building a cleaned up copy of the text first
+    '''
+    return sum(1 for _ in WORD.finditer(text or ''))
+
+
+def get_read_time_minutes(word_count, words_per_minute=WPM):
+    '''
+    This function returns the minutes it takes to read a number of words
+    '''
+    return ceil(word_count / words_per_minute)
+
+
+def format_read_time(minutes):
+    '''
+    This function returns reading minutes the way articles display them
+    '''
+    if minutes == 1:
+        return f"{minutes} min"
+    return f"{minutes} mins"
+
+
 def get_time_to_read_article(article, words_per_minute=WPM):
     '''
     This function returns the time it takes to read an article
     '''
-    body = article.body
-    word_count = len(re.sub('[^A-Za-z0-9]+', ' ', body).split())
-    output = f"{ceil(word_count/words_per_minute)} mins" 
-    if ceil(word_count/words_per_minute) == 1:
-        output = f"{ceil(word_count/words_per_minute)} min"
-    return output   
+    return format_read_time(
+        get_read_time_minutes(count_words(article.body), words_per_minute))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from authors.apps.articles.helpers import count_words, get_read_time_minutes
+from authors.apps.articles.models import ArticlesModel
+
+
+class Command(BaseCommand):
+    help = 'Stores the word count and reading time of articles saved before they were stored'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        articles = ArticlesModel.objects.order_by('pk').only('pk', 'body')
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(articles.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            with transaction.atomic():
+                for article in batch:
+                    word_count = count_words(article.body)
+                    ArticlesModel.objects.filter(pk=article.pk).update(
+                        word_count=word_count,
+                        read_time_minutes=get_read_time_minutes(word_count)
+                    )
+            updated += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write('Stored the reading time of {} article(s)'.format(updated))
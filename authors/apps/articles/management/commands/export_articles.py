@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.bulk import CHUNK_SIZE, export_articles
+
+
+class Command(BaseCommand):
+    help = 'Exports every article as NDJSON, one article per line'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='The file to write, standard output by default')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            for line in export_articles(options['chunk_size']):
+                self.stdout.write(line, ending='')
+            return
+        exported = 0
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            for line in export_articles(options['chunk_size']):
+                output.write(line)
+                exported += 1
+        self.stdout.write('Exported {} article(s)'.format(exported))
@@ -0,0 +1,36 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.articles.bulk import CHUNK_SIZE, import_articles
+from authors.apps.authentication.models import User
+
+
+class Command(BaseCommand):
+    help = 'Imports articles from an NDJSON file, one article per line'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='The NDJSON file, - for standard input')
+        parser.add_argument(
+            '--author',
+            help='Username of the author of lines that do not name one'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author']:
+            author = User.objects.filter(username=options['author']).first()
+            if author is None:
+                raise CommandError('No user is called {}'.format(options['author']))
+
+        if options['path'] == '-':
+            result = import_articles(sys.stdin, author, options['chunk_size'])
+        else:
+            with open(options['path'], encoding='utf-8') as lines:
+                result = import_articles(lines, author, options['chunk_size'])
+
+        for error in result['errors']:
+            self.stderr.write('Line {}: {}'.format(error['line'], error['errors']))
+        self.stdout.write('Imported {} article(s), skipped {} line(s)'.format(
+            result['imported'], len(result['errors'])))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import ArticlesModel, Comment
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized article counters from their source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'slugs', nargs='*',
+            help='Only rebuild the counters of these articles'
+        )
+
+    def handle(self, *args, **options):
+        articles = ArticlesModel.objects.all()
+        if options['slugs']:
+            articles = articles.filter(slug__in=options['slugs'])
+        updated = articles.rebuild_counters()
+        Comment.objects.filter(article__in=articles).rebuild_like_counts()
+        self.stdout.write('Rebuilt counters for {} article(s)'.format(updated))
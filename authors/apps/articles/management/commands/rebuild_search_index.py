@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.articles.search import index_article
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'slugs', nargs='*',
+            help='Only reindex these articles'
+        )
+
+    def handle(self, *args, **options):
+        articles = ArticlesModel.objects.select_related('author').prefetch_related('tags')
+        if options['slugs']:
+            articles = articles.filter(slug__in=options['slugs'])
+        indexed = 0
+        for article in articles.defer('search_vector'):
+            index_article(article)
+            indexed += 1
+        self.stdout.write('Indexed {} article(s)'.format(indexed))
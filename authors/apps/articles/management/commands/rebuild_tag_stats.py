@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.tag_stats import rebuild_tag_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the article counts of tags and the daily counts of trending tags'
+
+    def handle(self, *args, **options):
+        updated = rebuild_tag_stats()
+        self.stdout.write('Rebuilt the counts of {} tag(s)'.format(updated))
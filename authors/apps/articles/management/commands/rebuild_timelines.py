@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.feed import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the home feed timelines from the follows'
+
+    def handle(self, *args, **options):
+        written = rebuild_timelines()
+        self.stdout.write('Wrote {} timeline entries'.format(written))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.stats import rollup_article_stats
+
+
+class Command(BaseCommand):
+    help = 'Rolls raw article views up into per article, per day totals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep rolling views up instead of exiting after one rollup'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=300,
+            help='Seconds to wait between rollups'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            total += rollup_article_stats()
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write('Rolled up {} view(s)'.format(total))
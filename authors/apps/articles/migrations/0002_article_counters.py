@@ -0,0 +1,69 @@
+# Generated by Django 2.1.2 on 2026-10-18 14:44
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def count_articles(apps, schema_editor):
+    """Fills the new counters of existing articles from their source tables"""
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+
+    def total(model, aggregate=Count('pk'), **filters):
+        return Subquery(
+            apps.get_model('articles', model).objects.filter(article=OuterRef('pk'), **filters)
+            .order_by()
+            .values('article')
+            .annotate(total=aggregate)
+            .values('total')
+        )
+
+    ArticlesModel.objects.update(
+        likes_count=Coalesce(total('LikesDislikes', likes=True), 0),
+        dislikes_count=Coalesce(total('LikesDislikes', likes=False), 0),
+        rating_count=Coalesce(total('Rating'), 0),
+        rating_sum=Coalesce(total('Rating', Sum('rating')), 0.0),
+        comments_count=Coalesce(total('Comment'), 0),
+        views_count=Coalesce(total('ArticleStat'), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='comments_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='dislikes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='likes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='rating_sum',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='views_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_articles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.1.2 on 2026-10-18 15:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0002_article_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleDailyStat',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.IntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='articles.ArticlesModel')),
+            ],
+            options={
+                'ordering': ('-date',),
+            },
+        ),
+        migrations.AddField(
+            model_name='articlestat',
+            name='rolled_up',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='articlestat',
+            name='viewed_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterUniqueTogether(
+            name='articledailystat',
+            unique_together={('article', 'date')},
+        ),
+    ]
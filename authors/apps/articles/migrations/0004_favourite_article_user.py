@@ -0,0 +1,34 @@
+# Generated by Django 2.1.2 on 2026-10-18 16:20
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def dedupe_favourites(apps, schema_editor):
+    """Keeps only the first favourite of every reader for an article"""
+    Favourite = apps.get_model('articles', 'Favourite')
+    duplicated = (
+        Favourite.objects.values('user', 'article')
+        .annotate(total=Count('pk'), kept=Min('pk'))
+        .filter(total__gt=1)
+    )
+    for pair in duplicated:
+        Favourite.objects.filter(user=pair['user'], article=pair['article']).exclude(
+            pk=pair['kept']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0003_article_daily_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_favourites, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='favourite',
+            unique_together={('article', 'user')},
+        ),
+    ]
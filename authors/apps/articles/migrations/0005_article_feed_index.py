@@ -0,0 +1,17 @@
+# Generated by Django 2.1.2 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_favourite_article_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articlesmodel',
+            index=models.Index(fields=['-created_at', '-id'], name='articles_ar_created_692a43_idx'),
+        ),
+    ]
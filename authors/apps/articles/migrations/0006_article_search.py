@@ -0,0 +1,100 @@
+# Generated by Django 2.1.2 on 2026-10-18 17:20
+
+import re
+from collections import defaultdict
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The weights and term length of the search module when this was written
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+TERM_MAX_LENGTH = 64
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX articles_search_vector_idx '
+            'ON articles_articlesmodel USING gin (search_vector)')
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX articles_search_vector_idx')
+
+
+def index_articles(apps, schema_editor):
+    """Indexes the existing articles the way `search.index_articles` does"""
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    if schema_editor.connection.vendor == 'postgresql':
+        ArticleTags = ArticlesModel.tags.through
+        schema_editor.execute(
+            "UPDATE {articles} SET search_vector = "
+            "setweight(to_tsvector('simple', {articles}.title), 'A') || "
+            "setweight(to_tsvector('simple', {articles}.description), 'B') || "
+            "setweight(to_tsvector('simple', concat_ws(' ', ("
+            "SELECT string_agg({tags}.tag, ' ') FROM {article_tags} "
+            "JOIN {tags} ON {tags}.id = {article_tags}.tags_id "
+            "WHERE {article_tags}.articlesmodel_id = {articles}.id"
+            "), {users}.username)), 'C') || "
+            "setweight(to_tsvector('simple', {articles}.body), 'D') "
+            "FROM {users} WHERE {users}.id = {articles}.author_id".format(
+                articles=ArticlesModel._meta.db_table,
+                article_tags=ArticleTags._meta.db_table,
+                tags=apps.get_model('articles', 'Tags')._meta.db_table,
+                users=apps.get_model('authentication', 'User')._meta.db_table,
+            ))
+        return
+
+    ArticleSearchTerm = apps.get_model('articles', 'ArticleSearchTerm')
+    terms = []
+    for article in ArticlesModel.objects.select_related('author').prefetch_related('tags'):
+        document = (
+            ('A', article.title),
+            ('B', article.description),
+            ('C', ' '.join([tag.tag for tag in article.tags.all()] + [article.author.username])),
+            ('D', article.body),
+        )
+        postings = defaultdict(float)
+        for weight, text in document:
+            for term in re.findall(r'\w+', (text or '').lower()):
+                postings[term[:TERM_MAX_LENGTH]] += WEIGHTS[weight]
+        terms.extend(
+            ArticleSearchTerm(article=article, term=term, weight=weight)
+            for term, weight in postings.items()
+        )
+    ArticleSearchTerm.objects.bulk_create(terms)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+        ('articles', '0005_article_feed_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=64)),
+                ('weight', models.FloatField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='articlesearchterm',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='articles.ArticlesModel'),
+        ),
+        # GIN indexes only exist on PostgreSQL, the other databases search
+        # the ArticleSearchTerm inverted index instead
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(index_articles, migrations.RunPython.noop),
+    ]
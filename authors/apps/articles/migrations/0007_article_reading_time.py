@@ -0,0 +1,35 @@
+# Generated by Django 2.1.2 on 2026-10-18 17:45
+
+from django.db import migrations, models
+
+from authors.apps.articles.helpers import count_words, get_read_time_minutes
+
+
+def time_articles(apps, schema_editor):
+    """Works out the word count and reading time of existing articles"""
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    for pk, body in ArticlesModel.objects.values_list('pk', 'body').iterator():
+        word_count = count_words(body)
+        ArticlesModel.objects.filter(pk=pk).update(
+            word_count=word_count, read_time_minutes=get_read_time_minutes(word_count))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_article_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='read_time_minutes',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='word_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(time_articles, migrations.RunPython.noop),
+    ]
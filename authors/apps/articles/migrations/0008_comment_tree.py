@@ -0,0 +1,38 @@
+# Generated by Django 2.1.2 on 2026-10-18 18:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def set_comment_roots(apps, schema_editor):
+    Comment = apps.get_model('articles', 'Comment')
+    # Replies are always created after the comment they reply to
+    placed = {}
+    for pk, parent in Comment.objects.order_by('pk').values_list('pk', 'parent_id'):
+        if parent is None:
+            placed[pk] = (None, 0)
+            continue
+        root, depth = placed[parent]
+        placed[pk] = (root or parent, depth + 1)
+        Comment.objects.filter(pk=pk).update(root_id=root or parent, depth=depth + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_article_reading_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='root',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_replies', to='articles.Comment'),
+        ),
+        migrations.RunPython(set_comment_roots, migrations.RunPython.noop),
+    ]
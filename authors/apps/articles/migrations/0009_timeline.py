@@ -0,0 +1,67 @@
+# Generated by Django 2.1.2 on 2026-10-18 18:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Authors with this many followers are merged into feeds when read, and how
+# many articles the feed module backfilled when this was written
+FEED_FANOUT_MAX_FOLLOWERS = getattr(settings, 'FEED_FANOUT_MAX_FOLLOWERS', 1000)
+BACKFILL_ARTICLES = 100
+
+
+def write_timelines(apps, schema_editor):
+    """
+    Writes the latest articles of every author who is not widely followed
+    into the feeds of their followers, the way `feed.rebuild_timelines` does
+    """
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    TimelineEntry = apps.get_model('articles', 'TimelineEntry')
+    Profile = apps.get_model('profiles', 'Profile')
+    Follow = Profile.isfollowing.through
+    authors = Profile.objects.filter(
+        followers_count__gt=0, followers_count__lt=FEED_FANOUT_MAX_FOLLOWERS
+    ).values_list('pk', 'user_id')
+    for profile_id, user_id in authors.iterator():
+        articles = list(ArticlesModel.objects.filter(author_id=user_id).order_by(
+            '-created_at', '-id').values_list('id', 'created_at')[:BACKFILL_ARTICLES])
+        if not articles:
+            continue
+        followers = Follow.objects.filter(
+            to_profile_id=profile_id).values_list('from_profile__user_id', flat=True)
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(owner_id=follower, article_id=pk, created_at=created_at)
+            for follower in followers
+            for pk, created_at in articles
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0008_comment_tree'),
+        ('profiles', '0002_follow_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='articles.ArticlesModel')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['owner', '-created_at', '-article'], name='articles_ti_owner_i_fcb7f8_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='timelineentry',
+            unique_together={('owner', 'article')},
+        ),
+        migrations.RunPython(write_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.1.2 on 2026-10-18 19:10
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    Tags = apps.get_model('articles', 'Tags')
+    ArticleTags = apps.get_model('articles', 'ArticlesModel').tags.through
+    duplicated = Tags.objects.values('tag').annotate(
+        kept=Min('pk'), copies=Count('pk')).filter(copies__gt=1)
+    for duplicate in duplicated:
+        copies = Tags.objects.filter(tag=duplicate['tag']).exclude(pk=duplicate['kept'])
+        tagged = ArticleTags.objects.filter(tags_id=duplicate['kept']).values('articlesmodel_id')
+        # Articles carrying a copy and the kept tag lose the copy, the others
+        # carry the kept tag instead
+        ArticleTags.objects.filter(tags__in=copies, articlesmodel_id__in=tagged).delete()
+        for article_id in ArticleTags.objects.filter(tags__in=copies).values_list(
+                'articlesmodel_id', flat=True).distinct():
+            ArticleTags.objects.filter(tags__in=copies, articlesmodel_id=article_id).delete()
+            ArticleTags.objects.create(tags_id=duplicate['kept'], articlesmodel_id=article_id)
+        copies.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_timeline'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.2 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0010_merge_duplicate_tags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tags',
+            name='tag',
+            field=models.CharField(max_length=120, unique=True),
+        ),
+    ]
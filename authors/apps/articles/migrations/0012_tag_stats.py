@@ -0,0 +1,53 @@
+# Generated by Django 2.1.2 on 2026-10-18 19:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+from collections import Counter
+
+
+def count_tags(apps, schema_editor):
+    Tags = apps.get_model('articles', 'Tags')
+    TagDailyCount = apps.get_model('articles', 'TagDailyCount')
+    ArticleTags = apps.get_model('articles', 'ArticlesModel').tags.through
+    taggings = list(ArticleTags.objects.values_list('tags_id', 'articlesmodel__created_at'))
+    per_tag = Counter(tag for tag, _ in taggings)
+    for tag, total in per_tag.items():
+        Tags.objects.filter(pk=tag).update(articles_count=total)
+    per_day = Counter((tag, created_at.date()) for tag, created_at in taggings)
+    TagDailyCount.objects.bulk_create([
+        TagDailyCount(tag_id=tag, date=date, articles=total)
+        for (tag, date), total in per_day.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_unique_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagDailyCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('articles', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='tags',
+            name='articles_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tagdailycount',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_counts', to='articles.Tags'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='tagdailycount',
+            unique_together={('tag', 'date')},
+        ),
+        migrations.RunPython(count_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 2.1.2 on 2026-10-18 20:20
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def copy_reactions(apps, schema_editor):
+    """
+    Makes LikesDislikes the only record of reactions, adding any that were
+    only mirrored into the likes and dislikes of articles and recounting
+    """
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    LikesDislikes = apps.get_model('articles', 'LikesDislikes')
+    recorded = set(LikesDislikes.objects.values_list('article_id', 'reader_id'))
+    missing = []
+    for field, like in (('likes', True), ('dislikes', False)):
+        through = getattr(ArticlesModel, field).through
+        for pair in through.objects.values_list('articlesmodel_id', 'user_id'):
+            if pair not in recorded:
+                recorded.add(pair)
+                missing.append(LikesDislikes(article_id=pair[0], reader_id=pair[1], likes=like))
+    LikesDislikes.objects.bulk_create(missing)
+
+    def count(like):
+        return Coalesce(Subquery(
+            LikesDislikes.objects.filter(article=OuterRef('pk'), likes=like)
+            .order_by()
+            .values('article')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ), 0)
+
+    ArticlesModel.objects.update(likes_count=count(True), dislikes_count=count(False))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0012_tag_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_reactions, migrations.RunPython.noop),
+    ]
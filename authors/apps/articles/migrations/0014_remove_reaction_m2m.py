@@ -0,0 +1,21 @@
+# Generated by Django 2.1.2 on 2026-10-18 20:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_copy_reactions'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='articlesmodel',
+            name='dislikes',
+        ),
+        migrations.RemoveField(
+            model_name='articlesmodel',
+            name='likes',
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.1.2 on 2026-10-18 20:41
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def copy_comment_likes(apps, schema_editor):
+    """
+    Makes a CommentLike row the only record of a like, dropping the rows of
+    comments that were not liked, adding likes that were only mirrored into
+    the likes of comments and counting them
+    """
+    Comment = apps.get_model('articles', 'Comment')
+    CommentLike = apps.get_model('articles', 'CommentLike')
+    CommentLike.objects.filter(comment_likes=False).delete()
+    recorded = set(CommentLike.objects.values_list('specific_comment_id', 'commentor_id'))
+    CommentLike.objects.bulk_create([
+        CommentLike(specific_comment_id=comment_id, commentor_id=user_id, comment_likes=True)
+        for comment_id, user_id in Comment.comment_likes.through.objects.values_list(
+            'comment_id', 'user_id')
+        if (comment_id, user_id) not in recorded
+    ])
+    Comment.objects.update(like_count=Coalesce(Subquery(
+        CommentLike.objects.filter(specific_comment=OuterRef('pk'))
+        .order_by()
+        .values('specific_comment')
+        .annotate(total=Count('pk'))
+        .values('total')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0015_comment_like_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_comment_likes, migrations.RunPython.noop),
+    ]
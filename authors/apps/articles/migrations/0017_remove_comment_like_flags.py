@@ -0,0 +1,21 @@
+# Generated by Django 2.1.2 on 2026-10-18 20:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0016_copy_comment_likes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='comment',
+            name='comment_likes',
+        ),
+        migrations.RemoveField(
+            model_name='commentlike',
+            name='comment_likes',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.1.2 on 2026-10-18 21:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0017_remove_comment_like_flags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleRatingCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stars', models.IntegerField()),
+                ('ratings', models.IntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_counts', to='articles.ArticlesModel')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='articleratingcount',
+            unique_together={('article', 'stars')},
+        ),
+    ]
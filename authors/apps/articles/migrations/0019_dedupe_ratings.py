@@ -0,0 +1,58 @@
+# Generated by Django 2.1.2 on 2026-10-18 21:01
+
+from collections import Counter
+
+from django.db import migrations
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def dedupe_ratings(apps, schema_editor):
+    """
+    Keeps only the latest rating of every reader for an article, then
+    recounts the rating counters and histograms of articles
+    """
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    ArticleRatingCount = apps.get_model('articles', 'ArticleRatingCount')
+    Rating = apps.get_model('articles', 'Rating')
+    duplicated = (
+        Rating.objects.values('user', 'article')
+        .annotate(total=Count('pk'), latest=Max('pk'))
+        .filter(total__gt=1)
+    )
+    for pair in duplicated:
+        Rating.objects.filter(user=pair['user'], article=pair['article']).exclude(
+            pk=pair['latest']).delete()
+
+    def total(aggregate):
+        return Subquery(
+            Rating.objects.filter(article=OuterRef('pk'))
+            .order_by()
+            .values('article')
+            .annotate(total=aggregate)
+            .values('total')
+        )
+
+    ArticlesModel.objects.update(
+        rating_count=Coalesce(total(Count('pk')), 0),
+        rating_sum=Coalesce(total(Sum('rating')), 0.0),
+    )
+    ArticleRatingCount.objects.all().delete()
+    ArticleRatingCount.objects.bulk_create([
+        ArticleRatingCount(article_id=article, stars=stars, ratings=ratings)
+        for (article, stars), ratings in Counter(
+            (article, int(rating))
+            for article, rating in Rating.objects.values_list('article_id', 'rating')
+        ).items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0018_rating_histogram'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.1.2 on 2026-10-18 21:02
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0019_dedupe_ratings'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='rating',
+            unique_together={('user', 'article')},
+        ),
+    ]
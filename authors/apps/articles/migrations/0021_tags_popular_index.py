@@ -0,0 +1,17 @@
+# Generated by Django 2.1.2 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0020_unique_ratings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tags',
+            index=models.Index(fields=['-articles_count', 'tag'], name='articles_tags_popular_idx'),
+        ),
+    ]
@@ -1,10 +1,165 @@
+from collections import Counter, OrderedDict
+
 from rest_framework.reverse import reverse as api_reverse
 
-from django.db import models
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.crypto import get_random_string
 from django.utils.text import slugify
 
 from authors.apps.authentication.models import User
 from authors.apps.core.models import TimeStampedModel
+from authors.apps.profiles.models import Profile
+from .cache import invalidate_articles
+from .helpers import count_words, get_read_time_minutes
+
+# How many times saving an article tries to take a slug that concurrent
+# saves keep taking first, and the length of the random suffix given to
+# slugs of titles that are already taken
+SLUG_ATTEMPTS = 5
+SLUG_SUFFIX_LENGTH = 8
+
+
+def count_for_article(queryset, field='article'):
+    """
+    Returns a subquery counting the rows of `queryset` that point at the
+    outer article through `field`
+    """
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    ), 0)
+
+
+def upsert(model, rows, conflict_fields, update=None, using=None):
+    """
+    Inserts `rows` into the table of `model` in one INSERT ... ON CONFLICT
+    statement and returns how many rows it wrote. `rows` are dicts of field
+    values or a `values()` queryset selecting them. Rows clashing with an
+    existing row on `conflict_fields` are skipped, or add their values of
+    the `update` fields to those of the existing row.
+    """
+    connection = connections[using or router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    if isinstance(rows, models.QuerySet):
+        names = list(rows.query.values_select) + list(rows.query.annotation_select)
+        source, params = rows.query.get_compiler(connection=connection).as_sql()
+    else:
+        if not rows:
+            return 0
+        names = list(rows[0])
+        source = 'VALUES ' + ', '.join(
+            ['({})'.format(', '.join(['%s'] * len(names)))] * len(rows))
+        params = [
+            model._meta.get_field(name).get_db_prep_save(row[name], connection)
+            for row in rows for name in names
+        ]
+
+    def columns(names):
+        return [quote(model._meta.get_field(name).column) for name in names]
+
+    action = 'NOTHING'
+    if update:
+        action = 'UPDATE SET ' + ', '.join(
+            '{column} = {table}.{column} + excluded.{column}'.format(column=column, table=table)
+            for column in columns(update))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO {} ({}) {} ON CONFLICT ({}) DO {}'.format(
+                table, ', '.join(columns(names)), source,
+                ', '.join(columns(conflict_fields)), action),
+            params
+        )
+        return cursor.rowcount
+
+
+class ArticlesQuerySet(models.QuerySet):
+    """Queryset helpers for reading articles in bulk"""
+
+    def for_listing(self, user=None, fields=None):
+        """
+        Returns the articles with everything the list serializer needs
+        joined, prefetched or annotated up front so that a page of articles
+        costs the same number of queries however large the page is. When
+        only some `fields` will be serialized, what the others need is left
+        out, the body is not even read.
+        """
+        def wanted(field):
+            return fields is None or field in fields
+
+        queryset = self.defer('search_vector')
+        if not wanted('body'):
+            queryset = queryset.defer('body')
+        if wanted('author'):
+            queryset = queryset.select_related('author__profile')
+        if wanted('tags'):
+            queryset = queryset.prefetch_related('tags')
+        if user is not None and user.is_authenticated:
+            if wanted('rating'):
+                queryset = queryset.annotate(user_rating=Subquery(
+                    Rating.objects.filter(
+                        article=OuterRef('pk'), user=user
+                    ).values('rating')[:1]
+                ))
+            if wanted('favourited'):
+                queryset = queryset.annotate(is_favourited=Exists(
+                    Favourite.objects.filter(article=OuterRef('pk'), user=user)
+                ))
+            if wanted('author'):
+                queryset = queryset.annotate(author_followed_by_me=Exists(
+                    Profile.isfollowing.through.objects.filter(
+                        from_profile__user=user, to_profile__user=OuterRef('author'))
+                ))
+        return queryset
+
+    def update_counters(self, **deltas):
+        """
+        Atomically adds the given deltas to the counters of these articles,
+        e.g. `queryset.update_counters(likes_count=1, dislikes_count=-1)`
+        """
+        return self.update(**{
+            field: F(field) + delta for field, delta in deltas.items()
+        })
+
+    def rebuild_counters(self):
+        """
+        Recomputes the denormalized counters and rating histograms of these
+        articles from the tables they summarise and returns the number of
+        articles updated
+        """
+        with transaction.atomic():
+            ArticleRatingCount.objects.rebuild(self)
+            return self.update(
+                likes_count=count_for_article(LikesDislikes.objects.filter(likes=True)),
+                dislikes_count=count_for_article(LikesDislikes.objects.filter(likes=False)),
+                rating_count=count_for_article(Rating.objects.all()),
+                rating_sum=Coalesce(Subquery(
+                    Rating.objects.filter(article=OuterRef('pk'))
+                    .order_by()
+                    .values('article')
+                    .annotate(total=models.Sum('rating'))
+                    .values('total')
+                ), 0.0),
+                comments_count=count_for_article(Comment.objects.all()),
+                # Views are whatever has been rolled up plus the raw views since
+                views_count=count_for_article(
+                    ArticleStat.objects.filter(rolled_up=False)
+                ) + Coalesce(Subquery(
+                    ArticleDailyStat.objects.filter(article=OuterRef('pk'))
+                    .order_by()
+                    .values('article')
+                    .annotate(total=models.Sum('views'))
+                    .values('total')
+                ), 0),
+            )
 
 
 class ArticlesModel(models.Model):
@@ -18,8 +173,30 @@ class ArticlesModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, auto_now=False)
     updated_at = models.DateTimeField(auto_now=True, auto_now_add=False)
     author = models.ForeignKey(User, related_name='article', on_delete=models.CASCADE)
-    likes = models.ManyToManyField(User, blank=True, related_name='LikesDislikes.user+')
-    dislikes = models.ManyToManyField(User, blank=True, related_name='LikesDislikes.user+')
+
+    # Denormalized counters, only ever written through `update_counters`
+    # and `ArticlesQuerySet.rebuild_counters` so that reads are O(1)
+    likes_count = models.IntegerField(default=0)
+    dislikes_count = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    comments_count = models.IntegerField(default=0)
+    views_count = models.IntegerField(default=0)
+
+    COUNTER_FIELDS = (
+        'likes_count', 'dislikes_count', 'rating_count',
+        'rating_sum', 'comments_count', 'views_count'
+    )
+
+    # Derived from the body whenever the article is saved
+    word_count = models.IntegerField(default=0)
+    read_time_minutes = models.IntegerField(default=0)
+
+    # Weighted full-text document of the article on PostgreSQL, written by
+    # `search.index_article` whenever the article or its tags change
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ArticlesQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -27,33 +204,140 @@ class ArticlesModel(models.Model):
     def api_url(self,request=None):
         return api_reverse("articles:article-details",kwargs={'slug':self.slug},request=request)
 
-    def create_title_slug(self):
-        """This method automatically slugs the title before saving"""
+    def create_title_slug(self, random_suffix=False):
+        """
+        This method automatically slugs the title before saving. A title
+        that is already taken gets a short random suffix, so a slug costs
+        a single indexed lookup however many articles share the title.
+        """
         slug = slugify(self.title)
-        new_slug = slug
-        n = 1
-        while ArticlesModel.objects.filter(slug=new_slug).exists():
-            new_slug = '{}-{}'.format(slug, n)
-            n += 1
-
-        return new_slug
+        if random_suffix or ArticlesModel.objects.filter(slug=slug).exists():
+            slug = self.suffix_slug(slug)
+        return slug
+
+    @classmethod
+    def suffix_slug(cls, slug):
+        """Returns `slug` with a random suffix, shortened so that it still fits"""
+        length = cls._meta.get_field('slug').max_length - SLUG_SUFFIX_LENGTH - 1
+        return '{}-{}'.format(slug[:length], get_random_string(
+            SLUG_SUFFIX_LENGTH, 'abcdefghijklmnopqrstuvwxyz0123456789'))
+
+    @property
+    def avg_rating(self):
+        """The average rating derived from the stored rating counters"""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    def update_reading_time(self):
+        """Recomputes the stored word count and reading time from the body"""
+        self.word_count = count_words(self.body)
+        self.read_time_minutes = get_read_time_minutes(self.word_count)
+
+    def update_counters(self, **deltas):
+        """Atomically adds the given deltas to the counters of this article"""
+        ArticlesModel.objects.filter(pk=self.pk).update_counters(**deltas)
+        invalidate_articles(self.slug)
 
     def save(self, *args, **kwargs):
         """This method ensures that the article is saved with a slug"""
-        if not self.slug:
-            self.slug = self.create_title_slug()
-        super().save(*args, **kwargs)
+        self.update_reading_time()
+        # Never write back counters or the search vector read earlier, they
+        # may be stale by now
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+                and field.name != 'search_vector'
+            ]
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        for attempt in range(1, SLUG_ATTEMPTS + 1):
+            # Retries never try the bare title again, it was just taken
+            self.slug = self.create_title_slug(random_suffix=attempt > 1)
+            try:
+                # A savepoint, so a taken slug does not break the transaction
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = ArticlesModel.objects.filter(slug=self.slug).exists()
+                self.slug = ''
+                if not slug_taken or attempt == SLUG_ATTEMPTS:
+                    raise
 
     class Meta:
         ordering = ['-created_at']
+        # Matches the keyset order of the cursor paginated article feed. The
+        # GIN index on `search_vector` is created by a PostgreSQL only
+        # migration since it cannot be created on other databases.
+        indexes = [models.Index(fields=['-created_at', '-id'])]
+
+
+class ArticleSearchTerm(models.Model):
+    """
+    A term of an article in the inverted index used to search articles on
+    databases without full-text search, `weight` is how much the term
+    counts towards the article's rank
+    """
+    article = models.ForeignKey(ArticlesModel, related_name='search_terms', on_delete=models.CASCADE)
+    term = models.CharField(max_length=64, db_index=True)
+    weight = models.FloatField()
    
 
+class TimelineEntry(models.Model):
+    """
+    An article in the home feed of a follower of its author, written when
+    the article is created. `created_at` is copied from the article so that
+    a page of a feed is read from the index on (owner, created_at) alone.
+    """
+    owner = models.ForeignKey(User, related_name='timeline', on_delete=models.CASCADE)
+    article = models.ForeignKey(ArticlesModel, related_name='timeline_entries', on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('owner', 'article')
+        indexes = [models.Index(fields=['owner', '-created_at', '-article'])]
+
+
 class ArticleStat(models.Model):
     """
     Model for reading statistics
     """
     user = models.ForeignKey(User, related_name="article_views", on_delete=models.CASCADE)
     article = models.ForeignKey(ArticlesModel, related_name="article_views", on_delete=models.CASCADE)
+    viewed_at = models.DateTimeField(default=timezone.now, db_index=True)
+    # Set once the view has been counted into ArticleDailyStat
+    rolled_up = models.BooleanField(default=False)
+
+
+class ArticleDailyStat(models.Model):
+    """
+    Per article, per day view totals rolled up from ArticleStat
+    """
+    article = models.ForeignKey(ArticlesModel, related_name="daily_views", on_delete=models.CASCADE)
+    date = models.DateField()
+    views = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('article', 'date')
+        ordering = ('-date',)
+
+
+class CommentQuerySet(models.QuerySet):
+    """Queryset helpers for reading comment threads"""
+
+    def for_tree(self):
+        """Returns the comments with their author"""
+        return self.select_related('author')
+
+    def rebuild_like_counts(self):
+        """
+        Recomputes the like counters of these comments from their likes and
+        returns the number of comments updated
+        """
+        return self.update(like_count=count_for_article(CommentLike.objects.all(), 'specific_comment'))
+
 
 class Comment(models.Model):
     """
@@ -65,7 +349,9 @@ class Comment(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, related_name='comments', on_delete=models.CASCADE)
     article = models.ForeignKey(ArticlesModel, related_name='comments', on_delete=models.CASCADE)
-    comment_likes = models.ManyToManyField(User, blank=True, related_name='LikeComment')
+    # Denormalized, only ever written by CommentLikeQuerySet and
+    # `CommentQuerySet.rebuild_like_counts`
+    like_count = models.IntegerField(default=0)
     parent = models.ForeignKey(
         'self',
         null=True,
@@ -73,13 +359,49 @@ class Comment(models.Model):
         related_name='threads',
         on_delete=models.CASCADE
     )
+    # The top level comment of the thread and how deep in it this reply is,
+    # so that a whole thread is loaded with one query. Unset on top level
+    # comments themselves.
+    root = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        related_name='thread_replies',
+        on_delete=models.CASCADE
+    )
+    depth = models.PositiveIntegerField(default=0)
+
+    objects = CommentQuerySet.as_manager()
 
     def __str__(self):
        return self.body
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.parent_id:
+            self.root_id = self.parent.root_id or self.parent_id
+            self.depth = self.parent.depth + 1
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ('-created_at',)
 
+
+def attach_replies(roots):
+    """
+    Loads every reply under the top level comments `roots` with a single
+    query and nests them in memory, each comment's replies oldest first in
+    its `tree_replies`
+    """
+    nodes = {root.pk: root for root in roots}
+    replies = list(
+        Comment.objects.for_tree().filter(root__in=list(nodes)).order_by('created_at', 'id'))
+    for comment in list(roots) + replies:
+        comment.tree_replies = []
+    nodes.update((reply.pk, reply) for reply in replies)
+    for reply in replies:
+        nodes[reply.parent_id].tree_replies.append(reply)
+    return roots
+
 class Highlighted(TimeStampedModel):
     author = models.ForeignKey(User, related_name='highlights', on_delete=models.CASCADE)
     article = models.ForeignKey(ArticlesModel, related_name='highlights', on_delete=models.CASCADE)
@@ -87,30 +409,240 @@ class Highlighted(TimeStampedModel):
     snippet = models.TextField(blank=False)
     index = models.IntegerField(blank=False)
 
+def rating_stars(rating):
+    """Returns the whole number of stars a rating counts towards"""
+    return int(rating)
+
+
+class RatingQuerySet(models.QuerySet):
+    """Queryset helpers for ratings of articles"""
+
+    def rate(self, article, user, rating, create=True):
+        """
+        Records `rating` as the rating of `user` for `article`, replacing
+        the one they gave before, and moves the rating counters of the
+        article to match. Returns the replaced rating, or None when the
+        rating is new. Raises Rating.DoesNotExist when there is no rating
+        to replace and `create` is False.
+        """
+        ratings = self.filter(article=article, user=user)
+        with transaction.atomic(using=self.db):
+            while True:
+                old = ratings.select_for_update().values_list('rating', flat=True).first()
+                if old is not None:
+                    ratings.update(rating=rating)
+                    article.update_counters(rating_sum=rating - old)
+                    ArticleRatingCount.objects.record(
+                        article, {rating_stars(old): -1, rating_stars(rating): 1})
+                    return old
+                if not create:
+                    raise self.model.DoesNotExist
+                # A rating inserted first by a concurrent request is
+                # replaced on the next pass
+                inserted = upsert(
+                    self.model, [{'article': article.pk, 'user': user.pk, 'rating': rating}],
+                    ('user', 'article'), using=self.db)
+                if inserted:
+                    article.update_counters(rating_count=1, rating_sum=rating)
+                    ArticleRatingCount.objects.record(article, {rating_stars(rating): 1})
+                    return None
+
+    def unrate(self, article, user):
+        """
+        Removes the rating of `user` for `article` and moves the rating
+        counters of the article to match. Returns the removed rating, or
+        None if there was none.
+        """
+        ratings = self.filter(article=article, user=user)
+        with transaction.atomic(using=self.db):
+            old = ratings.select_for_update().values_list('rating', flat=True).first()
+            if old is not None:
+                ratings.delete()
+                article.update_counters(rating_count=-1, rating_sum=-old)
+                ArticleRatingCount.objects.record(article, {rating_stars(old): -1})
+        return old
+
+
 class Rating(models.Model):
+    """
+    A reader's rating of an article. Always written through
+    RatingQuerySet so that the counters of the article follow.
+    """
     user = models.ForeignKey(User, related_name='rating', on_delete=models.CASCADE)
     article = models.ForeignKey(ArticlesModel, related_name='rating', on_delete=models.CASCADE)
     rating = models.FloatField(null=False)
 
+    objects = RatingQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('user', 'article')
+
+
+class ArticleRatingCountQuerySet(models.QuerySet):
+    """Queryset helpers for the rating histograms of articles"""
+
+    def record(self, article, deltas):
+        """
+        Adds the `{stars: delta}` deltas to the rating histogram of
+        `article` with a single upsert
+        """
+        deltas = [(stars, delta) for stars, delta in deltas.items() if delta]
+        if not deltas:
+            return
+        upsert(self.model, [
+            {'article': article.pk, 'stars': stars, 'ratings': delta} for stars, delta in deltas
+        ], ('article', 'stars'), update=('ratings',), using=self.db)
+
+    def rebuild(self, articles):
+        """Recomputes the rating histograms of `articles` from their ratings"""
+        self.filter(article__in=articles).delete()
+        self.bulk_create([
+            self.model(article_id=article, stars=stars, ratings=total)
+            for (article, stars), total in Counter(
+                (article, rating_stars(rating))
+                for article, rating in Rating.objects.filter(
+                    article__in=articles).values_list('article_id', 'rating').iterator()
+            ).items()
+        ])
+
+    def histogram(self, article):
+        """Returns how many ratings of `article` give each number of stars"""
+        counts = dict(self.filter(article=article).values_list('stars', 'ratings'))
+        return OrderedDict(
+            (stars, counts.get(stars, 0))
+            for stars in range(settings.RATING_MIN, settings.RATING_MAX + 1)
+        )
+
+
+class ArticleRatingCount(models.Model):
+    """
+    How many ratings of an article give a whole number of stars, kept by
+    RatingQuerySet for the rating histogram
+    """
+    article = models.ForeignKey(ArticlesModel, related_name='rating_counts', on_delete=models.CASCADE)
+    stars = models.IntegerField()
+    ratings = models.IntegerField(default=0)
+
+    objects = ArticleRatingCountQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('article', 'stars')
+
 
 class Favourite(models.Model):
     """model for favourating articles"""
     article = models.ForeignKey(ArticlesModel, related_name="favourited", on_delete=models.CASCADE)
     user = models.ForeignKey(User, related_name="favourites", on_delete=models.CASCADE)
 
+    class Meta:
+        # Also the index used to find who favourited an article
+        unique_together = ('article', 'user')
+
+
+class TagsQuerySet(models.QuerySet):
+    """Queryset helpers for tags"""
+
+    def resolve(self, names):
+        """
+        Returns the tags with these names in order, creating the missing
+        ones. Existing tags are found with one SELECT and the missing ones
+        inserted with one INSERT that skips any a concurrent writer inserts
+        first, so a request resolves all its tags in at most three queries.
+        """
+        names = list(dict.fromkeys(names))
+        tags = {tag.tag: tag for tag in self.filter(tag__in=names)}
+        missing = [name for name in names if name not in tags]
+        if missing:
+            # bulk_create cannot skip conflicts before Django 2.2
+            upsert(self.model, [{'tag': name, 'articles_count': 0} for name in missing],
+                   ('tag',), using=self.db)
+            tags.update({tag.tag: tag for tag in self.filter(tag__in=missing)})
+        return [tags[name] for name in names]
+
 
 class Tags(models.Model):
-    tag = models.CharField(max_length=120)
+    tag = models.CharField(max_length=120, unique=True)
+    # Denormalized from the tags of articles by `tag_stats.record_tagging`
+    articles_count = models.IntegerField(default=0)
+
+    objects = TagsQuerySet.as_manager()
 
     def __str__(self):
         return self.tag
 
+    class Meta:
+        # Pages of tags on most articles first are read from this index
+        indexes = [models.Index(fields=['-articles_count', 'tag'], name='articles_tags_popular_idx')]
+
+
+class TagDailyCount(models.Model):
+    """
+    How many of the articles created on `date` carry `tag`, summed over the
+    last days to find trending tags
+    """
+    tag = models.ForeignKey(Tags, related_name='daily_counts', on_delete=models.CASCADE)
+    date = models.DateField(db_index=True)
+    articles = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('tag', 'date')
+
+
+class LikesDislikesQuerySet(models.QuerySet):
+    """Queryset helpers for reactions to articles"""
+
+    def react(self, article, reader, like):
+        """
+        Records that `reader` likes `article`, or dislikes it when `like` is
+        False, and moves the counters of the article to match. Returns
+        'created', 'changed' or 'unchanged'. Concurrent reactions by the
+        same reader never duplicate the row nor lose the last reaction.
+        """
+        reactions = self.filter(article=article, reader=reader)
+        with transaction.atomic(using=self.db):
+            outcome = 'changed' if reactions.exclude(likes=like).update(likes=like) else None
+            if outcome is None:
+                # A reaction that is missing is inserted, unless a concurrent
+                # request inserts one first, which is then changed if needed
+                if upsert(self.model, [{'article': article.pk, 'reader': reader.pk, 'likes': like}],
+                          ('article', 'reader'), using=self.db):
+                    outcome = 'created'
+            if outcome is None:
+                outcome = 'changed' if reactions.exclude(likes=like).update(likes=like) else 'unchanged'
+
+            if outcome == 'created':
+                article.update_counters(**{'likes_count' if like else 'dislikes_count': 1})
+            elif outcome == 'changed':
+                article.update_counters(
+                    likes_count=1 if like else -1, dislikes_count=-1 if like else 1)
+        return outcome
+
+    def withdraw(self, article, reader):
+        """
+        Removes the reaction of `reader` to `article` and moves the counters
+        of the article to match. Returns whether it was a like, or None if
+        there was no reaction.
+        """
+        with transaction.atomic(using=self.db):
+            for like in (True, False):
+                deleted, _ = self.filter(article=article, reader=reader, likes=like).delete()
+                if deleted:
+                    article.update_counters(**{'likes_count' if like else 'dislikes_count': -1})
+                    return like
+        return None
+
 
 class LikesDislikes(models.Model):
+    """
+    A reader's reaction to an article, the only record of who liked and
+    disliked what. Always written through LikesDislikesQuerySet.
+    """
     article = models.ForeignKey(ArticlesModel, related_name='like' ,on_delete=models.CASCADE)
     reader = models.ForeignKey(User, related_name='like', on_delete=models.CASCADE)
     likes = models.BooleanField()
 
+    objects = LikesDislikesQuerySet.as_manager()
+
     class Meta:
         unique_together = ('article', 'reader')
 class CommentHistory(models.Model):
@@ -134,10 +666,52 @@ class CommentHistory(models.Model):
     class Meta:
         ordering = ('created_at',)
 
+class CommentLikeQuerySet(models.QuerySet):
+    """Queryset helpers for likes of comments"""
+
+    def like(self, comment_id, reader):
+        """
+        Records that `reader` likes the comment `comment_id` and counts it,
+        in two statements. Returns False, writing nothing, when the comment
+        does not exist, is by `reader` or is already liked by `reader`.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            # The comment is checked by the insert itself
+            liked = upsert(self.model, Comment.objects.using(self.db).filter(
+                pk=comment_id).exclude(author_id=reader.pk).values(
+                specific_comment=F('pk'), commentor=Value(reader.pk, models.IntegerField())
+            ), ('specific_comment', 'commentor'), using=self.db) == 1
+            if liked:
+                Comment.objects.filter(pk=comment_id).update(like_count=F('like_count') + 1)
+        return liked
+
+    def unlike(self, comment_id, reader):
+        """
+        Removes the like of `reader` from the comment `comment_id` and counts
+        it, in two statements. Returns whether there was a like.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            deleted, _ = self.filter(specific_comment_id=comment_id, commentor=reader).delete()
+            if deleted:
+                Comment.objects.filter(pk=comment_id).update(like_count=F('like_count') - 1)
+        return deleted == 1
+
+    def liked_by(self, reader, comment_ids):
+        """Returns which of the comments `comment_ids` `reader` likes"""
+        return set(self.filter(
+            commentor=reader, specific_comment_id__in=comment_ids
+        ).values_list('specific_comment_id', flat=True))
+
+
 class CommentLike(models.Model):
+    """
+    A reader's like of a comment, the only record of who liked what.
+    Always written through CommentLikeQuerySet.
+    """
     specific_comment = models.ForeignKey(Comment,related_name='comment_like', on_delete=models.CASCADE)
     commentor = models.ForeignKey(User, related_name='comment_like', on_delete=models.CASCADE)
-    comment_likes = models.BooleanField()
+
+    objects = CommentLikeQuerySet.as_manager()
 
     class Meta:
         unique_together = ('specific_comment','commentor')
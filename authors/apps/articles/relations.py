@@ -1,9 +1,20 @@
 import re
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from django.utils.text import slugify
 
 from authors.apps.articles.models import Tags
 
+# What a tag may look like before it is slugified
+TAG_PATTERN = r'^[a-zA-Z0-9][ A-Za-z0-9_-]*$'
+
+
+class ManyTagsRelation(serializers.ManyRelatedField):
+    """Resolves all the tags of an article at once"""
+
+    def to_internal_value(self, data):
+        return Tags.objects.resolve(super().to_internal_value(data))
+
 
 class TagsRelation(serializers.RelatedField):
     """This class overwrites the serializer class for tags
@@ -11,6 +22,14 @@ class TagsRelation(serializers.RelatedField):
     creating an article
     """
 
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManyTagsRelation(**list_kwargs)
+
     def get_queryset(self):
         return Tags.objects.all()
 
@@ -20,9 +39,7 @@ class TagsRelation(serializers.RelatedField):
     def to_internal_value(self, data):
         # Ensures tags with CAPS and spaces are saved as slugs
         # Capitalize characters and small letter characters are saved as one
-        if not re.match(r'^[a-zA-Z0-9][ A-Za-z0-9_-]*$', data):
+        # The tags of an article are looked up together by ManyTagsRelation
+        if not re.match(TAG_PATTERN, data):
             raise serializers.ValidationError('Tag cannot have special characters')
-        new_tag = slugify(data)
-        tag, created = Tags.objects.get_or_create(tag=new_tag)
-        return tag
-
+        return slugify(data)
@@ -0,0 +1,153 @@
+import re
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import BooleanField, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from .models import ArticlesModel, ArticleSearchTerm
+
+# How much a match in each part of an article counts towards its rank, the
+# same weights PostgreSQL's ts_rank gives to the A, B, C and D labels
+WEIGHTS = (('A', 1.0), ('B', 0.4), ('C', 0.2), ('D', 0.1))
+
+# Both backends use PostgreSQL's `simple` configuration, words are lower
+# cased but neither stemmed nor dropped as stop words, so that they split
+# text into the same terms and every query term can be prefix matched
+SEARCH_CONFIG = 'simple'
+TERM_MAX_LENGTH = ArticleSearchTerm._meta.get_field('term').max_length
+
+
+def tokenize(text):
+    """Splits `text` into lower cased search terms"""
+    return [
+        term[:TERM_MAX_LENGTH]
+        for term in re.findall(r'\w+', (text or '').lower())
+    ]
+
+
+def article_document(article):
+    """
+    Returns the searchable text of `article` by weight, the title ranks
+    highest followed by the description, the tags and author and the body
+    """
+    return (
+        ('A', article.title),
+        ('B', article.description),
+        ('C', ' '.join([tag.tag for tag in article.tags.all()] + [article.author.username])),
+        ('D', article.body),
+    )
+
+
+class PostgresSearchBackend:
+    """
+    Keeps a weighted `tsvector` of every article in
+    `ArticlesModel.search_vector`, which is GIN indexed, and ranks matches
+    with `ts_rank`
+    """
+
+    def index(self, articles):
+        # One UPDATE for every article, from a VALUES list of their documents
+        documents = [
+            [article.pk] + [text or '' for _, text in article_document(article)]
+            for article in articles
+        ]
+        if not documents:
+            return
+        table = ArticlesModel._meta.db_table
+        vector = ' || '.join(
+            "setweight(to_tsvector('{}', document.{}), '{}')".format(
+                SEARCH_CONFIG, weight.lower(), weight)
+            for weight, _ in WEIGHTS
+        )
+        rows = ', '.join(['(%s, %s, %s, %s, %s)'] * len(documents))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE {table} SET search_vector = {vector} '
+                'FROM (VALUES {rows}) AS document(id, a, b, c, d) '
+                'WHERE {table}.id = document.id'.format(table=table, vector=vector, rows=rows),
+                [value for document in documents for value in document]
+            )
+
+    def search(self, queryset, terms):
+        tsquery = ' & '.join('{}:*'.format(term) for term in terms)
+        vector = '{}.search_vector'.format(ArticlesModel._meta.db_table)
+        return queryset.annotate(
+            search_match=RawSQL(
+                "{} @@ to_tsquery('{}', %s)".format(vector, SEARCH_CONFIG),
+                [tsquery], output_field=BooleanField()),
+            search_rank=RawSQL(
+                "ts_rank({}, to_tsquery('{}', %s))".format(vector, SEARCH_CONFIG),
+                [tsquery], output_field=FloatField()),
+        ).filter(search_match=True).order_by('-search_rank', '-created_at')
+
+
+class InvertedIndexSearchBackend:
+    """
+    Keeps an inverted index of the terms of every article in
+    ArticleSearchTerm for databases without full-text search, such as the
+    SQLite test database. An article's rank is the weighted number of times
+    the query terms appear in it.
+    """
+
+    def index(self, articles):
+        weights = dict(WEIGHTS)
+        terms = []
+        for article in articles:
+            postings = defaultdict(float)
+            for weight, text in article_document(article):
+                for term in tokenize(text):
+                    postings[term] += weights[weight]
+            terms.extend(
+                ArticleSearchTerm(article=article, term=term, weight=weight)
+                for term, weight in postings.items()
+            )
+        with transaction.atomic():
+            ArticleSearchTerm.objects.filter(article__in=[article.pk for article in articles]).delete()
+            ArticleSearchTerm.objects.bulk_create(terms)
+
+    def search(self, queryset, terms):
+        matches = Q()
+        for term in terms:
+            queryset = queryset.filter(pk__in=ArticleSearchTerm.objects.filter(
+                term__startswith=term).values('article'))
+            matches |= Q(term__startswith=term)
+        return queryset.annotate(search_rank=Coalesce(Subquery(
+            ArticleSearchTerm.objects.filter(matches, article=OuterRef('pk'))
+            .order_by()
+            .values('article')
+            .annotate(total=Sum('weight'))
+            .values('total'), output_field=FloatField()
+        ), 0.0)).order_by('-search_rank', '-created_at')
+
+
+def get_backend():
+    """Returns the search backend for the database in use"""
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return InvertedIndexSearchBackend()
+
+
+def index_article(article):
+    """Brings the search index of `article` up to date"""
+    get_backend().index([article])
+
+
+def index_articles(articles):
+    """
+    Brings the search index of `articles` up to date at once, with their
+    authors and tags loaded up front
+    """
+    get_backend().index(articles)
+
+
+def search_articles(queryset, query):
+    """
+    Returns the articles in `queryset` matching every word of `query`, a
+    word matching any term it is a prefix of, best matches first
+    """
+    terms = tokenize(query)
+    if not terms:
+        return queryset
+    return get_backend().search(queryset, terms)
@@ -1,17 +1,21 @@
+from collections import OrderedDict
+
 from rest_framework import serializers
-from django.db.models import Avg
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 from authors import settings
-from authors.apps.articles.helpers import get_time_to_read_article
-from authors.apps.profiles.models import Profile
+from authors.apps.articles.helpers import format_read_time
 from rest_framework.validators import UniqueTogetherValidator
-from .models import ArticlesModel, Rating, Comment, Favourite, Tags, LikesDislikes, CommentLike, CommentHistory, ReportArticles, ArticleStat, Highlighted
-from authors.apps.profiles.serializers import ProfileSerializer
-from authors.apps.articles.relations import TagsRelation
+from .models import ArticlesModel, Rating, Comment, Favourite, Tags, LikesDislikes, CommentHistory, ReportArticles, Highlighted
+from authors.apps.profiles.serializers import ProfileSummarySerializer
+from authors.apps.articles.relations import TAG_PATTERN, TagsRelation
 
 
 class ArticlesSerializers(serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.article_urls = {}
+
     #add return fields
     url = serializers.SerializerMethodField(read_only=True)
     facebook = serializers.SerializerMethodField(read_only=True)
@@ -44,8 +48,12 @@ class ArticlesSerializers(serializers.ModelSerializer):
         required=False
     )
     favourited = serializers.SerializerMethodField()
+    time_to_read = serializers.SerializerMethodField()
 
     def get_favourited(self, obj):
+        # Listings annotate this up front, see ArticlesQuerySet.for_listing
+        if hasattr(obj, 'is_favourited'):
+            return obj.is_favourited
         try:
             favourite = Favourite.objects.get(
                 user=self.context["request"].user.id, article=obj.id)
@@ -58,77 +66,117 @@ class ArticlesSerializers(serializers.ModelSerializer):
     author = serializers.SerializerMethodField(read_only=True)
     rating = serializers.SerializerMethodField()
 
-    likes_count = serializers.IntegerField(
-        read_only=True,
-        source="likes.count"
-    )
-
-    dislikes_count = serializers.IntegerField(
-        read_only=True,
-        source="dislikes.count"
-    )
+    likes_count = serializers.IntegerField(read_only=True)
+    dislikes_count = serializers.IntegerField(read_only=True)
 
     def get_author(self, obj):
-        """This method gets the profile object for the article"""
-        serializer = ProfileSerializer(
-            instance=Profile.objects.get(user=obj.author))
-        return serializer.data
+        """
+        This method gets the profile of the author with their stored follow
+        counts, and whether the requesting user follows them
+        """
+        profile = obj.author.profile
+        if hasattr(obj, 'author_followed_by_me'):
+            profile.followed_by_me = obj.author_followed_by_me
+        else:
+            user = self.context["request"].user
+            profile.followed_by_me = user.is_authenticated and profile.is_following.filter(
+                user=user).exists()
+        return ProfileSummarySerializer(instance=profile).data
 
     def get_rating(self, obj):
         """This method gets and returns the rating for the article"""
 
-        # Get average rating
-        avg_rating = Rating.objects.filter(
-            article=obj.id).aggregate(Avg('rating'))
+        # Get average rating from the counters stored on the article
+        avg_rating = obj.avg_rating
 
         # Check that this user is authenticated in order to include their rating,
         # if not, we return the default rating
         user = self.context["request"].user
         if user.is_authenticated:
-            try:
-                rating = Rating.objects.get(user=user, article=obj.id).rating
-            except Rating.DoesNotExist:
-                rating = None
+            if hasattr(obj, 'user_rating'):
+                rating = obj.user_rating
+            else:
+                try:
+                    rating = Rating.objects.get(user=user, article=obj.id).rating
+                except Rating.DoesNotExist:
+                    rating = None
 
             return {
-                'avg_rating': avg_rating['rating__avg'],
+                'avg_rating': avg_rating,
                 'rating': rating
             }
 
         return {
-            'avg_rating': avg_rating['rating__avg']
+            'avg_rating': avg_rating
         }
 
-    def to_representation(self, instance):
+    def get_time_to_read(self, obj):
+        return format_read_time(obj.read_time_minutes)
+
+    def get_fields(self):
         """
-        overide representatiom for custom output
+        Leaves out the fields the request did not ask for, see
+        `requested_fields`, so that their values are never computed
         """
-        representation = super(ArticlesSerializers,
-                               self).to_representation(instance)
-        representation['time_to_read'] = get_time_to_read_article(instance)
-        return representation
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is None:
+            return fields
+        return OrderedDict(
+            (name, field) for name, field in fields.items() if name in requested
+        )
 
+    @classmethod
+    def requested_fields(cls, query_params):
+        """
+        Returns the fields asked for with `?fields=title,slug` or the
+        fields of the `?view=summary` projection, or None for every field
+        """
+        if query_params.get('fields'):
+            return set(query_params['fields'].split(',')) & set(cls.Meta.fields)
+        if query_params.get('view') == 'summary':
+            return set(cls.SUMMARY_FIELDS)
+        return None
+
+    def article_url(self, obj):
+        """The url of the article, reversed once and shared by every link"""
+        if obj.pk not in self.article_urls:
+            self.article_urls[obj.pk] = obj.api_url(request=self.context.get("request"))
+        return self.article_urls[obj.pk]
 
     def get_url(self,obj):
-        request = self.context.get("request")
-        return obj.api_url(request=request)
+        return self.article_url(obj)
 
     def get_facebook(self,obj):
-        request = self.context.get("request")
-        return 'http://www.facebook.com/sharer.php?u='+obj.api_url(request=request)
+        return 'http://www.facebook.com/sharer.php?u='+self.article_url(obj)
 
     def get_Linkedin(self,obj):
-        request = self.context.get("request")
-        return 'http://www.linkedin.com/shareArticle?mini=true&amp;url='+obj.api_url(request=request)
+        return 'http://www.linkedin.com/shareArticle?mini=true&amp;url='+self.article_url(obj)
 
     def get_twitter(self,obj):
-        request = self.context.get("request")
-        return 'https://twitter.com/share?url='+obj.api_url(request=request)+'&amp;text=Amazing Read'
+        return 'https://twitter.com/share?url='+self.article_url(obj)+'&amp;text=Amazing Read'
 
     def get_mail(self,obj):
-        request = self.context.get("request")
         return  'mailto:?subject=New Article Alert&body={}'.format(
-                    obj.api_url(request=request))
+                    self.article_url(obj))
+
+    # What `?view=summary` lists, everything but the body and share links
+    SUMMARY_FIELDS = (
+        'title',
+        'description',
+        'slug',
+        'url',
+        'tags',
+        'image_url',
+        'author',
+        'rating',
+        'likes_count',
+        'dislikes_count',
+        'created_at',
+        'updated_at',
+        'favourited',
+        'time_to_read'
+    )
 
     class Meta:
         model = ArticlesModel
@@ -150,7 +198,8 @@ class ArticlesSerializers(serializers.ModelSerializer):
             'dislikes_count',
             'created_at',
             'updated_at',
-            'favourited'
+            'favourited',
+            'time_to_read'
         )
 
     def create(self, validated_data):
@@ -158,13 +207,33 @@ class ArticlesSerializers(serializers.ModelSerializer):
         tags = validated_data.pop('tags', [])
         # creates an article instance
         article = ArticlesModel.objects.create(**validated_data)
-        # Adds tags to the article instance
-        for tag in tags:
-            article.tags.add(tag)
+        # Adds tags to the article instance, at once so it is reindexed once
+        article.tags.add(*tags)
         # returns the article object
         return article
 
 
+class ArticleImportSerializer(serializers.ModelSerializer):
+    """
+    Validates a line of an NDJSON article import. Slugs are not checked for
+    uniqueness and tags and authors are not looked up here, the import does
+    that for a whole chunk of lines at once.
+    """
+    slug = serializers.SlugField(max_length=128, required=False, allow_blank=True)
+    tags = serializers.ListField(
+        child=serializers.RegexField(
+            TAG_PATTERN, error_messages={'invalid': 'Tag cannot have special characters'}),
+        required=False
+    )
+    author = serializers.CharField(required=False)
+    created_at = serializers.DateTimeField(required=False)
+
+    class Meta:
+        model = ArticlesModel
+        fields = (
+            'slug', 'title', 'description', 'body', 'image_url', 'tags', 'author', 'created_at')
+
+
 class TagSerializers(serializers.ModelSerializer):
     class Meta:
         model = Tags
@@ -192,18 +261,19 @@ class ArticleStatSerializer(serializers.ModelSerializer):
     Serializer class for reading stats
     """
     slug = serializers.SlugField(read_only=True)
-    view_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
-
-    def get_comment_count(self, value):
-       return Comment.objects.filter(article=value).count()
+    view_count = serializers.IntegerField(source='views_count', read_only=True)
+    comment_count = serializers.IntegerField(source='comments_count', read_only=True)
+    daily_views = serializers.SerializerMethodField()
 
-    def get_view_count(self, value):
-       return ArticleStat.objects.filter(article=value).count()
+    def get_daily_views(self, value):
+       return [
+           {'date': day.date, 'views': day.views}
+           for day in value.daily_views.all()
+       ]
 
     class Meta:
        model = ArticlesModel
-       fields = ['slug', 'title', 'view_count', 'comment_count']
+       fields = ['slug', 'title', 'view_count', 'comment_count', 'daily_views']
 
 class CommentsSerializers(serializers.ModelSerializer):
     body = serializers.CharField(
@@ -239,7 +309,7 @@ class CommentsSerializers(serializers.ModelSerializer):
                         'author': thread.author.username,
                         'created_at': self.format_date(thread.created_at),
                         'replies': thread.threads.count(),
-                        'comment_like_count':thread.comment_likes.count(),
+                        'comment_like_count':thread.like_count,
                         'updated_at': self.format_date(thread.updated_at)
                     }  for thread in instance.threads.all()
                 ]
@@ -247,7 +317,7 @@ class CommentsSerializers(serializers.ModelSerializer):
        representation = super(CommentsSerializers, self).to_representation(instance)
        representation['created_at'] = self.format_date(instance.created_at)
        representation['updated_at'] = self.format_date(instance.updated_at)
-       representation['comment_like_count']=instance.comment_likes.count()
+       representation['comment_like_count']=instance.like_count
        representation['author'] = instance.author.username
        representation['article'] = instance.article.title
        representation['reply_count'] = instance.threads.count() 
@@ -270,6 +340,39 @@ class CommentsSerializers(serializers.ModelSerializer):
        )
         
 
+class CommentTreeSerializer(serializers.ModelSerializer):
+    """
+    Serializes a comment and every reply under it, from the replies nested
+    in memory by `attach_replies`
+    """
+    author = serializers.CharField(source='author.username', read_only=True)
+    created_at = serializers.DateTimeField(format='%d %b %Y %H:%M:%S', read_only=True)
+    updated_at = serializers.DateTimeField(format='%d %b %Y %H:%M:%S', read_only=True)
+    like_count = serializers.IntegerField(read_only=True)
+    reply_count = serializers.SerializerMethodField()
+    replies = serializers.SerializerMethodField()
+
+    def get_reply_count(self, obj):
+        return len(obj.tree_replies)
+
+    def get_replies(self, obj):
+        return CommentTreeSerializer(obj.tree_replies, many=True, context=self.context).data
+
+    class Meta:
+        model = Comment
+        fields = (
+            'id',
+            'body',
+            'author',
+            'created_at',
+            'updated_at',
+            'depth',
+            'like_count',
+            'reply_count',
+            'replies'
+        )
+
+
 class RatingSerializer(serializers.ModelSerializer):
     rating = serializers.FloatField(
         required=True,
@@ -294,9 +397,7 @@ class RatingSerializer(serializers.ModelSerializer):
     article = serializers.SerializerMethodField()
 
     def get_avg_rating(self, obj):
-        avg = Rating.objects.filter(
-            article=obj.article.id).aggregate(Avg('rating'))
-        return avg['rating__avg']
+        return obj.article.avg_rating
 
     def get_article(self, obj):
         return obj.article.slug
@@ -393,17 +494,9 @@ class CommentHistorySerializer(serializers.ModelSerializer):
         fields = ('body', 'parent', 'created_at')
 
 
-class CommentsLikeSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = CommentLike
-        fields = '__all__'
-        validators = [
-            UniqueTogetherValidator(
-                queryset=CommentLike.objects.all(),
-                fields = ('specific_comment','commentor'),
-                message = 'You have already liked this comment.'
-            )
-        ]
+class CommentsLikeSerializer(serializers.Serializer):
+    """Describes the payload liking, or unliking, a comment"""
+    comment_likes = serializers.BooleanField()
 
 
 class ReportArticlesSerializer(serializers.ModelSerializer):
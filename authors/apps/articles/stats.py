@@ -0,0 +1,155 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from authors.apps.authentication.models import User
+from .models import ArticlesModel, ArticleStat, ArticleDailyStat
+
+# How many raw views are rolled up per transaction
+ROLLUP_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class ViewEventBuffer:
+    """
+    Collects article views in memory and writes them to ArticleStat in bulk.
+
+    The buffer is flushed once it holds `STATS_BUFFER_SIZE` views, by a
+    background timer at most `STATS_FLUSH_INTERVAL` seconds after the first
+    view it holds arrived, and again when the process exits. A crash loses
+    whatever is still buffered, so setting `STATS_BUFFER_SIZE` to 1 writes
+    every view straight away.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.timer = None
+
+    def add(self, user, article):
+        """Records that `user` has viewed `article`"""
+        with self.lock:
+            self.events.append((user.pk, article.pk, timezone.now()))
+            due = len(self.events) >= settings.STATS_BUFFER_SIZE
+            if not due and self.timer is None:
+                self.timer = threading.Timer(
+                    settings.STATS_FLUSH_INTERVAL, self.flush_in_background)
+                self.timer.daemon = True
+                self.timer.start()
+        if due:
+            self.flush()
+
+    def cancel_timer(self):
+        # Called holding the lock
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def clear(self):
+        """Drops any buffered views without writing them"""
+        with self.lock:
+            self.events = []
+            self.cancel_timer()
+
+    def flush_in_background(self):
+        """Flushes from the timer thread, closing the connection it opened"""
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self):
+        """
+        Writes out the buffered views and returns how many were written.
+        Flushing happens inside whichever request fills the buffer or on
+        the timer thread, so a failure is logged rather than raised. When
+        views cannot be written, those of articles or readers deleted since
+        are dropped and the rest written again.
+        """
+        with self.lock:
+            events, self.events = self.events, []
+            self.cancel_timer()
+        if not events:
+            return 0
+
+        try:
+            self.write(events)
+        except Exception:
+            logger.exception('Could not write %d article views, retrying', len(events))
+            events = self.still_existing(events)
+            try:
+                self.write(events)
+            except Exception:
+                logger.exception('Dropped %d article views', len(events))
+                return 0
+        return len(events)
+
+    def write(self, events):
+        with transaction.atomic():
+            ArticleStat.objects.bulk_create([
+                ArticleStat(user_id=user, article_id=article, viewed_at=viewed_at)
+                for user, article, viewed_at in events
+            ])
+            views = Counter(article for _, article, _ in events)
+            for article, total in views.items():
+                ArticlesModel.objects.filter(pk=article).update_counters(
+                    views_count=total)
+
+    def still_existing(self, events):
+        """Returns the `events` whose article and reader both still exist"""
+        articles = set(ArticlesModel.objects.filter(
+            pk__in={article for _, article, _ in events}).values_list('pk', flat=True))
+        users = set(User.objects.filter(
+            pk__in={user for user, _, _ in events}).values_list('pk', flat=True))
+        return [event for event in events if event[0] in users and event[1] in articles]
+
+
+view_buffer = ViewEventBuffer()
+atexit.register(view_buffer.flush)
+
+
+def rollup_article_stats(batch_size=ROLLUP_BATCH_SIZE):
+    """
+    Adds the raw views not yet rolled up into ArticleDailyStat, `batch_size`
+    views per transaction, and then deletes raw views older than
+    `STATS_RAW_RETENTION_DAYS`. Returns the number of raw views rolled up.
+    Only one rollup should run at a time.
+    """
+    rolled_up = 0
+    while True:
+        with transaction.atomic():
+            # The very views counted are the ones marked, whatever is
+            # flushed meanwhile
+            ids = list(ArticleStat.objects.filter(rolled_up=False).order_by(
+                'id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            batch = ArticleStat.objects.filter(id__in=ids)
+
+            totals = batch.order_by().annotate(
+                date=TruncDate('viewed_at')
+            ).values('article', 'date').annotate(views=Count('id'))
+            for total in totals:
+                updated = ArticleDailyStat.objects.filter(
+                    article=total['article'], date=total['date']
+                ).update(views=F('views') + total['views'])
+                if not updated:
+                    ArticleDailyStat.objects.create(
+                        article_id=total['article'],
+                        date=total['date'],
+                        views=total['views']
+                    )
+            rolled_up += batch.update(rolled_up=True)
+
+    cutoff = timezone.now() - timedelta(days=settings.STATS_RAW_RETENTION_DAYS)
+    ArticleStat.objects.filter(rolled_up=True, viewed_at__lt=cutoff).delete()
+    return rolled_up
@@ -0,0 +1,159 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .cache import TAGS_VERSION_KEY, get_version, invalidate_tags, shared_cache
+from .models import ArticlesModel, TagDailyCount, Tags, upsert
+
+# How many tags the tag cloud shows, how many days trending tags are counted
+# over unless asked otherwise and at most, and how many tags are suggested
+TAG_CLOUD_SIZE = 50
+TRENDING_DAYS = 7
+MAX_TRENDING_DAYS = 90
+AUTOCOMPLETE_SIZE = 10
+
+ArticleTags = ArticlesModel.tags.through
+
+
+def tagging_of(instance, reverse=False, pk_set=None):
+    """
+    Returns the `(tag id, article creation date)` of the tags of the article
+    `instance`, or of the articles of the tag `instance` when `reverse`,
+    only those in `pk_set` when given
+    """
+    if reverse:
+        taggings = ArticleTags.objects.filter(tags_id=instance.pk)
+        if pk_set is not None:
+            taggings = taggings.filter(articlesmodel_id__in=pk_set)
+    else:
+        taggings = ArticleTags.objects.filter(articlesmodel_id=instance.pk)
+        if pk_set is not None:
+            taggings = taggings.filter(tags_id__in=pk_set)
+    return [
+        (tag, created_at.date())
+        for tag, created_at in taggings.values_list('tags_id', 'articlesmodel__created_at')
+    ]
+
+
+def record_tagging(taggings, sign=1):
+    """
+    Counts the `(tag id, article creation date)` taggings into the article
+    counts of their tags and the daily counts of trending tags, or out of
+    them when `sign` is -1
+    """
+    if not taggings:
+        return
+    per_tag = Counter(tag for tag, _ in taggings)
+    tags_by_total = defaultdict(list)
+    for tag, total in per_tag.items():
+        tags_by_total[total].append(tag)
+    per_day = Counter(taggings)
+
+    with transaction.atomic():
+        # Usually every tag changes by one, so a single UPDATE
+        for total, tags in tags_by_total.items():
+            Tags.objects.filter(pk__in=tags).update(
+                articles_count=F('articles_count') + sign * total)
+        # One upsert for every day
+        upsert(TagDailyCount, [
+            {'tag': tag, 'date': date, 'articles': sign * total}
+            for (tag, date), total in per_day.items()
+        ], ('tag', 'date'), update=('articles',))
+    invalidate_tags()
+
+
+def rebuild_tag_stats():
+    """
+    Recomputes the article counts of every tag and the daily counts of
+    trending tags from the tags of articles, returning the number of tags
+    """
+    with transaction.atomic():
+        updated = Tags.objects.update(articles_count=Coalesce(Subquery(
+            ArticleTags.objects.filter(tags=OuterRef('pk'))
+            .order_by()
+            .values('tags')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ), 0))
+        TagDailyCount.objects.all().delete()
+        per_day = Counter(
+            (tag, created_at.date())
+            for tag, created_at in ArticleTags.objects.values_list(
+                'tags_id', 'articlesmodel__created_at').iterator()
+        )
+        TagDailyCount.objects.bulk_create([
+            TagDailyCount(tag_id=tag, date=date, articles=total)
+            for (tag, date), total in per_day.items()
+        ])
+    invalidate_tags()
+    return updated
+
+
+def cached(name, compute):
+    """
+    Returns what `compute` returns, cached under `name` until the counts of
+    tags next change
+    """
+    key = 'tags:{}:{}'.format(get_version(TAGS_VERSION_KEY), name)
+    cache = shared_cache()
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        if settings.ARTICLE_CACHE_TTL:
+            cache.set(key, value, settings.ARTICLE_CACHE_TTL)
+    return value
+
+
+def counted(tags):
+    """Returns `(tag, number of articles)` pairs the way the API shows them"""
+    return [{'tag': tag, 'articles': articles} for tag, articles in tags]
+
+
+def tag_cloud():
+    """Returns the TAG_CLOUD_SIZE tags on most articles with their counts"""
+    return counted(cached('cloud', lambda: list(
+        Tags.objects.filter(articles_count__gt=0)
+        .order_by('-articles_count', 'tag')
+        .values_list('tag', 'articles_count')[:TAG_CLOUD_SIZE]
+    )))
+
+
+def trending_tags(days=TRENDING_DAYS, limit=TAG_CLOUD_SIZE):
+    """
+    Returns the `limit` tags on most articles created in the last `days`
+    days, today included, with how many articles that is
+    """
+    since = timezone.now().date() - timedelta(days=days - 1)
+
+    def compute():
+        return list(
+            TagDailyCount.objects.filter(date__gte=since)
+            .values('tag__tag')
+            .annotate(articles=Sum('articles'))
+            .filter(articles__gt=0)
+            .order_by('-articles', 'tag__tag')
+            .values_list('tag__tag', 'articles')[:limit]
+        )
+
+    return counted(cached('trending:{}:{}:{}'.format(since, days, limit), compute))
+
+
+def autocomplete_tags(prefix, limit=AUTOCOMPLETE_SIZE):
+    """
+    Returns the tags starting with `prefix`, those on most articles first.
+    The prefix is matched on the unique index of tags.
+    """
+    prefix = slugify(prefix)
+    if not prefix:
+        return []
+    return counted(
+        Tags.objects.filter(tag__startswith=prefix)
+        .order_by('-articles_count', 'tag')
+        .values_list('tag', 'articles_count')[:limit]
+    )
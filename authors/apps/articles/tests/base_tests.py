@@ -1,14 +1,57 @@
+import threading
+import time
+
 from rest_framework.test import APITestCase, APIClient
 from rest_framework.reverse import reverse as API_Reverse
+from django.db import connection
 from django.urls import reverse
 
+from authors.apps.articles.cache import outcomes, shared_cache
+from authors.apps.articles.stats import view_buffer
 from authors.apps.authentication.token import generate_token
 
 
+def run_concurrently(target, threads=8, timeout=30):
+    """
+    Runs `target` on `threads` threads started together, each on a database
+    connection of its own, and returns what each call returned. Raises the
+    first error a call raised, or fails when the calls are still running
+    after `timeout` seconds.
+    """
+    barrier = threading.Barrier(threads)
+    results, errors = [], []
+
+    def run():
+        try:
+            barrier.wait(timeout)
+            results.append(target())
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=run, daemon=True) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    deadline = time.monotonic() + timeout
+    for worker in workers:
+        worker.join(max(deadline - time.monotonic(), 0))
+    if any(worker.is_alive() for worker in workers):
+        raise AssertionError('Concurrent calls still running after {}s'.format(timeout))
+    if errors:
+        raise errors[0]
+    return results
+
+
 class BaseTest(APITestCase):
     """This class provides a base for other tests"""
 
     def setUp(self):
+        # Views buffered by an earlier test belong to rolled back articles
+        view_buffer.clear()
+        # As are the responses cached for them
+        shared_cache().clear()
+        outcomes.clear()
         self.url = API_Reverse('articles:articles')
         self.client = APIClient()
         self.unauthorised_client = APIClient()
@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles import bulk
+from authors.apps.articles.bulk import allocate_slugs, export_articles, import_articles
+from authors.apps.articles.models import ArticlesModel, TagDailyCount, Tags, TimelineEntry
+from authors.apps.articles.search import search_articles
+from authors.apps.authentication.models import User
+from authors.apps.notifications.models import NotificationFanout
+
+
+def ndjson(*articles):
+    return [json.dumps(article) + '\n' for article in articles]
+
+
+def article_line(title='Hello World', **fields):
+    fields.setdefault('description', 'description')
+    fields.setdefault('body', 'the body of an imported article')
+    return dict(title=title, **fields)
+
+
+class BulkArticlesTest(TestCase):
+    """
+    Tests for importing and exporting articles as NDJSON
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+        self.follower = User.objects.create_user('johnDoe', 'john@doe.com', 'johndoe123')
+        self.follower.profile.follow(self.author.profile)
+
+    def test_articles_are_imported_with_their_tags_and_slugs(self):
+        ArticlesModel.objects.create(
+            title='Hello World', description='description', body='body', author=self.author)
+        result = import_articles(ndjson(
+            article_line(tags=['Python', 'django']),
+            article_line(tags=['python']),
+            article_line('Named', author='johnDoe', slug='kept-slug'),
+        ), author=self.author)
+        self.assertEqual(result, {'imported': 3, 'errors': []})
+
+        slugs = list(ArticlesModel.objects.filter(title='Hello World').values_list('slug', flat=True))
+        self.assertEqual(len(set(slugs)), 3)
+        self.assertIn('hello-world', slugs)
+        named = ArticlesModel.objects.get(slug='kept-slug')
+        self.assertEqual((named.author, named.word_count), (self.follower, 6))
+        self.assertEqual(sorted(Tags.objects.values_list('tag', flat=True)), ['django', 'python'])
+        self.assertEqual(Tags.objects.get(tag='python').articles.count(), 2)
+        self.assertEqual(search_articles(ArticlesModel.objects.all(), 'imported').count(), 3)
+
+    def test_imports_do_not_notify_followers(self):
+        import_articles(ndjson(article_line()), author=self.author)
+        self.assertFalse(NotificationFanout.objects.exists())
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_bad_lines_are_reported_and_skipped(self):
+        lines = ndjson(article_line(), article_line(tags=['#bad']), article_line(author='nobody'))
+        lines.insert(1, '{not json\n')
+        result = import_articles(lines, author=self.author)
+        self.assertEqual(result['imported'], 1)
+        self.assertEqual([error['line'] for error in result['errors']], [2, 3, 4])
+        self.assertIn('tags', result['errors'][1]['errors'])
+        self.assertIn('author', result['errors'][2]['errors'])
+
+    def take_slugs_meanwhile(self, articles):
+        """Allocates slugs and then takes the first the way a concurrent writer would"""
+        wanted = allocate_slugs(articles)
+        ArticlesModel.objects.create(
+            title='taken', slug=articles[0].slug, description='description',
+            body='body', author=self.author)
+        return wanted
+
+    def test_slugs_taken_meanwhile_are_allocated_again(self):
+        with mock.patch.object(bulk, 'allocate_slugs', self.take_slugs_meanwhile):
+            result = import_articles(ndjson(
+                article_line(slug='wanted'), article_line('Other')), author=self.author)
+        self.assertEqual(result, {'imported': 2, 'errors': []})
+        imported = ArticlesModel.objects.get(title='Hello World')
+        self.assertTrue(imported.slug.startswith('wanted-'))
+        self.assertEqual(imported.tags.count(), 0)
+
+    def test_slugs_that_stay_taken_are_reported(self):
+        with mock.patch.object(bulk, 'allocate_slugs', self.take_slugs_meanwhile), \
+                mock.patch.object(ArticlesModel, 'suffix_slug', return_value='wanted'):
+            result = import_articles(ndjson(
+                article_line(slug='wanted'), article_line('Other')), author=self.author)
+        self.assertEqual(result['imported'], 1)
+        self.assertEqual([error['line'] for error in result['errors']], [1])
+        self.assertTrue(ArticlesModel.objects.filter(title='Other').exists())
+
+    def test_query_count_does_not_grow_with_chunk_size(self):
+        def count_queries(count, offset):
+            lines = ndjson(*[
+                article_line('article {}'.format(offset + i), tags=['tag {}'.format(i % 3)])
+                for i in range(count)
+            ])
+            with CaptureQueriesContext(connection) as context:
+                import_articles(lines, author=self.author)
+            return len(context.captured_queries)
+
+        count_queries(3, 0)
+        self.assertEqual(count_queries(3, 100), count_queries(30, 200))
+
+    def test_exported_articles_import_again(self):
+        import_articles(ndjson(article_line(tags=['python'])), author=self.author)
+        lines = list(export_articles(chunk_size=1))
+        exported = json.loads(lines[0])
+        self.assertEqual(
+            (exported['slug'], exported['author'], exported['tags']),
+            ('hello-world', 'janeDoe', ['python']))
+
+        ArticlesModel.objects.all().delete()
+        self.assertEqual(import_articles(lines)['imported'], 1)
+        self.assertTrue(ArticlesModel.objects.filter(slug='hello-world', author=self.author).exists())
+
+    def test_publication_dates_survive_a_round_trip(self):
+        # Exports keep milliseconds
+        published = (timezone.now() - timedelta(days=400)).replace(microsecond=0)
+        import_articles(ndjson(
+            article_line(tags=['python'], created_at=published.isoformat()),
+            article_line('Undated'),
+        ), author=self.author)
+        self.assertEqual(ArticlesModel.objects.get(title='Hello World').created_at, published)
+        self.assertGreater(ArticlesModel.objects.get(title='Undated').created_at, published)
+        lines = list(export_articles())
+
+        ArticlesModel.objects.all().delete()
+        TagDailyCount.objects.all().delete()
+        self.assertEqual(import_articles(lines)['imported'], 2)
+        self.assertEqual(ArticlesModel.objects.get(title='Hello World').created_at, published)
+        self.assertEqual(
+            list(TagDailyCount.objects.values_list('date', flat=True)), [published.date()])
+
+    def test_commands_import_and_export(self):
+        source = self.write_lines(ndjson(article_line(), article_line('Second')))
+        out = StringIO()
+        call_command('import_articles', source, author='janeDoe', stdout=out)
+        self.assertIn('Imported 2 article(s)', out.getvalue())
+        out = StringIO()
+        call_command('export_articles', stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+    def write_lines(self, lines):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False)
+        handle.writelines(lines)
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+
+class BulkArticlesViewTest(TestCase):
+    """
+    Tests for the admin only bulk article endpoint
+    """
+
+    def setUp(self):
+        self.url = API_Reverse('articles:bulk')
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser('admin', 'admin@authors.com', 'admin123')
+
+    def test_admins_import_and_export(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            self.url, ''.join(ndjson(article_line(), article_line('Second'))),
+            content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['imported'], 2)
+        self.assertEqual(ArticlesModel.objects.filter(author=self.admin).count(), 2)
+
+        response = self.client.get(self.url)
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Hello World', 'Second'])
+
+    def test_other_users_are_refused(self):
+        self.client.force_authenticate(User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(self.client.post(self.url, '', content_type='application/x-ndjson').status_code, 403)
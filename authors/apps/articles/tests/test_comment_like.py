@@ -4,7 +4,13 @@ from rest_framework.test import APITestCase
 from rest_framework.reverse import reverse as api_reverse
 from rest_framework import status
 
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
 from authors import settings
+from authors.apps.articles.models import ArticlesModel, Comment, CommentLike
+from authors.apps.authentication.models import User
 from .base_tests import BaseTest
 
 class LikesDislikesTests(BaseTest):
@@ -138,3 +144,63 @@ class LikesDislikesTests(BaseTest):
         old_count = 1
         self.create_like()
         self.assertNotEqual(comment_like_count, old_count)
+
+
+class CommentLikeCountTest(BaseTest):
+    """
+    Tests for the like counter of comments and looking up liked comments
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+        self.commented = ArticlesModel.objects.create(
+            title='article', description='description', body='body', author=self.author)
+        self.first = Comment.objects.create(body='first', author=self.author, article=self.commented)
+        self.second = Comment.objects.create(body='second', author=self.author, article=self.commented)
+        self.create_and_login_user()
+
+    def like_url(self, comment):
+        return api_reverse('articles:comment-like', kwargs={'slug': self.commented.slug, 'id': comment.id})
+
+    def like_count(self, comment):
+        return Comment.objects.get(pk=comment.pk).like_count
+
+    @override_settings(AUTH_CACHE_TTL=30)
+    def test_liking_takes_two_queries_and_keeps_the_comment(self):
+        updated_at = self.first.updated_at
+        # Warm the authentication cache so that only the like is counted
+        self.client.delete(self.like_url(self.second))
+        for like, expected in ((True, 201), (False, 200)):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.like_url(self.first), {'comment_likes': like}, format='json')
+            self.assertEqual(response.status_code, expected)
+            self.assertLessEqual(len(context.captured_queries), 2)
+        self.assertEqual(Comment.objects.get(pk=self.first.pk).updated_at, updated_at)
+
+    def test_likes_are_counted_once(self):
+        url = self.like_url(self.first)
+        self.client.post(url, {'comment_likes': True}, format='json')
+        response = self.client.post(url, {'comment_likes': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.like_count(self.first), 1)
+        response = self.client.post(url, {'comment_likes': False}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(url, {'comment_likes': False}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.like_count(self.first), 0)
+        self.assertFalse(CommentLike.objects.exists())
+
+    def test_liking_a_missing_comment(self):
+        url = api_reverse('articles:comment-like', kwargs={'slug': self.commented.slug, 'id': 0})
+        response = self.client.post(url, {'comment_likes': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_liked_comments_are_looked_up_together(self):
+        self.client.post(self.like_url(self.second), {'comment_likes': True}, format='json')
+        url = api_reverse('articles:liked-comments', kwargs={'slug': self.commented.slug})
+        response = self.client.get(url, {'ids': '{},{}'.format(self.first.id, self.second.id)})
+        self.assertEqual(response.data, {'liked': [self.second.id]})
+        self.assertEqual(self.client.get(url, {'ids': 'one'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.unauthorised_client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
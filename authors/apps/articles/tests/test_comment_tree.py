@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, Comment, CommentLike
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class CommentTreeTest(BaseTest):
+    """
+    Tests for listing the comment threads of an article
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.token)
+        self.commented = ArticlesModel.objects.get(slug=self.slug)
+        self.author = User.objects.get(email=self.user['user']['email'])
+        self.tree_url = API_Reverse('articles:comment-tree', kwargs={'slug': self.slug})
+
+    def add_comment(self, body, parent=None):
+        return Comment.objects.create(
+            body=body, author=self.author, article=self.commented, parent=parent)
+
+    def get_tree(self, url=None, **params):
+        response = self.unauthorised_client.get(url or self.tree_url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_replies_are_nested_at_any_depth(self):
+        comment = self.add_comment('first')
+        for depth in range(5):
+            comment = self.add_comment('reply {}'.format(depth), parent=comment)
+        self.assertEqual((comment.depth, comment.root.body), (5, 'first'))
+
+        node = self.get_tree()['comments'][0]
+        for depth in range(5):
+            self.assertEqual(node['reply_count'], 1)
+            node = node['replies'][0]
+            self.assertEqual((node['body'], node['depth']), ('reply {}'.format(depth), depth + 1))
+        self.assertEqual(node['replies'], [])
+
+    def test_replies_made_through_the_api_join_the_thread(self):
+        first = self.add_comment('first')
+        url = API_Reverse('articles:comment-details', kwargs={'slug': self.slug, 'id': first.id})
+        response = self.client.post(url, self.comment_data('reply'), format='json')
+        reply = Comment.objects.get(pk=response.data['id'])
+        self.assertEqual((reply.root_id, reply.depth), (first.id, 1))
+
+    def comment_data(self, body):
+        return {'comment': {'body': body}}
+
+    def test_likes_and_replies_are_counted(self):
+        first = self.add_comment('first')
+        CommentLike.objects.like(first.id, User.objects.create_user('fan', 'fan@fan.com', 'fan12345'))
+        self.add_comment('one', parent=first)
+        self.add_comment('two', parent=first)
+        node = self.get_tree()['comments'][0]
+        self.assertEqual((node['like_count'], node['reply_count']), (1, 2))
+        self.assertEqual([reply['body'] for reply in node['replies']], ['one', 'two'])
+
+    def test_query_count_does_not_grow_with_the_tree(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                self.get_tree()
+            return len(context.captured_queries)
+
+        first = self.add_comment('first')
+        self.add_comment('reply', parent=first)
+        small = count_queries()
+        for i in range(5):
+            parent = self.add_comment('thread {}'.format(i))
+            for j in range(3):
+                parent = self.add_comment('reply {}'.format(j), parent=parent)
+        self.assertEqual(count_queries(), small)
+
+    def test_top_level_comments_are_paginated(self):
+        for i in range(3):
+            self.add_comment('thread {}'.format(i))
+        page = self.get_tree(page_size=2)
+        self.assertEqual([c['body'] for c in page['comments']], ['thread 2', 'thread 1'])
+        page = self.get_tree(page['next'])
+        self.assertEqual([c['body'] for c in page['comments']], ['thread 0'])
+
+    def test_unknown_article(self):
+        url = API_Reverse('articles:comment-tree', kwargs={'slug': 'missing'})
+        self.assertEqual(self.unauthorised_client.get(url).status_code, 404)
@@ -0,0 +1,75 @@
+from django.core.management import call_command
+from django.utils.six import StringIO
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, Comment
+from authors.apps.articles.stats import view_buffer
+from .base_tests import BaseTest
+
+
+class ArticleCountersTest(BaseTest):
+    """
+    Tests the denormalized counters kept on articles
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.author_token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.author_token)
+        self.reader_token = self.create_and_login_user(self.user2)
+
+    def get_article(self):
+        return ArticlesModel.objects.get(slug=self.slug)
+
+    def test_likes_and_dislikes_are_counted(self):
+        url = API_Reverse('articles:article-like', {self.slug: 'slug'})
+        self.client.post(url, {'likes': True}, format='json')
+        self.assertEqual(self.get_article().likes_count, 1)
+        self.client.post(url, {'likes': False}, format='json')
+        article = self.get_article()
+        self.assertEqual((article.likes_count, article.dislikes_count), (0, 1))
+        self.client.delete(url)
+        self.assertEqual(self.get_article().dislikes_count, 0)
+
+    def test_ratings_are_counted(self):
+        url = API_Reverse('articles:ratings', {self.slug: 'slug'})
+        self.client.post(url, {'rating': {'rating': 4}}, format='json')
+        self.client.put(url, {'rating': {'rating': 2}}, format='json')
+        article = self.get_article()
+        self.assertEqual((article.rating_count, article.avg_rating), (1, 2))
+        self.client.delete(url)
+        self.assertIsNone(self.get_article().avg_rating)
+
+    def test_comments_and_views_are_counted(self):
+        url = API_Reverse('articles:comments', {self.slug: 'slug'})
+        response = self.client.post(url, self.comment, format='json')
+        self.client.get(API_Reverse('articles:article-details', {self.slug: 'slug'}))
+        view_buffer.flush()
+        article = self.get_article()
+        self.assertEqual((article.comments_count, article.views_count), (1, 1))
+        url = API_Reverse(
+            'articles:comment-details', {self.slug: 'slug', response.data['id']: 'id'})
+        self.client.delete(url)
+        self.assertEqual(self.get_article().comments_count, 0)
+
+    def test_saving_an_article_keeps_its_counters(self):
+        article = self.get_article()
+        ArticlesModel.objects.filter(pk=article.pk).update_counters(likes_count=3)
+        article.title = 'new title'
+        article.save()
+        self.assertEqual(self.get_article().likes_count, 3)
+
+    def test_rebuild_command_fixes_drift(self):
+        url = API_Reverse('articles:article-like', {self.slug: 'slug'})
+        self.client.post(url, {'likes': True}, format='json')
+        ArticlesModel.objects.update(likes_count=10, comments_count=5)
+        call_command('rebuild_article_counters', stdout=StringIO())
+        article = self.get_article()
+        self.assertEqual((article.likes_count, article.comments_count), (1, 0))
+
+    def test_rebuild_command_fixes_comment_likes(self):
+        url = API_Reverse('articles:comments', {self.slug: 'slug'})
+        comment_id = self.client.post(url, self.comment, format='json').data['id']
+        Comment.objects.update(like_count=4)
+        call_command('rebuild_article_counters', stdout=StringIO())
+        self.assertEqual(Comment.objects.get(pk=comment_id).like_count, 0)
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class ArticleCursorPaginationTest(BaseTest):
+    """
+    Tests for the opt-in keyset pagination of the article feed
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_and_login_user()
+        author = User.objects.get(email=self.user['user']['email'])
+        for i in range(7):
+            ArticlesModel.objects.create(
+                title='article {}'.format(i),
+                description='description',
+                body='body of the article',
+                author=author
+            )
+        # Articles created in the same instant are ordered by id
+        now = timezone.now()
+        ArticlesModel.objects.filter(title__in=['article 2', 'article 3', 'article 4']).update(created_at=now)
+        ArticlesModel.objects.filter(title__in=['article 5', 'article 6']).update(
+            created_at=now + timedelta(seconds=1))
+        self.expected = ['article 6', 'article 5', 'article 4', 'article 3',
+                         'article 2', 'article 1', 'article 0']
+
+    def get_page(self, url=None, **params):
+        params.setdefault('pagination', 'cursor')
+        response = self.client.get(url or self.url, {} if url else params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def titles(self, page):
+        return [article['title'] for article in page['results']]
+
+    def test_walks_the_feed_in_order(self):
+        page = self.get_page(page_size=3)
+        self.assertIsNone(page['previous'])
+        self.assertNotIn('count', page)
+        titles = self.titles(page)
+        while page['next']:
+            page = self.get_page(page['next'])
+            titles.extend(self.titles(page))
+        self.assertEqual(titles, self.expected)
+
+    def test_previous_link_goes_back(self):
+        first = self.get_page(page_size=3)
+        second = self.get_page(first['next'])
+        self.assertEqual(self.titles(second), self.expected[3:6])
+        back = self.get_page(second['previous'])
+        self.assertEqual(self.titles(back), self.titles(first))
+        self.assertIsNone(back['previous'])
+
+    def test_count_only_when_asked(self):
+        page = self.get_page(page_size=3, count='true')
+        self.assertEqual(page['count'], 7)
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        def count_queries(url=None, **params):
+            with CaptureQueriesContext(connection) as context:
+                page = self.get_page(url, **params)
+            return page, len(context.captured_queries)
+
+        count_queries(page_size=2)
+        page, first = count_queries(page_size=2)
+        page, deep = count_queries(self.get_page(page['next'])['next'])
+        self.assertEqual(first, deep)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_numbers_stay_the_default(self):
+        response = self.client.get(self.url, {'page_size': 3})
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 3)
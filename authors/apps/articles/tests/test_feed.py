@@ -0,0 +1,147 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, TimelineEntry
+from authors.apps.authentication.models import User
+from authors.apps.notifications.fanout import process_notifications
+from .base_tests import BaseTest
+
+
+@override_settings(FEED_FANOUT_MAX_FOLLOWERS=2)
+class FeedTest(BaseTest):
+    """
+    Tests for the home feed of articles by followed authors
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_and_login_user()
+        self.reader = User.objects.get(email=self.user['user']['email'])
+        self.feed_url = API_Reverse('articles:feed')
+        self.authors = {
+            name: User.objects.create_user(name, '{}@authors.com'.format(name), 'password123')
+            for name in ('alice', 'bruno', 'carla')
+        }
+
+    def publish(self, author, title):
+        article = ArticlesModel.objects.create(
+            title=title, description='description', body='body', author=self.authors[author])
+        process_notifications()
+        return article
+
+    def follow(self, author, reader=None):
+        (reader or self.reader).profile.follow(self.authors[author].profile)
+
+    def make_widely_followed(self, author):
+        self.follow(author)
+        self.follow(author, reader=User.objects.create_user(
+            'fan', 'fan@authors.com', 'password123'))
+
+    def get_feed(self, url=None, **params):
+        response = self.client.get(url or self.feed_url, {} if url else params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def titles(self, page):
+        return [article['title'] for article in page['results']]
+
+    def test_new_articles_are_written_into_follower_feeds(self):
+        self.follow('alice')
+        ArticlesModel.objects.create(
+            title='followed', description='description', body='body', author=self.authors['alice'])
+        self.assertFalse(TimelineEntry.objects.exists())
+        process_notifications()
+        self.publish('bruno', 'not followed')
+        self.assertEqual(
+            list(TimelineEntry.objects.values_list('owner', 'article__title')),
+            [(self.reader.id, 'followed')])
+        self.assertEqual(self.titles(self.get_feed()), ['followed'])
+
+    def test_following_backfills_and_unfollowing_drops(self):
+        self.publish('alice', 'earlier')
+        self.follow('alice')
+        self.assertEqual(self.titles(self.get_feed()), ['earlier'])
+        self.reader.profile.unfollow(self.authors['alice'].profile)
+        self.assertEqual(self.titles(self.get_feed()), [])
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_follows_through_the_relation_update_feeds(self):
+        self.publish('bruno', 'earlier')
+        self.reader.profile.isfollowing.add(self.authors['bruno'].profile)
+        self.assertEqual(self.titles(self.get_feed()), ['earlier'])
+        self.authors['bruno'].profile.is_following.clear()
+        self.assertEqual(self.titles(self.get_feed()), [])
+
+    def test_widely_followed_authors_are_merged_on_read(self):
+        self.make_widely_followed('carla')
+        self.follow('alice')
+        now = timezone.now()
+        for i in range(6):
+            article = self.publish('alice' if i % 2 else 'carla', 'article {}'.format(i))
+            ArticlesModel.objects.filter(pk=article.pk).update(
+                created_at=now + timedelta(seconds=i))
+            TimelineEntry.objects.filter(article=article).update(
+                created_at=now + timedelta(seconds=i))
+        self.assertFalse(TimelineEntry.objects.filter(article__author=self.authors['carla']).exists())
+
+        page = self.get_feed(page_size=4)
+        titles = self.titles(page)
+        self.assertIsNone(page['previous'])
+        page = self.get_feed(page['next'])
+        titles.extend(self.titles(page))
+        self.assertIsNone(page['next'])
+        self.assertEqual(titles, ['article {}'.format(i) for i in reversed(range(6))])
+        self.assertEqual(
+            self.titles(self.get_feed(page['previous'])), titles[:4])
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.make_widely_followed('carla')
+        self.follow('alice')
+        for i in range(4):
+            self.publish('alice', 'alice {}'.format(i))
+            self.publish('carla', 'carla {}'.format(i))
+
+        def count_queries(page_size):
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(len(self.get_feed(page_size=page_size)['results']), page_size)
+            return len(context.captured_queries)
+
+        # Warm the authentication cache so both requests look the user up alike
+        count_queries(1)
+        self.assertEqual(count_queries(2), count_queries(8))
+
+    def test_rebuild_rewrites_the_timelines(self):
+        self.follow('alice')
+        self.publish('alice', 'kept')
+        self.make_widely_followed('carla')
+        merged = self.publish('carla', 'merged')
+        TimelineEntry.objects.all().delete()
+        TimelineEntry.objects.create(
+            owner=self.reader, article=merged, created_at=merged.created_at)
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(
+            list(TimelineEntry.objects.values_list('owner', 'article__title')),
+            [(self.reader.id, 'kept')])
+        self.assertEqual(self.titles(self.get_feed()), ['merged', 'kept'])
+
+    def test_authors_dropping_under_the_threshold_are_written_into_feeds(self):
+        self.make_widely_followed('carla')
+        self.publish('carla', 'merged')
+        self.assertFalse(TimelineEntry.objects.exists())
+        fan = User.objects.get(username='fan')
+        fan.profile.unfollow(self.authors['carla'].profile)
+        self.assertEqual(
+            list(TimelineEntry.objects.values_list('owner', 'article__title')),
+            [(self.reader.id, 'merged')])
+        self.assertEqual(self.titles(self.get_feed()), ['merged'])
+
+    def test_feed_requires_login(self):
+        response = self.unauthorised_client.get(self.feed_url)
+        self.assertEqual(response.status_code, 403)
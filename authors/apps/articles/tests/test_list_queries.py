@@ -0,0 +1,60 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authors.apps.articles.models import ArticlesModel, Favourite, LikesDislikes, Rating, Tags
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class ArticleListQueriesTest(BaseTest):
+    """
+    Tests that listing articles takes a fixed number of queries
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_and_login_user(self.user2)
+        self.reader = User.objects.get(email=self.user2['user']['email'])
+        self.token = self.create_and_login_user()
+        author = User.objects.get(email=self.user['user']['email'])
+        tags = [Tags.objects.create(tag='tag-{}'.format(i)) for i in range(3)]
+        for i in range(8):
+            article = ArticlesModel.objects.create(
+                title='article {}'.format(i),
+                description='description',
+                body='body of the article',
+                author=author
+            )
+            article.tags.add(*tags)
+            LikesDislikes.objects.create(article=article, reader=self.reader, likes=True)
+            Rating.objects.create(user=self.reader, article=article, rating=3)
+            Favourite.objects.create(user=author, article=article)
+        ArticlesModel.objects.rebuild_counters()
+
+    def count_queries(self, page_size):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                self.url, {'page_size': page_size}, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(len(response.data['results']), page_size)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        # Warm the authentication cache so both requests look the user up alike
+        self.count_queries(1)
+        self.assertEqual(self.count_queries(2), self.count_queries(8))
+
+    def test_listing_returns_article_state(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token)
+        article = response.data['results'][0]
+        self.assertEqual(article['likes_count'], 1)
+        self.assertEqual(article['dislikes_count'], 0)
+        self.assertEqual(article['rating'], {'avg_rating': 3.0, 'rating': None})
+        self.assertTrue(article['favourited'])
+        self.assertEqual(len(article['tags']), 3)
+
+    def test_authors_are_listed_with_their_follow_counts(self):
+        self.reader.profile.follow(User.objects.get(email=self.user['user']['email']).profile)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token)
+        author = response.data['results'][0]['author']
+        self.assertEqual((author['followers_count'], author['followed_by_me']), (1, False))
+        self.assertNotIn('isfollowing', author)
@@ -0,0 +1,45 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .base_tests import BaseTest
+
+
+class ArticleProjectionTest(BaseTest):
+    """
+    Tests for listing only some fields of articles
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.create_article(token=self.token)
+
+    def list_articles(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, 200)
+        article_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "articles_articlesmodel"' in query['sql']
+            and '"articles_articlesmodel"."title"' in query['sql']
+        ]
+        return response.data['results'][0], article_queries[0]
+
+    def test_summary_leaves_out_the_body_and_share_links(self):
+        article, sql = self.list_articles(view='summary')
+        for field in ('body', 'facebook', 'Linkedin', 'twitter', 'mail'):
+            self.assertNotIn(field, article)
+        self.assertEqual(article['time_to_read'], '1 min')
+        self.assertIn('url', article)
+        self.assertNotIn('"articles_articlesmodel"."body"', sql)
+
+    def test_requested_fields_only(self):
+        article, sql = self.list_articles(fields='title,slug,unknown')
+        self.assertEqual(set(article), {'title', 'slug'})
+        self.assertNotIn('"articles_articlesmodel"."body"', sql)
+
+    def test_every_field_by_default(self):
+        article, sql = self.list_articles()
+        self.assertEqual(article['body'], self.article['article']['body'])
+        self.assertEqual(article['facebook'], 'http://www.facebook.com/sharer.php?u=' + article['url'])
+        self.assertIn('"articles_articlesmodel"."body"', sql)
@@ -4,7 +4,11 @@ from rest_framework.test import APITestCase
 from rest_framework.reverse import reverse as api_reverse
 from rest_framework import status
 
+from django.core.management import call_command
+from django.utils.six import StringIO
+
 from authors import settings
+from authors.apps.articles.models import ArticleRatingCount, ArticlesModel, Rating
 from .base_tests import BaseTest
 
 class RatingsTest(BaseTest):
@@ -181,3 +185,46 @@ class RatingsTest(BaseTest):
         resp = self.client.get(self.article_rating_url)
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertNotIn(b'\'rating\'', resp.content)
+
+    def get_histogram(self):
+        url = api_reverse('articles:rating-histogram', {self.article_slug: 'slug'})
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data
+
+    def test_ratings_are_counted_into_the_histogram(self):
+        """Rating, re-rating and deleting a rating move the counters"""
+        self.create_article_rating()
+        self.rating['rating']['rating'] = 2.5
+        resp = self.create_article_rating()
+        self.assertEqual(resp.json()['rating']['avg_rating'], 2.5)
+        self.assertEqual(Rating.objects.count(), 1)
+
+        histogram = self.get_histogram()
+        self.assertEqual((histogram['rating_count'], histogram['avg_rating']), (1, 2.5))
+        self.assertEqual(histogram['histogram'], {0: 0, 1: 0, 2: 1, 3: 0, 4: 0, 5: 0})
+
+        self.client.delete(self.article_rating_url)
+        histogram = self.get_histogram()
+        self.assertEqual((histogram['rating_count'], histogram['avg_rating']), (0, None))
+        self.assertEqual(sum(histogram['histogram'].values()), 0)
+
+    def test_getting_an_unrated_article_shows_only_the_average(self):
+        """Without a rating of their own a user gets no one else's rating"""
+        self.create_article_rating()
+        self.client.credentials(HTTP_AUTHORIZATION=self.author_token)
+        resp = self.client.get(self.article_rating_url)
+        self.assertEqual(resp.json()['rating'], {
+            'article': self.article_slug, 'rating': None, 'avg_rating': 4.0})
+
+    def test_histogram_of_a_missing_article(self):
+        url = api_reverse('articles:rating-histogram', {'no-such-article': 'slug'})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rebuild_command_fixes_the_histogram(self):
+        self.create_article_rating()
+        ArticleRatingCount.objects.update(ratings=7)
+        ArticlesModel.objects.update(rating_count=3)
+        call_command('rebuild_article_counters', stdout=StringIO())
+        histogram = self.get_histogram()
+        self.assertEqual((histogram['rating_count'], histogram['histogram'][4]), (1, 1))
@@ -0,0 +1,57 @@
+from django.test import TestCase, TransactionTestCase
+
+from authors.apps.articles.models import ArticlesModel, LikesDislikes
+from authors.apps.authentication.models import User
+from .base_tests import run_concurrently
+
+
+class ReactionsTest(TestCase):
+    """
+    Tests for recording likes and dislikes with their counters
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+        self.reader = User.objects.create_user('johnDoe', 'john@doe.com', 'johndoe123')
+        self.story = ArticlesModel.objects.create(
+            title='article', description='description', body='body', author=self.author)
+
+    def counters(self):
+        return ArticlesModel.objects.values_list('likes_count', 'dislikes_count').get(pk=self.story.pk)
+
+    def test_reactions_move_the_counters(self):
+        react = LikesDislikes.objects.react
+        self.assertEqual(react(self.story, self.reader, True), 'created')
+        self.assertEqual(self.counters(), (1, 0))
+        self.assertEqual(react(self.story, self.reader, True), 'unchanged')
+        self.assertEqual(self.counters(), (1, 0))
+        self.assertEqual(react(self.story, self.reader, False), 'changed')
+        self.assertEqual(self.counters(), (0, 1))
+        self.assertEqual(LikesDislikes.objects.count(), 1)
+
+        self.assertEqual(LikesDislikes.objects.withdraw(self.story, self.reader), False)
+        self.assertEqual(self.counters(), (0, 0))
+        self.assertIsNone(LikesDislikes.objects.withdraw(self.story, self.reader))
+        self.assertEqual(self.counters(), (0, 0))
+
+    def test_reactions_do_not_save_the_article(self):
+        updated_at = self.story.updated_at
+        LikesDislikes.objects.react(self.story, self.reader, True)
+        LikesDislikes.objects.withdraw(self.story, self.reader)
+        self.assertEqual(ArticlesModel.objects.get(pk=self.story.pk).updated_at, updated_at)
+
+
+class ConcurrentReactionsTest(TransactionTestCase):
+    """
+    Tests for the same reader reacting from concurrent requests
+    """
+
+    def test_double_clicks_record_one_reaction(self):
+        author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+        reader = User.objects.create_user('johnDoe', 'john@doe.com', 'johndoe123')
+        story = ArticlesModel.objects.create(
+            title='article', description='description', body='body', author=author)
+        outcomes = run_concurrently(lambda: LikesDislikes.objects.react(story, reader, True))
+        self.assertEqual(sorted(outcomes), ['created'] + ['unchanged'] * 7)
+        self.assertEqual(LikesDislikes.objects.count(), 1)
+        self.assertEqual(ArticlesModel.objects.get(pk=story.pk).likes_count, 1)
@@ -1,10 +1,46 @@
 import json
+import threading
 from rest_framework import status
 
-from authors.apps.articles.models import ArticleStat, Comment
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import override_settings
+from django.utils.six import StringIO
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, ArticleStat, ArticleDailyStat, Comment
+from authors.apps.articles.stats import ViewEventBuffer, rollup_article_stats, view_buffer
 from authors.apps.articles.tests.base_tests import BaseTest
 
 
+class FailingOnceBuffer(ViewEventBuffer):
+    """A view buffer whose first write fails the way a deleted article does"""
+
+    def __init__(self, failures=1):
+        super().__init__()
+        self.failures = failures
+        self.written = []
+
+    def write(self, events):
+        if self.failures:
+            self.failures -= 1
+            raise IntegrityError('FOREIGN KEY constraint failed')
+        super().write(events)
+        self.written.extend(events)
+
+
+class RecordingBuffer(ViewEventBuffer):
+    """A view buffer that records what it writes instead of writing it"""
+
+    def __init__(self):
+        super().__init__()
+        self.written = threading.Event()
+
+    def write(self, events):
+        self.events_written = events
+        self.written.set()
+
+
 class StatsTestCase(BaseTest):
     """
     Class for reading stats test cases
@@ -17,6 +53,7 @@ class StatsTestCase(BaseTest):
         old_count = ArticleStat.objects.count()
         url = self.single_article_details()
         self.client.get(url, format='json')
+        view_buffer.flush()
         new_count = ArticleStat.objects.count()
         self.assertNotEqual(old_count, new_count)
 
@@ -45,8 +82,104 @@ class StatsTestCase(BaseTest):
         """
         url = self.single_article_details()
         self.client.get(url, format='json')
+        view_buffer.flush()
         old_count = ArticleStat.objects.count()
         url = self.single_article_details()
         self.client.get(url, format='json')
+        view_buffer.flush()
         new_count = ArticleStat.objects.count()
-        self.assertNotEqual(old_count, new_count)          
\ No newline at end of file
+        self.assertNotEqual(old_count, new_count)
+
+    def test_views_are_buffered_until_flushed(self):
+        """
+        Method asserts that views are only written once the buffer is flushed
+        """
+        url = self.single_article_details()
+        self.client.get(url, format='json')
+        self.client.get(url, format='json')
+        self.assertEqual(ArticleStat.objects.count(), 0)
+        self.assertEqual(view_buffer.flush(), 2)
+        self.assertEqual(ArticleStat.objects.count(), 2)
+        self.assertEqual(ArticlesModel.objects.get().views_count, 2)
+
+    @override_settings(STATS_BUFFER_SIZE=1)
+    def test_views_are_written_at_once_with_a_buffer_of_one(self):
+        """
+        Method asserts that a buffer size of one writes every view
+        """
+        url = self.single_article_details()
+        self.client.get(url, format='json')
+        self.assertEqual(ArticleStat.objects.count(), 1)
+
+    @override_settings(STATS_FLUSH_INTERVAL=0.01)
+    def test_idle_buffers_are_flushed_by_a_timer(self):
+        """
+        Method asserts that buffered views are written without new views
+        """
+        self.single_article_details()
+        article = ArticlesModel.objects.get()
+        buffer = RecordingBuffer()
+        buffer.add(article.author, article)
+        self.assertTrue(buffer.written.wait(5))
+        self.assertEqual([event[1] for event in buffer.events_written], [article.pk])
+        self.assertIsNone(buffer.timer)
+
+    def test_rollup_adds_views_to_daily_totals(self):
+        """
+        Method asserts that rolled up views are served by the stats endpoint
+        """
+        url = self.single_article_details()
+        self.client.get(url, format='json')
+        self.client.get(url, format='json')
+        view_buffer.flush()
+        call_command('rollup_article_stats', stdout=StringIO())
+        self.assertEqual(ArticleDailyStat.objects.get().views, 2)
+        self.assertFalse(ArticleStat.objects.filter(rolled_up=False).exists())
+
+        response = self.client.get(API_Reverse('articles:stats'))
+        stats = response.data[0]
+        self.assertEqual(stats['view_count'], 2)
+        self.assertEqual(stats['daily_views'][0]['views'], 2)
+
+    def test_rollup_counts_every_view_once_in_batches(self):
+        """
+        Method asserts that batches mark exactly the views they counted
+        """
+        url = self.single_article_details()
+        for _ in range(3):
+            self.client.get(url, format='json')
+        view_buffer.flush()
+        self.assertEqual(rollup_article_stats(batch_size=2), 3)
+        self.client.get(url, format='json')
+        view_buffer.flush()
+        self.assertEqual(rollup_article_stats(batch_size=2), 1)
+        self.assertEqual(ArticleDailyStat.objects.get().views, 4)
+
+    def test_views_of_deleted_articles_are_dropped_on_flush(self):
+        """
+        Method asserts that a failing flush keeps the views it still can
+        """
+        self.single_article_details()
+        article = ArticlesModel.objects.get()
+        reader = article.author
+        buffer = FailingOnceBuffer()
+        buffer.add(reader, article)
+        buffer.add(reader, ArticlesModel(pk=article.pk + 1000))
+        with self.assertLogs('authors.apps.articles.stats', 'ERROR'):
+            self.assertEqual(buffer.flush(), 1)
+        self.assertEqual([event[1] for event in buffer.written], [article.pk])
+        self.assertEqual(ArticlesModel.objects.get().views_count, 1)
+
+    def test_failing_flush_does_not_fail_the_request(self):
+        """
+        Method asserts that views that cannot be written are logged
+        """
+        self.single_article_details()
+        article = ArticlesModel.objects.get()
+        buffer = FailingOnceBuffer(failures=2)
+        buffer.add(article.author, article)
+        with self.assertLogs('authors.apps.articles.stats', 'ERROR') as logs:
+            self.assertEqual(buffer.flush(), 0)
+        self.assertIn('Dropped 1 article views', logs.output[-1])
+        self.assertEqual(buffer.flush(), 0)
+
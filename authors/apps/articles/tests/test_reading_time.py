@@ -0,0 +1,46 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from authors.apps.articles.helpers import count_words, format_read_time
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.authentication.models import User
+
+
+class ReadingTimeTest(TestCase):
+    """
+    Tests for the stored word count and reading time of articles
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+
+    def create(self, body):
+        return ArticlesModel.objects.create(
+            title='title', description='description', body=body, author=self.author)
+
+    def test_count_words(self):
+        self.assertEqual(count_words("It's a well-known fact, isn't it?"), 9)
+        self.assertEqual(count_words('  ...  '), 0)
+        self.assertEqual(count_words(None), 0)
+
+    def test_format_read_time(self):
+        self.assertEqual(format_read_time(1), '1 min')
+        self.assertEqual(format_read_time(3), '3 mins')
+
+    def test_reading_time_is_stored_on_save(self):
+        article = self.create('word ' * 251)
+        self.assertEqual((article.word_count, article.read_time_minutes), (251, 2))
+        article.body = 'a short body'
+        article.save()
+        article.refresh_from_db()
+        self.assertEqual((article.word_count, article.read_time_minutes), (3, 1))
+
+    def test_backfill(self):
+        article = self.create('word ' * 600)
+        ArticlesModel.objects.update(word_count=0, read_time_minutes=0)
+        out = StringIO()
+        call_command('backfill_reading_time', '--batch-size', '1', stdout=out)
+        article.refresh_from_db()
+        self.assertEqual((article.word_count, article.read_time_minutes), (600, 3))
+        self.assertIn('1 article(s)', out.getvalue())
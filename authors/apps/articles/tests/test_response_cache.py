@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.test import override_settings
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.cache import cache_stats, invalidate_articles
+from authors.apps.articles.models import Tags
+from .base_tests import BaseTest
+
+
+@override_settings(ARTICLE_CACHE_TTL=300)
+class AnonymousResponseCacheTest(BaseTest):
+    """
+    Tests caching the article reads of readers who are not logged in
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.author_token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.author_token)
+        self.detail_url = API_Reverse('articles:article-details', kwargs={'slug': self.slug})
+
+    def read(self, url=None, **headers):
+        return self.unauthorised_client.get(url or self.detail_url, **headers)
+
+    def test_repeated_reads_are_cached(self):
+        first = self.read()
+        with self.assertNumQueries(0):
+            second = self.read()
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_lists_are_cached_by_query(self):
+        self.assertEqual(self.read(self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.read(self.url + '?page_size=1')['X-Cache'], 'MISS')
+        self.assertEqual(self.read(self.url)['X-Cache'], 'HIT')
+
+    def test_logged_in_reads_are_not_cached(self):
+        response = self.client.get(self.detail_url, HTTP_AUTHORIZATION=self.author_token)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('X-Cache'))
+
+    def test_revalidation(self):
+        response = self.read()
+        self.assertEqual(self.read(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(
+            self.read(HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        self.assertEqual(self.read(HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def assertInvalidated(self, change):
+        before = self.read()
+        list_before = self.read(self.url)
+        change()
+        after = self.read()
+        self.assertEqual(after['X-Cache'], 'MISS')
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertEqual(self.read(self.url)['X-Cache'], 'MISS')
+        self.assertNotEqual(list_before.content, self.read(self.url).content)
+
+    def test_editing_the_article_invalidates(self):
+        self.assertInvalidated(lambda: self.client.put(
+            self.detail_url, {'article': {'title': 'new title'}},
+            format='json', HTTP_AUTHORIZATION=self.author_token))
+
+    def test_rating_the_article_invalidates(self):
+        url = API_Reverse('articles:ratings', kwargs={'slug': self.slug})
+        self.create_and_login_user(self.user2)
+        self.assertInvalidated(lambda: self.client.post(url, {'rating': {'rating': 4}}, format='json'))
+
+    def test_liking_the_article_invalidates(self):
+        url = API_Reverse('articles:article-like', kwargs={'slug': self.slug})
+        self.create_and_login_user(self.user2)
+        self.assertInvalidated(lambda: self.client.post(url, {'likes': True}, format='json'))
+
+    def test_renaming_a_tag_invalidates(self):
+        def rename():
+            tag = Tags.objects.get(tag='test')
+            tag.tag = 'renamed'
+            tag.save()
+        self.assertInvalidated(rename)
+
+    def test_other_articles_stay_cached(self):
+        other = self.create_article(token=self.author_token, article={
+            'article': {'title': 'other', 'description': 'other', 'body': 'other'}})
+        self.read()
+        self.client.put(
+            API_Reverse('articles:article-details', kwargs={'slug': other}),
+            {'article': {'title': 'changed'}}, format='json', HTTP_AUTHORIZATION=self.author_token)
+        self.assertEqual(self.read()['X-Cache'], 'HIT')
+
+    @override_settings(CACHES=dict(settings.CACHES, worker=settings.CACHES['shared']))
+    def test_invalidating_in_another_process_invalidates(self):
+        self.read()
+        self.assertEqual(self.read()['X-Cache'], 'HIT')
+        # A cache alias of its own stands in for the cache of another worker
+        with override_settings(ARTICLE_CACHE_ALIAS='worker'):
+            invalidate_articles(self.slug)
+        self.assertEqual(self.read()['X-Cache'], 'MISS')
+
+    @override_settings(ARTICLE_CACHE_TTL=0)
+    def test_cache_can_be_turned_off(self):
+        self.read()
+        self.assertFalse(self.read().has_header('X-Cache'))
@@ -69,3 +69,46 @@ class ArticlesSearchTest(BaseTest):
 
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(json.loads(resp.content)['article']['count'], 1)
+
+    def search(self, query):
+        resp = self.client.get(self.articles_url, {'search': query})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [article['title'] for article in json.loads(resp.content)['article']['results']]
+
+    def test_search_matches_word_prefixes(self):
+        """Test a search word matches the words it starts"""
+        self.assertEqual(self.search('scien'), ['Title', 'One'])
+        self.assertEqual(self.search('on'), ['One'])
+
+    def test_search_matches_every_word(self):
+        """Test every word of the search has to match"""
+        self.assertEqual(self.search('article one'), ['One'])
+        self.assertEqual(self.search('article missing'), [])
+
+    def test_search_ranks_title_matches_first(self):
+        """Test a match in the title ranks above one in the body"""
+        self.create_article(token=self.author_token, article={
+            'article': {
+                'title': 'Whole',
+                'description': 'Another test article',
+                'body': 'Nothing to see here',
+                'tags': []
+            }
+        })
+        self.assertEqual(self.search('whole'), ['Whole', 'Title', 'One'])
+
+    def test_search_follows_updates(self):
+        """Test an edited article is found by its new text"""
+        slug = self.create_article(token=self.author_token, article={
+            'article': {
+                'title': 'Draft',
+                'description': 'A draft',
+                'body': 'A draft body',
+                'tags': []
+            }
+        })
+        url = api_reverse('articles:article-details', kwargs={'slug': slug})
+        self.client.put(url, {'article': {'title': 'Published'}},
+                        format='json', HTTP_AUTHORIZATION=self.author_token)
+        self.assertEqual(self.search('published'), ['Published'])
+        self.assertEqual(self.search('draft body'), ['Published'])
@@ -0,0 +1,67 @@
+from django.test import TestCase, TransactionTestCase
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.authentication.models import User
+from .base_tests import run_concurrently
+
+
+class SlugTest(TestCase):
+    """
+    Tests for allocating article slugs
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+
+    def create(self, title='Hello World'):
+        return ArticlesModel.objects.create(
+            title=title, description='description', body='body', author=self.author)
+
+    def test_taken_titles_get_a_random_suffix(self):
+        slugs = [self.create().slug for _ in range(3)]
+        self.assertEqual(slugs[0], 'hello-world')
+        for slug in slugs[1:]:
+            self.assertRegex(slug, r'^hello-world-[a-z0-9]{8}$')
+        self.assertEqual(len(set(slugs)), 3)
+
+    def test_suffixed_slugs_fit(self):
+        title = 'a' * 128
+        self.create(title=title)
+        self.assertEqual(len(self.create(title=title).slug), 128)
+
+    def test_slug_is_allocated_in_one_query(self):
+        for _ in range(5):
+            self.create()
+        article = ArticlesModel(title='Hello World')
+        with self.assertNumQueries(1):
+            article.create_title_slug()
+
+    def test_taken_slug_is_retried(self):
+        self.create()
+        article = ArticlesModel(
+            title='Hello World', description='description', body='body', author=self.author)
+        # Another article took the slug between allocating and saving it
+        allocate = article.create_title_slug
+        article.create_title_slug = lambda random_suffix=False: (
+            allocate(random_suffix) if random_suffix else 'hello-world')
+        article.save()
+        self.assertRegex(article.slug, r'^hello-world-[a-z0-9]{8}$')
+
+
+class ConcurrentSlugTest(TransactionTestCase):
+    """
+    Tests for allocating slugs to articles created at the same time
+    """
+
+    def test_parallel_articles_with_the_same_title(self):
+        author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+
+        def create_articles():
+            for _ in range(5):
+                ArticlesModel.objects.create(
+                    title='Hello World', description='description', body='body', author=author)
+
+        run_concurrently(create_articles)
+        slugs = ArticlesModel.objects.values_list('slug', flat=True)
+        self.assertEqual(len(slugs), 40)
+        self.assertEqual(len(set(slugs)), 40)
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, TagDailyCount, Tags
+from authors.apps.articles.tag_stats import tag_cloud
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class TagStatsTest(BaseTest):
+    """
+    Tests for the article counts of tags, trending tags and the tag cloud
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+
+    def publish(self, *tags, days_ago=0):
+        article = ArticlesModel.objects.create(
+            title='article', description='description', body='body', author=self.author)
+        if days_ago:
+            article.created_at = timezone.now() - timedelta(days=days_ago)
+            ArticlesModel.objects.filter(pk=article.pk).update(created_at=article.created_at)
+        article.tags.add(*Tags.objects.resolve(tags))
+        return article
+
+    def counts(self):
+        return dict(Tags.objects.values_list('tag', 'articles_count'))
+
+    def get_tags(self, name, **params):
+        response = self.client.get(API_Reverse('articles:' + name), params)
+        self.assertEqual(response.status_code, 200)
+        return [(tag['tag'], tag['articles']) for tag in response.data['tags']]
+
+    def test_counts_follow_the_tags_of_articles(self):
+        first = self.publish('python', 'django')
+        second = self.publish('python')
+        self.assertEqual(self.counts(), {'python': 2, 'django': 1})
+
+        first.tags.remove(Tags.objects.get(tag='django'), Tags.objects.get(tag='python'))
+        second.tags.remove(Tags.objects.get(tag='django'))
+        self.assertEqual(self.counts(), {'python': 1, 'django': 0})
+
+        Tags.objects.get(tag='django').articles.add(first, second)
+        self.assertEqual(self.counts(), {'python': 1, 'django': 2})
+        second.tags.clear()
+        self.assertEqual(self.counts(), {'python': 0, 'django': 1})
+        first.delete()
+        self.assertEqual(self.counts(), {'python': 0, 'django': 0})
+        self.assertEqual(sum(TagDailyCount.objects.values_list('articles', flat=True)), 0)
+
+    def test_counts_match_a_rebuild(self):
+        self.publish('python', 'django')
+        self.publish('python', days_ago=3).tags.remove(Tags.objects.get(tag='python'))
+        self.publish('rust', days_ago=3)
+        counted = self.counts()
+        daily = set(TagDailyCount.objects.filter(articles__gt=0).values_list('tag', 'date', 'articles'))
+        call_command('rebuild_tag_stats', stdout=StringIO())
+        self.assertEqual(self.counts(), counted)
+        self.assertEqual(set(TagDailyCount.objects.values_list('tag', 'date', 'articles')), daily)
+
+    def test_trending_tags_count_recent_articles(self):
+        for _ in range(3):
+            self.publish('old', days_ago=20)
+        self.publish('new', 'old')
+        self.publish('new', days_ago=2)
+        self.assertEqual(self.get_tags('trending-tags'), [('new', 2), ('old', 1)])
+        self.assertEqual(self.get_tags('trending-tags', days=30), [('old', 4), ('new', 2)])
+        self.assertEqual(self.get_tags('trending-tags', days=30, limit=1), [('old', 4)])
+        response = self.client.get(API_Reverse('articles:trending-tags'), {'days': 'zero'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(ARTICLE_CACHE_TTL=300)
+    def test_tag_cloud_is_cached_until_counts_change(self):
+        self.publish('python', 'django')
+        self.publish('python')
+        self.assertEqual(self.get_tags('tag-cloud'), [('python', 2), ('django', 1)])
+        with self.assertNumQueries(0):
+            tag_cloud()
+        self.publish('django', 'rust')
+        self.assertEqual(self.get_tags('tag-cloud'), [('django', 2), ('python', 2), ('rust', 1)])
+
+    def test_autocomplete_matches_prefixes(self):
+        self.publish('python', 'pytest')
+        self.publish('python', 'rust')
+        self.assertEqual(self.get_tags('tag-autocomplete', q='Py'), [('python', 2), ('pytest', 1)])
+        self.assertEqual(self.get_tags('tag-autocomplete', q=''), [])
@@ -1,7 +1,11 @@
 from rest_framework import status
 import json
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
-from authors.apps.articles.tests.base_tests import BaseTest, API_Reverse
+from authors.apps.articles.models import Tags
+from authors.apps.articles.tests.base_tests import BaseTest, API_Reverse, run_concurrently
 
 
 class TagsTest(BaseTest):
@@ -39,6 +43,19 @@ class TagsTest(BaseTest):
         self.assertIn('test', json.dumps(response.data))
         self.assertIn('tags', json.dumps(response.data))
 
+    def test_tags_are_listed_by_popularity_a_page_at_a_time(self):
+        Tags.objects.bulk_create([
+            Tags(tag='rare', articles_count=1),
+            Tags(tag='popular', articles_count=5),
+            Tags(tag='common', articles_count=3),
+        ])
+        url = API_Reverse('tags:tags')
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['tags'], ['popular', 'common'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['tags'], ['rare'])
+
     def test_unauthorized_users_cannot_create_tags(self):
         """This method tests if unauthorized users can create tags"""
         url = API_Reverse('articles:articles')
@@ -58,3 +75,41 @@ class TagsTest(BaseTest):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('Tag cannot have special characters', json.dumps(response.data))
         self.assertIn('error', json.dumps(response.data))
+
+    def test_tags_are_resolved_in_a_fixed_number_of_queries(self):
+        Tags.objects.create(tag='existing')
+
+        def count_queries(title, tags):
+            self.article['article'].update(title=title, tags=tags)
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    self.url, self.article, format='json', HTTP_AUTHORIZATION=self.token)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(context.captured_queries)
+
+        # Warm the authentication cache so every request looks the user up alike
+        count_queries('warm up', ['existing', 'warm'])
+        self.assertEqual(
+            count_queries('two tags', ['existing', 'new one']),
+            count_queries('twenty tags', ['existing'] + ['tag {}'.format(i) for i in range(19)]))
+        self.assertEqual(Tags.objects.filter(tag='existing').count(), 1)
+
+    def test_repeated_tags_are_added_once(self):
+        self.article['article']['tags'] = ['Python', 'python', 'PYTHON']
+        response = self.client.post(self.url, self.article, format='json', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.data['tags'], ['python'])
+
+
+class ConcurrentTagsTest(TransactionTestCase):
+    """
+    Tests for resolving the same new tags from concurrent writers
+    """
+
+    def test_concurrent_writers_share_new_tags(self):
+        names = ['tag-{}'.format(i) for i in range(20)]
+        resolved = run_concurrently(
+            lambda: {tag.tag: tag.pk for tag in Tags.objects.resolve(names)})
+        self.assertEqual(Tags.objects.count(), len(names))
+        self.assertEqual(len(resolved), 8)
+        for tags in resolved:
+            self.assertEqual(tags, resolved[0])
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, Favourite, Highlighted, LikesDislikes, Rating
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class ViewerStateTest(BaseTest):
+    """
+    Tests for looking up what a reader did with many articles at once
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_and_login_user()
+        self.reader = User.objects.get(email=self.user['user']['email'])
+        self.author = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+        self.state_url = API_Reverse('articles:viewer-state')
+
+    def publish(self, title):
+        return ArticlesModel.objects.create(
+            title=title, description='description', body='body', author=self.author)
+
+    def get_state(self, *slugs):
+        response = self.client.get(self.state_url, {'slugs': ','.join(slugs)})
+        self.assertEqual(response.status_code, 200)
+        return response.data['articles']
+
+    def test_state_of_each_article(self):
+        liked, disliked, untouched = self.publish('liked'), self.publish('disliked'), self.publish('untouched')
+        Favourite.objects.create(article=liked, user=self.reader)
+        LikesDislikes.objects.react(liked, self.reader, True)
+        LikesDislikes.objects.react(disliked, self.reader, False)
+        LikesDislikes.objects.react(untouched, self.author, True)
+        Rating.objects.rate(disliked, self.reader, 2)
+        for index in range(2):
+            Highlighted.objects.create(
+                author=self.reader, article=liked, snippet='body', index=index)
+
+        state = self.get_state(untouched.slug, liked.slug, 'no-such-article', disliked.slug)
+        self.assertEqual(list(state), [untouched.slug, liked.slug, disliked.slug])
+        self.assertEqual(state[liked.slug], {
+            'favourited': True, 'liked': True, 'disliked': False, 'rating': None, 'highlights': 2})
+        self.assertEqual(state[disliked.slug], {
+            'favourited': False, 'liked': False, 'disliked': True, 'rating': 2, 'highlights': 0})
+        self.assertEqual(state[untouched.slug], {
+            'favourited': False, 'liked': False, 'disliked': False, 'rating': None, 'highlights': 0})
+
+    def test_query_count_does_not_grow_with_the_articles(self):
+        slugs = [self.publish('article {}'.format(i)).slug for i in range(20)]
+
+        def count_queries(slugs):
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(len(self.get_state(*slugs)), len(slugs))
+            return len(context.captured_queries)
+
+        # Warm the authentication cache so both requests look the user up alike
+        count_queries(slugs[:1])
+        self.assertEqual(count_queries(slugs[:2]), count_queries(slugs))
+
+    def test_too_many_slugs_are_refused(self):
+        slugs = ','.join('article-{}'.format(i) for i in range(settings.MAX_PAGE_SIZE + 1))
+        response = self.client.get(self.state_url, {'slugs': slugs})
+        self.assertEqual(response.status_code, 400)
+
+    def test_state_requires_login(self):
+        response = self.unauthorised_client.get(self.state_url)
+        self.assertEqual(response.status_code, 403)
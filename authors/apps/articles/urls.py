@@ -6,14 +6,23 @@ app_name = "articles"
 
 urlpatterns = [
     path('articles/', views.ArticlesList.as_view(), name='articles'),
+    path('articles/feed/', views.FeedView.as_view(), name='feed'),
+    path('articles/bulk/', views.BulkArticlesView.as_view(), name='bulk'),
+    path('articles/state/', views.ViewerStateView.as_view(), name='viewer-state'),
     path('articles/<slug>', views.ArticlesDetails.as_view(),  name='article-details'),
     path('articles/<slug>/comments/', views.CommentsListCreateView.as_view(), name='comments'),
+    path('articles/<slug>/comments/tree/', views.CommentTreeView.as_view(), name='comment-tree'),
     path('articles/<slug>/comments/<int:id>/', views.CommentsRetrieveUpdateDestroy.as_view(), name='comment-details'),
     path('articles/<slug>/rate/', views.RatingDetails.as_view(), name='ratings'),
+    path('articles/<slug>/rate/histogram/', views.RatingHistogramView.as_view(), name='rating-histogram'),
     path('articles/<slug>/favourite', views.FavouriteGenericAPIView.as_view(), name="favourite"),
     path('tags/', views.TagsView.as_view(), name='tags'),
+    path('tags/cloud/', views.TagCloudView.as_view(), name='tag-cloud'),
+    path('tags/trending/', views.TrendingTagsView.as_view(), name='trending-tags'),
+    path('tags/autocomplete/', views.TagAutocompleteView.as_view(), name='tag-autocomplete'),
     path('articles/<slug>/like/', views.ArticlesLikesDislikes.as_view(),  name='article-like'),
     path('articles/<slug>/comments/<int:id>/like', views.CommentLikes.as_view(), name='comment-like'),
+    path('articles/<slug>/comments/liked/', views.LikedCommentsView.as_view(), name='liked-comments'),
     path('articles/<slug>/report/', views.ReportArticlesView.as_view(), name='report'),
     path('articles/statistics/', views.ArticleStatsView.as_view(),  name='stats'),
     path('articles/<slug>/highlight/', views.HighlightedDetails.as_view(), name='highlighted'),
@@ -0,0 +1,40 @@
+from collections import OrderedDict
+
+from django.db.models import Count
+
+from .models import ArticlesModel, Favourite, Highlighted, LikesDislikes, Rating
+
+
+def viewer_state(user, slugs):
+    """
+    Returns, for every article in `slugs` that exists and in that order,
+    whether `user` favourited, liked or disliked it, their rating and how
+    many highlights they made in it. Each relation is looked up with one
+    query however many articles there are.
+    """
+    slugs = list(OrderedDict.fromkeys(slugs))
+    articles = dict(ArticlesModel.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+    ids = list(articles.values())
+    favourited = set(Favourite.objects.filter(
+        user=user, article_id__in=ids).values_list('article_id', flat=True))
+    reactions = dict(LikesDislikes.objects.filter(
+        reader=user, article_id__in=ids).values_list('article_id', 'likes'))
+    ratings = dict(Rating.objects.filter(
+        user=user, article_id__in=ids).values_list('article_id', 'rating'))
+    highlights = dict(
+        Highlighted.objects.filter(author=user, article_id__in=ids)
+        .order_by()
+        .values('article')
+        .annotate(total=Count('pk'))
+        .values_list('article', 'total')
+    )
+    return OrderedDict(
+        (slug, {
+            'favourited': articles[slug] in favourited,
+            'liked': reactions.get(articles[slug]) is True,
+            'disliked': reactions.get(articles[slug]) is False,
+            'rating': ratings.get(articles[slug]),
+            'highlights': highlights.get(articles[slug], 0),
+        })
+        for slug in slugs if slug in articles
+    )
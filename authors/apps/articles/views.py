@@ -1,26 +1,33 @@
 import os
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.http import StreamingHttpResponse
 from django.template.loader import render_to_string
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import (ListCreateAPIView,
                                      RetrieveUpdateDestroyAPIView,
                                      GenericAPIView,
                                      ListAPIView, CreateAPIView)
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from django.contrib.auth.models import AnonymousUser
 from rest_framework import status
-from django.db.models.signals import post_save
+from django.db.models import Prefetch, Q
+from django.utils.dateparse import parse_datetime
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.utils import timezone
 from django.dispatch import receiver
 from rest_framework.exceptions import NotFound, ValidationError
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination, _positive_int
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
 from django.conf import settings
 
-from .models import ArticlesModel, Comment, Rating, Favourite, Tags, LikesDislikes, CommentHistory, CommentLike, ArticleStat, ReportArticles, Highlighted
+from .models import ArticlesModel, ArticleRatingCount, TimelineEntry, Comment, Rating, Favourite, Tags, LikesDislikes, CommentHistory, CommentLike, ArticleDailyStat, ReportArticles, Highlighted, attach_replies
 from .serializers import (ArticlesSerializers,
                           CommentsSerializers,
                           RatingSerializer,
@@ -31,20 +38,32 @@ from .serializers import (ArticlesSerializers,
                           CommentHistorySerializer,
                           ReportArticlesSerializer,
                           ArticleStatSerializer,
+                          CommentTreeSerializer,
                           HighlightedSerializer)
 from authors import settings
 from .renderers import ArticlesRenderer, RatingJSONRenderer, FavouriteJSONRenderer
 from django.template.loader import render_to_string
-from django.core.mail import send_mail
 
 from .permissions import IsOwnerOrReadonly
 from .models import ArticlesModel
 from .serializers import ArticlesSerializers
 from .renderers import ArticlesRenderer
-from authors.apps.notifications.models import UserNotifications
-from .filters import ArticlesFilter
+from authors.apps.notifications.models import NotificationFanout
+from .filters import ArticlesFilter, ArticleSearchFilter
+from .search import index_article
+from .bulk import export_articles, import_articles
+from .tag_stats import (MAX_TRENDING_DAYS, TAG_CLOUD_SIZE, TRENDING_DAYS, autocomplete_tags,
+                        record_tagging, tag_cloud, tagging_of, trending_tags)
+from .feed import backfill_follow, drop_follow, merged_articles, timeline_entries
+from .viewer_state import viewer_state
+from .cache import AnonymousResponseCacheMixin, article_version_key, invalidate_articles, invalidate_tags
+from .stats import view_buffer
+from authors.apps.core.mail import queue_mail
 from authors.apps.profiles.models import Profile
-from authors.apps.authentication.models import User
+
+
+# How many days of daily view totals the reading stats include
+DAILY_VIEWS_DAYS = 30
 
 
 class StandardPagination(PageNumberPagination):
@@ -52,6 +71,145 @@ class StandardPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = settings.MAX_PAGE_SIZE
 
+
+class ArticleCursorPagination(BasePagination):
+    """
+    Keyset pagination over articles ordered by (-created_at, -id).
+
+    A page is found by seeking the articles index from the last article of
+    the previous page rather than with an OFFSET, and the total is only
+    counted when `?count=true` is passed, so deep pages cost the same as
+    the first one. Any `?ordering` is overridden by the feed order.
+    """
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        created_at, pk, self.reverse = self.decode_cursor(request)
+
+        self.count = None
+        if request.query_params.get('count') == 'true':
+            self.count = queryset.count()
+
+        results = list(self.seek(queryset, created_at, pk)[:self.page_size + 1])
+        return self.set_page(results, created_at is not None)
+
+    def seek(self, queryset, created_at, pk, pk_field='id'):
+        """
+        Orders `queryset` in the direction being paged and skips up to the
+        position (created_at, pk) when there is one
+        """
+        if self.reverse:
+            queryset = queryset.order_by('created_at', pk_field)
+            if created_at is not None:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, **{pk_field + '__gt': pk}))
+        else:
+            queryset = queryset.order_by('-created_at', '-' + pk_field)
+            if created_at is not None:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, **{pk_field + '__lt': pk}))
+        return queryset
+
+    def set_page(self, results, has_position):
+        """
+        Takes the page from `results`, the articles past the position with
+        one more than fits on a page if there are more
+        """
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = has_position, has_more
+        else:
+            self.has_next, self.has_previous = has_more, has_position
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        """Returns the (created_at, id, reverse) position of the cursor"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None, False
+        try:
+            created_at, pk, reverse = b64decode(
+                encoded.encode('ascii')).decode('ascii').split('|')
+            created_at = parse_datetime(created_at)
+            if created_at is None:
+                raise ValueError
+            return created_at, int(pk), reverse == '1'
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, article, reverse):
+        position = '{}|{}|{}'.format(
+            article.created_at.isoformat(), article.pk, int(reverse))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param,
+            b64encode(position.encode('ascii')).decode('ascii'))
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.count is not None:
+            response['count'] = self.count
+        return Response(response)
+
+
+class FeedPagination(ArticleCursorPagination):
+    """
+    Keyset pagination over a home feed. The page is merged from the page of
+    the reader's timeline and the page of the articles of the widely
+    followed authors they follow, both sought from the cursor by index.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        created_at, pk, self.reverse = self.decode_cursor(request)
+        self.count = None
+
+        limit = self.page_size + 1
+        positions = set(self.seek(
+            timeline_entries(request.user), created_at, pk, pk_field='article_id'
+        ).values_list('created_at', 'article_id')[:limit])
+        positions.update(self.seek(
+            merged_articles(request.user), created_at, pk
+        ).values_list('created_at', 'id')[:limit])
+        positions = sorted(positions, reverse=not self.reverse)[:limit]
+
+        articles = queryset.in_bulk([pk for _, pk in positions])
+        results = [articles[pk] for _, pk in positions if pk in articles]
+        return self.set_page(results, created_at is not None)
+
+
 def get_article(slug):
     """
     This method returns article for further reference made to article slug
@@ -64,17 +222,41 @@ def get_article(slug):
     return article
 
 
-class ArticlesList(ListCreateAPIView):
+class ArticlesList(AnonymousResponseCacheMixin, ListCreateAPIView):
     queryset = ArticlesModel.objects.all()
     serializer_class = ArticlesSerializers
     permission_classes = (IsAuthenticatedOrReadOnly,)
     pagination_class = StandardPagination
     renderer_classes = (ArticlesRenderer,)
-    filter_backends = (SearchFilter, OrderingFilter, DjangoFilterBackend)
+    filter_backends = (ArticleSearchFilter, OrderingFilter, DjangoFilterBackend)
     filter_class = ArticlesFilter
-    search_fields = ('title', 'description', 'tags__tag', 'author__username')
     ordering_fields = ('title', 'author__username')
 
+    @property
+    def paginator(self):
+        """
+        Page numbers by default, keyset pages when the client opts in with
+        `?pagination=cursor` or is following a cursor link
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = ArticleCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.serializer_class.requested_fields(self.request.query_params)
+        return context
+
+    def get_queryset(self):
+        return ArticlesModel.objects.for_listing(
+            user=self.request.user,
+            fields=self.serializer_class.requested_fields(self.request.query_params)
+        )
+
     def post(self, request):
         article = request.data.get('article', {})
         serializer = self.serializer_class(
@@ -86,64 +268,151 @@ class ArticlesList(ListCreateAPIView):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+class FeedView(ListAPIView):
+    """
+    The articles of the authors the user follows, newest first
+    """
+    serializer_class = ArticlesSerializers
+    permission_classes = (IsAuthenticated,)
+    pagination_class = FeedPagination
+    renderer_classes = (ArticlesRenderer,)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.serializer_class.requested_fields(self.request.query_params)
+        return context
+
+    def get_queryset(self):
+        return ArticlesModel.objects.for_listing(
+            user=self.request.user,
+            fields=self.serializer_class.requested_fields(self.request.query_params)
+        )
+
+
 @receiver(post_save, sender=ArticlesModel)
 # This receiver handles notification creation immediately a new article is created.
 def notification(sender, instance=None, created=None, **kwargs):
     """
-    Sends notification
+    Queues the followers of the author to be notified in bulk by the
+    `process_notifications` worker, off the request thread
     """
     if created == True:
-        username = instance.author.username
-        author = instance.author
-        title = instance.title
-        # domain for the application
-        current_domain = settings.DEFAULT_DOMAIN
-
-        # create a link for to the article
-        url = (current_domain + "/api/articles/" + str(instance.slug))
-        # get the followers
-        profile = author.profile
-        followers = profile.is_following.all()
-
-        # send notification
-        for follower in followers:
-            subscription = User.objects.get(username=follower).is_subcribed
-            if subscription == True:
-                follower_email = User.objects.get(username=follower)
-                email = str(follower_email)
-                notification = (username + " created a new article about " + title)
-                UserNotifications.objects.create(article=instance,
-                    notification = notification, author_id=instance.author.id, recipient_id=email, article_link=url)
-                name = User.objects.get(username=follower).username
-                # send email notification
-                body = render_to_string('notification.html', {
-                    'url': url,
-                    'notification': notification,
-                    'name': name
-                })
-                send_mail(
-                    'You have a new notification',
-                    'You have a new notification from authors haven',
-                    'authors-haven@authors-heaven.com',
-                    [email],
-                    html_message=body,
-                    fail_silently=False,
-                )
+        NotificationFanout.objects.create(article=instance)
+
+@receiver(m2m_changed, sender=Profile.isfollowing.through)
+def update_feeds_of_follows(sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs):
+    """
+    Writes the latest articles of newly followed authors into the feed of
+    the follower and removes those of unfollowed authors from it
+    """
+    if action == 'post_clear':
+        side = 'article__author__profile' if reverse else 'owner__profile'
+        TimelineEntry.objects.filter(**{side: instance.pk}).delete()
+    if action not in ('post_add', 'post_remove'):
+        return
+    update = backfill_follow if action == 'post_add' else drop_follow
+    for pk in pk_set:
+        if reverse:
+            update(pk, instance.pk)
+        else:
+            update(instance.pk, pk)
+
+
+@receiver(post_save, sender=ArticlesModel)
+def index_saved_article(sender, instance=None, **kwargs):
+    """Keeps the search index of an article in step with its text"""
+    index_article(instance)
+
 
-class ArticlesDetails(RetrieveUpdateDestroyAPIView):
+@receiver(m2m_changed, sender=ArticlesModel.tags.through)
+def count_tagging(sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs):
+    """
+    Keeps the article counts of tags in step with the tags of articles. The
+    tags being removed are read before they go, added ones once they exist.
+    """
+    if action == 'post_add':
+        record_tagging(tagging_of(instance, reverse, pk_set))
+    elif action in ('pre_remove', 'pre_clear'):
+        instance._removed_tagging = tagging_of(instance, reverse, pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        record_tagging(getattr(instance, '_removed_tagging', []), sign=-1)
+
+
+@receiver(pre_delete, sender=ArticlesModel)
+def uncount_deleted_article_tags(sender, instance=None, **kwargs):
+    """Counts a deleted article out of its tags, which are removed with no signal"""
+    record_tagging(tagging_of(instance), sign=-1)
+
+
+@receiver(m2m_changed, sender=ArticlesModel.tags.through)
+def index_retagged_article(sender, instance=None, action=None, reverse=False, **kwargs):
+    """Keeps the search index of an article in step with its tags"""
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        index_article(instance)
+
+
+@receiver(post_save, sender=ArticlesModel)
+@receiver(post_delete, sender=ArticlesModel)
+def invalidate_cached_article(sender, instance=None, **kwargs):
+    """Drops the cached responses showing an article that changed"""
+    invalidate_articles(instance.slug)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_cached_article_of(sender, instance=None, **kwargs):
+    """Drops the cached responses showing the article of a comment"""
+    slug = ArticlesModel.objects.filter(
+        pk=instance.article_id).values_list('slug', flat=True).first()
+    if slug:
+        invalidate_articles(slug)
+
+
+@receiver(post_save, sender=Tags)
+@receiver(pre_delete, sender=Tags)
+def invalidate_cached_tagged_articles(sender, instance=None, **kwargs):
+    """Drops the cached responses showing the articles of a tag that changed"""
+    invalidate_articles(*instance.articles.values_list('slug', flat=True))
+
+
+@receiver(post_delete, sender=Tags)
+def invalidate_cached_tag_counts(sender, instance=None, **kwargs):
+    """Drops the cached tag clouds and trending tags showing a deleted tag"""
+    invalidate_tags()
+
+
+@receiver(m2m_changed, sender=ArticlesModel.tags.through)
+def invalidate_cached_related_articles(sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs):
+    """Drops the cached responses showing articles whose tags changed"""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_articles(instance.slug)
+    else:
+        # Clearing from the other side does not say which articles it touched
+        articles = ArticlesModel.objects.all()
+        if pk_set is not None:
+            articles = articles.filter(pk__in=pk_set)
+        invalidate_articles(*articles.values_list('slug', flat=True))
+
+
+class ArticlesDetails(AnonymousResponseCacheMixin, RetrieveUpdateDestroyAPIView):
     queryset = ArticlesModel.objects.all()
     serializer_class = ArticlesSerializers
     renderer_classes = (ArticlesRenderer,)
     permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadonly)
     lookup_field = 'slug'
 
+    def get_cache_version_key(self, slug):
+        return article_version_key(slug)
+
 
     def get(self, request, slug):
         article = get_article(slug)
         if isinstance(article, dict):
             raise ValidationError(detail={'artcle': 'No article found for the slug given'})
         if request.user and not isinstance(request.user, AnonymousUser):
-            ArticleStat.objects.create(user=request.user, article=article)
+            view_buffer.add(request.user, article)
 
         return super().get(request, slug)
 
@@ -172,15 +441,98 @@ class ArticlesDetails(RetrieveUpdateDestroyAPIView):
         return {"request":self.request}
 
 
+class ViewerStateView(APIView):
+    """
+    What the user did with each of the articles given as `?slugs=a,b,c`,
+    favourites, reactions, ratings and highlights, so that a page of
+    articles is rendered with one request
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        slugs = [slug.strip() for slug in request.query_params.get('slugs', '').split(',') if slug.strip()]
+        if len(slugs) > settings.MAX_PAGE_SIZE:
+            raise ValidationError(
+                'slugs must be at most {} article slugs separated by commas'.format(settings.MAX_PAGE_SIZE))
+        return Response({'articles': viewer_state(request.user, slugs)}, status=status.HTTP_200_OK)
+
+
+class TagsPagination(StandardPagination):
+    """Page numbers over tags, with the page under `tags`"""
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('tags', data),
+        ]))
+
+
 class TagsView(ListAPIView):
-    queryset = Tags.objects.all()
+    """
+    Every tag, those on most articles first, a page at a time
+    """
+    queryset = Tags.objects.order_by('-articles_count', 'tag')
     serializer_class = TagSerializers
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = TagsPagination
+
+
+class TagCloudView(APIView):
+    """
+    The tags on most articles with how many articles each is on, cached
+    until the counts next change
+    """
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        return Response({'tags': tag_cloud()}, status=status.HTTP_200_OK)
+
+
+class TrendingTagsView(APIView):
+    """
+    The tags on most articles created in the last `?days=` days, at most
+    `?limit=` of them
+    """
+    permission_classes = (AllowAny,)
 
-    def list(self, request):
-        data = self.get_queryset()
-        serializer = self.serializer_class(data, many=True)
-        return Response({'tags': serializer.data}, status=status.HTTP_200_OK)
+    def get(self, request):
+        try:
+            days = _positive_int(
+                request.query_params.get('days', TRENDING_DAYS), strict=True, cutoff=MAX_TRENDING_DAYS)
+            limit = _positive_int(
+                request.query_params.get('limit', TAG_CLOUD_SIZE), strict=True, cutoff=TAG_CLOUD_SIZE)
+        except ValueError:
+            raise ValidationError('days and limit must be positive whole numbers')
+        return Response({'tags': trending_tags(days, limit)}, status=status.HTTP_200_OK)
+
+
+class TagAutocompleteView(APIView):
+    """
+    The tags starting with `?q=`, those on most articles first
+    """
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        tags = autocomplete_tags(request.query_params.get('q', ''))
+        return Response({'tags': tags}, status=status.HTTP_200_OK)
+
+
+class BulkArticlesView(APIView):
+    """
+    Exports every article as NDJSON on GET and imports the NDJSON body of a
+    POST in chunks, both streamed rather than held in memory. Imported
+    lines without an author are written by the admin importing them.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return StreamingHttpResponse(export_articles(), content_type='application/x-ndjson')
+
+    def post(self, request):
+        result = import_articles(request.stream or [], author=request.user)
+        return Response(result, status=status.HTTP_200_OK)
 
 
 class ArticleStatsView(ListAPIView):
@@ -190,118 +542,123 @@ class ArticleStatsView(ListAPIView):
        """
        This method filters articles by authors
        """
-       return ArticlesModel.objects.filter(author=self.request.user)
+       since = timezone.localdate() - timedelta(days=DAILY_VIEWS_DAYS)
+       return ArticlesModel.objects.filter(
+           author=self.request.user
+       ).prefetch_related(
+           Prefetch(
+               'daily_views',
+               queryset=ArticleDailyStat.objects.filter(date__gt=since)
+           )
+       )
 
 
 class RatingDetails(GenericAPIView):
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
-    permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadonly)
+    permission_classes = (IsAuthenticatedOrReadOnly,)
     renderer_classes = (RatingJSONRenderer,)
 
-    def get_rating(self, user, article):
+    def get_article(self, slug):
         """
-        Returns a rating given the user id and the article id
+        Returns the article given its slug
         """
-        try:
-            return Rating.objects.get(user=user, article=article)
-        except Rating.DoesNotExist:
-            raise NotFound(detail={'rating': 'Rating not found'})
+        article = get_article(slug)
+        if isinstance(article, dict):
+            raise ValidationError(
+                detail={'artcle': 'No article found for the slug given'})
+        return article
+
+    def validated_rating(self, request):
+        """
+        Returns the rating value in the request once it is valid
+        """
+        serializer = self.serializer_class(data=request.data.get('rating', {}))
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data['rating']
+
+    def rated(self, article, rating):
+        """
+        Serializes a rating just given with the average rating of the
+        article, re-read from its counters
+        """
+        article.refresh_from_db(fields=('rating_count', 'rating_sum'))
+        return self.serializer_class(Rating(article=article, rating=rating)).data
 
     def get(self, request, slug):
         """
         Returns the authenticated user's rating on an article given
         its slug.
         """
-        article = get_article(slug)
-        if isinstance(article, dict):
-            raise ValidationError(
-                detail={'artcle': 'No article found for the slug given'})
+        article = self.get_article(slug)
 
         # If the user is authenticated, return their rating as well, if not or
-        # the user has not rated the article return the rating average...
+        # the user has not rated the article only the rating average
         rating = None
         if request.user.is_authenticated:
-            try:
-                rating = Rating.objects.get(user=request.user, article=article)
-            except Rating.DoesNotExist:
-                pass
-        if not rating:
-            rating = Rating.objects.first()
-
-        serializer = self.serializer_class(rating)
+            rating = Rating.objects.filter(user=request.user, article=article).first()
+
+        serializer = self.serializer_class(rating or Rating(article=article))
         return Response(serializer.data)
 
     def post(self, request, slug):
         """
-        This will create a rating by user on an article. We also check
-        if the user has rated this article before and if that is the case,
-        we just update the existing rating.
+        This will create a rating by user on an article, or replace the
+        rating the user gave before.
         """
-        article = get_article(slug)
-        if isinstance(article, dict):
-            raise ValidationError(
-                detail={'artcle': 'No article found for the slug given'})
-        rating = request.data.get('rating', {})
-        rating.update({
-            'user': request.user.pk,
-            'article': article.pk
-        })
+        article = self.get_article(slug)
         # ensure a user cannot rate their own articles
-        if article.author == request.user:
+        if article.author_id == request.user.id:
             raise ValidationError(
                 detail={'author': 'You cannot rate your own article'})
-        # users current rating exists?
-        try:
-            # if the rating exists, we update it
-            current_rating = Rating.objects.get(
-                user=request.user.id,
-                article=article.id
-            )
-            serializer = self.serializer_class(current_rating, data=rating)
-        except Rating.DoesNotExist:
-            # if it doesn't, create a new one
-            serializer = self.serializer_class(data=rating)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, article=article)
-
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        rating = self.validated_rating(request)
+        Rating.objects.rate(article, request.user, rating)
+        return Response(self.rated(article, rating), status=status.HTTP_201_CREATED)
 
     def put(self, request, slug):
         """
-        Gets an existing rating and updates it
+        Updates an existing rating
         """
-        rating = request.data.get('rating', {})
-        article = get_article(slug)
-        if isinstance(article, dict):
-            raise ValidationError(
-                detail={'artcle': 'No article found for the slug given'})
-        current_rating = self.get_rating(
-            user=request.user.id, article=article.id)
-        serializer = self.serializer_class(
-            current_rating, data=rating, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, article=article)
-
-        return Response(serializer.data)
+        article = self.get_article(slug)
+        rating = self.validated_rating(request)
+        try:
+            Rating.objects.rate(article, request.user, rating, create=False)
+        except Rating.DoesNotExist:
+            raise NotFound(detail={'rating': 'Rating not found'})
+        return Response(self.rated(article, rating))
 
     def delete(self, request, slug):
         """
         Deletes a rating
         """
-        article = get_article(slug)
-        if isinstance(article, dict):
-            raise ValidationError(
-                detail={'artcle': 'No article found for the slug given'})
-
-        rating = self.get_rating(user=request.user, article=article)
-        rating.delete()
+        article = self.get_article(slug)
+        if Rating.objects.unrate(article, request.user) is None:
+            raise NotFound(detail={'rating': 'Rating not found'})
         return Response(
             {'message': 'Successfully deleted rating'},
             status=status.HTTP_200_OK
         )
 
 
+class RatingHistogramView(APIView):
+    """
+    How many ratings of an article give each number of stars, served from
+    the rating counters of the article
+    """
+    permission_classes = (AllowAny,)
+
+    def get(self, request, slug):
+        article = get_article(slug)
+        if isinstance(article, dict):
+            raise NotFound(article['message'])
+        return Response({
+            'article': article.slug,
+            'rating_count': article.rating_count,
+            'avg_rating': article.avg_rating,
+            'histogram': ArticleRatingCount.objects.histogram(article),
+        }, status=status.HTTP_200_OK)
+
+
 class CommentsListCreateView(ListCreateAPIView):
     """
     Class for creating and listing all comments
@@ -330,55 +687,12 @@ class CommentsListCreateView(ListCreateAPIView):
     # This receiver handles notification creation immediately a new article is created.
     def comment_notification(sender, instance=None, created=None, **kwargs):
         """
-        Sends notification
+        Queues the subscribed readers who favourited the article to be
+        notified in bulk by the `process_notifications` worker
         """
         if created == True:
-            username = instance.author.username
-            author = instance.author
-            # domain for the application
-            current_domain = settings.DEFAULT_DOMAIN
-
-            # create a link to the article
-            url = (current_domain + "/api/articles/" + str(instance.article.slug))
-            # get the followers
-            recipients = User.objects.all().filter(is_subcribed=True)
-            # send notification
-            for recipient in recipients:
-                id_user = recipient.id
-                # check whether user has favorited article being commented
-                favourites = Favourite.objects.all().filter(user_id=id_user)
-                if len(favourites) == 0:
-                    return None
-                # if we have some favourites in our records
-                elif len(favourites) > 0:
-                    for favourite in favourites:
-                        # check whether there is a favourite for this article
-                        if favourite.article_id == instance.article.id:
-                            # fetch the user to notify
-                            recipient_email = User.objects.get(id=favourite.user_id)
-                            email = str(recipient_email)
-                            author_id = instance.author.id
-
-                            notification = (username + " commented on this article about " + instance.article.title)
-                            UserNotifications.objects.create(article=instance.article,
-                                                             notification=notification, author_id=author_id,
-                                                             recipient_id=email, article_link=url)
-
-                            name = User.objects.get(email=email).username
-                            # send email notification
-                            body = render_to_string('notification.html', {
-                                'url': url,
-                                'notification': notification,
-                                'name': name
-                            })
-                            send_mail(
-                                'You have a new notification',
-                                'You have a new notification from authors haven',
-                                'authors-haven@authors-heaven.com',
-                                [email],
-                                html_message=body,
-                                fail_silently=False,
-                            )
+            NotificationFanout.objects.create(
+                article_id=instance.article_id, comment=instance)
 
     def get(self, request, slug):
         """
@@ -396,6 +710,61 @@ class CommentsListCreateView(ListCreateAPIView):
         return Response(data, status=status.HTTP_200_OK)
 
 
+class CommentThreadPagination(CursorPagination):
+    """Pages through the top level comments of an article, newest first"""
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+    ordering = '-created_at'
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "comments": data
+        })
+
+
+class CommentTreeView(ListAPIView):
+    """
+    Lists the comment threads of an article, each top level comment with
+    every reply under it nested however deep, in two queries for a page
+    """
+    serializer_class = CommentTreeSerializer
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = CommentThreadPagination
+
+    def get_queryset(self):
+        article = get_article(self.kwargs['slug'])
+        if isinstance(article, dict):
+            raise NotFound(article['message'])
+        return Comment.objects.for_tree().filter(article=article, parent=None)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(attach_replies(page), many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance=None, created=None, **kwargs):
+    """
+    Keeps the article comment counter in step with new comments and replies
+    """
+    if created:
+        ArticlesModel.objects.filter(pk=instance.article_id).update_counters(
+            comments_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance=None, **kwargs):
+    """
+    Runs for every reply removed along with a deleted comment as well
+    """
+    ArticlesModel.objects.filter(
+        pk=instance.article_id).update_counters(comments_count=-1)
+
+
 class CommentsRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView, ListCreateAPIView):
     """
     Class for retrieving, updating and deleting a comment
@@ -631,119 +1000,36 @@ class ArticlesLikesDislikes(GenericAPIView):
         like = request.data.get('likes', None)
 
         # Check if the data in the request a valid boolean
-        if type(like) == bool:
-
-            # Check if the article belongs to the current user
-            if article.author == request.user:
-                message = {'detail': 'You cannot like/unlike your own article'}
-                return Response(message, status=status.HTTP_400_BAD_REQUEST)
-            like_data = {
-                'reader': request.user.id,
-                'article': article.id,
-                'likes': like
-            }
-
-            try:
-                # Verify if the instance of the article and the user
-                # exist in the database and get the like
-                user_likes = LikesDislikes.objects.get(
-                    article=article.id, reader=request.user.id)
-
-                # if an instance of the user and article both exist in the database
-                # we update the existing data instead of creating a new one
-                if user_likes:
-                    # check if the stored data and the request data are the same
-                    # and both true
-                    if user_likes.likes and like:
-                        return Response(
-                            {
-                                'detail': '{}, you have already liked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                    # check if the stored data and the request data are the same
-                    # and both false
-                    elif not user_likes.likes and not like:
-                        return Response(
-                            {
-                                'detail': '{}, you have already disliked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                    # check if the stored data and the request data are different
-                    # one true and the other false
-                    elif like and not user_likes.likes:
-                        user_likes.likes = True
-                        user_likes.save()
-                        article.likes.add(request.user)
-                        article.dislikes.remove(request.user)
-                        article.save()
-                        return Response(
-                            {
-                                'detail': '{}, you have liked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_200_OK
-
-                        )
-
-                    else:
-                        user_likes.likes = False
-                        user_likes.save()
-                        article.likes.remove(request.user)
-                        article.dislikes.add(request.user)
-                        article.save()
-                        return Response(
-                            {
-                                'detail': '{}, you have disliked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_200_OK
-                        )
-
-            except LikesDislikes.DoesNotExist:
-                # Create and save a new like object since one does not exist
-                serializer = self.serializer_class(data=like_data)
-                serializer.is_valid(raise_exception=True)
-                serializer.save(article=article, reader=request.user)
-
-                # if the request data is true, we update the article
-                # with the new data
-                if like:
-                    article.likes.add(request.user)
-                    article.save()
-                    return Response(
-                        {
-                            'detail': '{}, you have liked this article.'
-                                .format(request.user.username)
-                        },
-                        status=status.HTTP_201_CREATED
-                    )
-
-                # if the request data is false, we update the article
-                # with the new data
-                else:
-                    article.dislikes.add(request.user)
-                    article.save()
-                    return Response(
-                        {
-                            'detail': '{}, you have disliked this article.'
-                                .format(request.user.username)
-                        }
-                        , status=status.HTTP_201_CREATED
-                    )
-        else:
-
+        if type(like) != bool:
             return Response(
                 {
                     'detail': 'Please indicate whether you like/dislike this article.'
                 }, status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Check if the article belongs to the current user
+        if article.author_id == request.user.id:
+            message = {'detail': 'You cannot like/unlike your own article'}
+            return Response(message, status=status.HTTP_400_BAD_REQUEST)
+
+        # Stores the reaction, or changes it, in one upsert
+        outcome = LikesDislikes.objects.react(article, request.user, like)
+        if outcome == 'unchanged':
+            return Response(
+                {
+                    'detail': '{}, you have already {} this article.'
+                    .format(request.user.username, 'liked' if like else 'disliked')
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            {
+                'detail': '{}, you have {} this article.'
+                .format(request.user.username, 'liked' if like else 'disliked')
+            },
+            status=status.HTTP_201_CREATED if outcome == 'created' else status.HTTP_200_OK
+        )
+
     def delete(self, request, slug):
         # Check if the article exists in the database
         article = get_article(slug)
@@ -751,29 +1037,12 @@ class ArticlesLikesDislikes(GenericAPIView):
         if isinstance(article, dict):
             return Response(article, status=status.HTTP_404_NOT_FOUND)
 
-        try:
-            # Verify if the instance of the article and the user
-            # exist in the database and get the like
-            user_like = LikesDislikes.objects.get(
-                article=article.id, reader=request.user.id)
-            if user_like:
-                if user_like.likes:
-                    # If like field in the database is true we remove the count
-                    # from the likes field of the article and save the current state
-                    article.likes.remove(request.user)
-                    article.save()
-                else:
-                    # If like field in the database is false we remove the count
-                    # from the dislikes field of the article and save the current state
-                    article.dislikes.remove(request.user)
-                    article.save()
-        except LikesDislikes.DoesNotExist:
+        if LikesDislikes.objects.withdraw(article, request.user) is None:
             return Response(
                 {
                     'detail': 'Likes/dislikes not found.'
                 }, status=status.HTTP_404_NOT_FOUND
             )
-        user_like.delete()
         return Response(
             {
                 'detail': '{}, your reaction has been deleted successfully.'
@@ -788,120 +1057,61 @@ class CommentLikes(GenericAPIView):
     Class for liking an unliking comments
     """
 
-    queryset = CommentLike.objects.all()
     serializer_class = CommentsLikeSerializer
-    permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadonly)
+    permission_classes = (IsAuthenticatedOrReadOnly,)
 
     def post(self, request, slug, id):
-        #Check if a comment exists in the database
-
-        comment = Comment.objects.filter(id=id).first()
-
         like = request.data.get('comment_likes', None)
 
         #Check if the data in the request a valid boolean
-        if type(like) == bool:
-
-            #Check if the comment belongs to the current user
-            if comment.author == request.user:
-                message = {'detail': 'You cannot like/unlike your own comment'}
-                return Response(message, status=status.HTTP_400_BAD_REQUEST)
-            like_data = {
-                'commentor': request.user.id,
-                'specific_comment': comment.id,
-                'comment_likes': like
-            }
-
-            try:
-                #Verify if the instance of the comment and the user
-                #exist in the database and get the like
-                user_likes = CommentLike.objects.get(specific_comment=comment.id, commentor=request.user.id)
-
-                #if an instance of the user and comment both exist in the database
-                #we update the existing data instead of creating a new one
-                if user_likes:
-                    #check if the stored data and the request data are the same
-                    #and both true
-                    if user_likes.comment_likes and like:
-                        return Response(
-                            {
-                                'detail':'{}, you have already liked this comment.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                    #check if the stored data and the request data are different
-                    #one true and the other false
-                    elif like and not user_likes.comment_likes:
-                        user_likes.comment_likes = True
-                        user_likes.save()
-                        comment.comment_likes.add(request.user)
-                        comment.save()
-                        return Response(
-                            {
-                                'detail': '{}, you have liked this comment.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_200_OK
-                        )
-
-            except CommentLike.DoesNotExist:
-                #Create and save a new like object since one does not exist
-                serializer=self.serializer_class(data=like_data)
-                serializer.is_valid(raise_exception=True)
-                serializer.save(specific_comment=comment, commentor=request.user)
-
-                #if the request data is true, we update the article
-                #with the new data
-                if like:
-                    comment.comment_likes.add(request.user)
-                    comment.save()
-                    return Response(
-                        {
-                            'detail': '{}, you have liked this comment.'
-                            .format(request.user.username)
-                        },
-                        status=status.HTTP_201_CREATED
-                    )
-
-                #if the request data is false, we update the article
-                #with the new data
-        else:
-
+        if type(like) != bool:
             return Response(
                 {
-                    'detail': 'Please indicate whether you likethis article.'
+                    'detail': 'Please indicate whether you like this comment.'
                 }
                 , status=status.HTTP_400_BAD_REQUEST
             )
 
-    def delete(self, request, slug, id):
-        #Check if the comment exists in the database
+        if like and CommentLike.objects.like(id, request.user):
+            return Response(
+                {
+                    'detail': '{}, you have liked this comment.'
+                    .format(request.user.username)
+                },
+                status=status.HTTP_201_CREATED
+            )
+        if not like and CommentLike.objects.unlike(id, request.user):
+            return Response(
+                {
+                    'detail': '{}, you have unliked this comment.'
+                    .format(request.user.username)
+                },
+                status=status.HTTP_200_OK
+            )
 
-        comment = Comment.objects.filter(id=id).first()
-        if isinstance(comment, dict):
-            return Response(comment, status=status.HTTP_404_NOT_FOUND)
+        #Nothing was written, only now find out why
+        author_id = Comment.objects.filter(id=id).values_list('author_id', flat=True).first()
+        if author_id is None:
+            return Response({'detail': 'Comment not found.'}, status=status.HTTP_404_NOT_FOUND)
+        if author_id == request.user.id:
+            message = {'detail': 'You cannot like/unlike your own comment'}
+            return Response(message, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                'detail':'{}, you have {} this comment.'
+                .format(request.user.username, 'already liked' if like else 'not liked')
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-        try:
-            #Verify if the instance of the comment and the user
-            #exist in the database and get the like
-            user_like = CommentLike.objects.get(specific_comment=comment.id, commentor=request.user.id)
-            if user_like:
-                if user_like.comment_likes:
-                    #If like field in the database is true we remove the count
-                    #from the likes field of the article and save the current state
-                    comment.comment_likes.remove(request.user)
-                    comment.save()
-
-        except CommentLike.DoesNotExist:
+    def delete(self, request, slug, id):
+        if not CommentLike.objects.unlike(id, request.user):
             return Response(
                 {
                     'detail': 'Likes not found.'
                 }
                 , status=status.HTTP_404_NOT_FOUND
             )
-        user_like.delete()
         return Response(
                 {
                     'detail': '{}, your like has been deleted successfully.'
@@ -911,6 +1121,24 @@ class CommentLikes(GenericAPIView):
             )
 
 
+class LikedCommentsView(APIView):
+    """
+    Which of the comments of an article given as `?ids=1,2,3` the user
+    likes, looked up in one query for rendering a thread
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, slug):
+        ids = [id for id in request.query_params.get('ids', '').split(',') if id.strip()]
+        if not all(id.strip().isdigit() for id in ids) or len(ids) > settings.MAX_PAGE_SIZE:
+            raise ValidationError(
+                'ids must be at most {} comment ids separated by commas'.format(settings.MAX_PAGE_SIZE))
+        liked = CommentLike.objects.filter(
+            specific_comment__article__slug=slug
+        ).liked_by(request.user, [int(id) for id in ids])
+        return Response({'liked': sorted(liked)}, status=status.HTTP_200_OK)
+
+
 class ReportArticlesView(ListCreateAPIView):
     queryset = ReportArticles.objects.all()
     serializer_class = ReportArticlesSerializer
@@ -960,13 +1188,12 @@ class ReportArticlesView(ListCreateAPIView):
                     'name': request.user.username,
                     'report': report_msg
                 })
-                send_mail(
+                queue_mail(
                     'A user has reported an article',
                     'View reported article',
                     'no-reply@authors-heaven.com',
                     [email],
                     html_message=body,
-                    fail_silently=False,
                 )
                 content = "An email has been sent to the admin with your request"
                 message = {"message": content}
@@ -1,9 +1,46 @@
+import hashlib
+import time
+
 import jwt
 from django.conf import settings
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
-from .models import User
+from .models import User, auth_cache
+
+
 
+def decode_token(token):
+    """
+    Returns the payload of `token`, verifying its signature only the first
+    time it is seen within AUTH_CACHE_TTL seconds. A payload is never cached
+    past the expiry of its token.
+    """
+    key = 'auth:token:{}'.format(hashlib.sha256(token).hexdigest())
+    cache = auth_cache()
+    payload = cache.get(key) if settings.AUTH_CACHE_TTL else None
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY)
+        timeout = settings.AUTH_CACHE_TTL
+        if 'exp' in payload:
+            timeout = min(timeout, int(payload['exp'] - time.time()))
+        if timeout > 0:
+            cache.set(key, payload, timeout)
+    return payload
+
+
+def get_user(email):
+    """
+    Returns the user with `email`, from the cache if they were looked up
+    within AUTH_CACHE_TTL seconds and have not been saved since
+    """
+    key = User.auth_cache_key(email)
+    cache = auth_cache()
+    user = cache.get(key) if settings.AUTH_CACHE_TTL else None
+    if user is None:
+        user = User.objects.get(email=email)
+        if settings.AUTH_CACHE_TTL:
+            cache.set(key, user, settings.AUTH_CACHE_TTL)
+    return user
 
 
 """Configure JWT Here"""
@@ -27,13 +64,13 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
         # Attempt decoding the token
         try:
-            payload = jwt.decode(token, settings.SECRET_KEY)
+            payload = decode_token(token)
         except:
             raise AuthenticationFailed('Invalid token.')
 
         # Get the user owning the token
         try:
-            user = User.objects.get(email=payload['email'])
+            user = get_user(payload['email'])
         except User.DoesNotExist:
             raise AuthenticationFailed('No user found for token provided')
 
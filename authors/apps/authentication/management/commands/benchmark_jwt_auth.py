@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+
+from authors.apps.authentication.backends import JWTAuthentication
+from authors.apps.authentication.models import User, auth_cache
+
+
+class Rollback(Exception):
+    """Raised to throw away the data created for a benchmark run"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Times authenticating the same token repeatedly with the '
+        'authentication cache turned off and on. Nothing is kept in the '
+        'database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'requests', nargs='?', type=int, default=10000,
+            help='Number of requests to authenticate'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    'bench-reader', 'bench-reader@example.com')
+                user.is_active = True
+                user.save()
+                request = RequestFactory().get('/', HTTP_AUTHORIZATION=user.token)
+                for label, ttl in (('uncached', 0), ('cached', 30)):
+                    with override_settings(AUTH_CACHE_TTL=ttl):
+                        self.report(label, request, options['requests'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def report(self, label, request, requests):
+        auth_cache().clear()
+        backend = JWTAuthentication()
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_query):
+            start = time.perf_counter()
+            for _ in range(requests):
+                backend.authenticate(request)
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            '{}: {} requests in {:.3f}s, {:.1f}us and {:.2f} queries '
+            'per request'.format(
+                label, requests, elapsed, elapsed / requests * 1e6,
+                len(queries) / requests)
+        )
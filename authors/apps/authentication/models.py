@@ -3,11 +3,20 @@ import jwt
 from datetime import datetime, timedelta
 
 from django.conf import settings
+from django.core.cache import caches
 from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin
 )
 from django.db import models
 
+def auth_cache():
+    """
+    Returns the cache authenticated users and decoded tokens are kept in,
+    shared by every process so that saving a user reaches them all
+    """
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
 class UserManager(BaseUserManager):
     """
     Django requires that custom users define their own Manager class. By
@@ -97,6 +106,34 @@ class User(AbstractBaseUser, PermissionsMixin):
     # objects of this type.
     objects = UserManager()
 
+    @staticmethod
+    def auth_cache_key(email):
+        """The cache key `JWTAuthentication` keeps the user with `email` under"""
+        return 'auth:user:{}'.format(email)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        # Remembered so that changing the email also forgets the old one,
+        # unless it was deferred, which reading it here would undo
+        if 'email' in field_names:
+            user._loaded_email = user.email
+        return user
+
+    def forget_cached(self):
+        """Drops this user from the authentication cache"""
+        emails = {self.email, getattr(self, '_loaded_email', self.email)}
+        auth_cache().delete_many([self.auth_cache_key(email) for email in emails])
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.forget_cached()
+        self._loaded_email = self.email
+
+    def delete(self, *args, **kwargs):
+        self.forget_cached()
+        return super().delete(*args, **kwargs)
+
     def __str__(self):
         """
         Returns a string representation of this `User`.
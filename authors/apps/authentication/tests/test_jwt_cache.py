@@ -0,0 +1,82 @@
+import jwt
+
+from django.conf import settings
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+
+from authors.apps.authentication.backends import JWTAuthentication
+from authors.apps.authentication.models import User, auth_cache
+
+
+@override_settings(AUTH_CACHE_TTL=30)
+class JWTCacheTest(TestCase):
+    """
+    Tests for caching authenticated users and decoded tokens
+    """
+
+    def setUp(self):
+        auth_cache().clear()
+        self.user = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+        self.user.is_active = True
+        self.user.save()
+        self.backend = JWTAuthentication()
+
+    def authenticate(self, token=None):
+        request = RequestFactory().get(
+            '/', HTTP_AUTHORIZATION=token or self.user.token)
+        return self.backend.authenticate(request)[0]
+
+    def test_hot_token_skips_the_database(self):
+        token = self.user.token
+        self.authenticate(token)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(token).email, 'jane@doe.com')
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        token = self.user.token
+        self.authenticate(token)
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'jane'
+        user.save()
+        self.assertEqual(self.authenticate(token).username, 'jane')
+
+        user.is_active = False
+        user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    @override_settings(CACHES=dict(settings.CACHES, worker=settings.CACHES['shared']))
+    def test_saving_in_another_process_invalidates(self):
+        token = self.user.token
+        self.authenticate(token)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        # A cache alias of its own stands in for the cache of another worker
+        with override_settings(AUTH_CACHE_ALIAS='worker'):
+            user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_changing_the_email_forgets_the_old_one(self):
+        token = self.user.token
+        self.authenticate(token)
+        user = User.objects.get(pk=self.user.pk)
+        user.email = 'jane@example.com'
+        user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_expired_token_is_not_cached(self):
+        token = jwt.encode(
+            {'email': self.user.email, 'exp': 1}, settings.SECRET_KEY).decode()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    @override_settings(AUTH_CACHE_TTL=0)
+    def test_cache_can_be_turned_off(self):
+        token = self.user.token
+        self.authenticate(token)
+        with self.assertNumQueries(1):
+            self.authenticate(token)
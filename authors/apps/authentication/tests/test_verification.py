@@ -3,6 +3,8 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from authors.apps.authentication.models import User
 from django.core import mail
+from django.core.management import call_command
+from django.utils.six import StringIO
 from django.urls import reverse
 from authors.apps.authentication.token import generate_token
 
@@ -34,6 +36,9 @@ class AccountVerification(APITestCase):
         # https://docs.djangoproject.com/en/dev/topics/email/#django.core.mail.EmailMessage
 
         self.client.post(self.registration_url, self.user_data, format='json')
+        # The mail is queued and only sent by the outbox worker
+        self.assertEqual(len(mail.outbox), 0)
+        call_command('send_queued_mail', stdout=StringIO())
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("Please verify your account", mail.outbox[0].body)
 
@@ -17,7 +17,7 @@ import os
 from django.template.loader import render_to_string
 
 from .token import generate_token
-from django.core.mail import send_mail
+from authors.apps.core.mail import queue_mail
 from django.conf import settings
 from django.http import HttpResponse
 import jwt
@@ -50,13 +50,12 @@ class RegistrationAPIView(CreateAPIView):
             'link': url,
             'name': user_name
         })
-        send_mail(
+        queue_mail(
             'Verify your email',
             'Please verify your account.',
             'no-reply@authors-heaven.com',
             [user_email],
             html_message = body,
-            fail_silently=False,
         )
         content = "Thank you for registering at Authors heaven."\
         "To start using authors heaven, go to your email and click the confirmation "\
@@ -154,7 +153,7 @@ class EmailSentAPIView(generics.CreateAPIView):
             'name': user.username,
         })
         sender = os.getenv('EMAIL_SENDER')
-        send_mail(subject, "Password Reset", sender, [email], html_message=body)
+        queue_mail(subject, "Password Reset", sender, [email], html_message=body)
         return Response(message, status=status.HTTP_200_OK)
 
 class PasswordResetAPIView(generics.CreateAPIView):
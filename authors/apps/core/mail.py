@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+def queue_mail(subject, message, from_email, recipient_list, html_message=None):
+    """
+    Stores an email in the outbox for the `send_queued_mail` worker to send.
+    Takes the same arguments as `django.core.mail.send_mail`.
+    """
+    recipients = [recipient for recipient in recipient_list if recipient]
+    if not recipients:
+        return None
+    return OutboundEmail.objects.create(
+        subject=subject,
+        message=message,
+        html_message=html_message or '',
+        from_email=from_email or '',
+        recipients=','.join(str(recipient) for recipient in recipients)
+    )
+
+
+def queue_mass_mail(datatuple):
+    """
+    Stores many emails in the outbox with a single query. `datatuple` holds
+    `(subject, message, from_email, recipient_list, html_message)` tuples.
+    """
+    return OutboundEmail.objects.bulk_create([
+        OutboundEmail(
+            subject=subject,
+            message=message,
+            html_message=html_message or '',
+            from_email=from_email or '',
+            recipients=','.join(str(recipient) for recipient in recipient_list)
+        )
+        for subject, message, from_email, recipient_list, html_message in datatuple
+        if recipient_list
+    ])
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        email.subject,
+        email.message,
+        email.from_email or None,
+        email.recipients.split(','),
+        connection=connection
+    )
+    if email.html_message:
+        message.attach_alternative(email.html_message, 'text/html')
+    return message
+
+
+def record_failure(email, error):
+    """
+    Counts a failed attempt at sending `email`, backing off before the next
+    one or marking it as failed once it runs out of attempts
+    """
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= settings.MAIL_MAX_ATTEMPTS:
+        email.status = OutboundEmail.FAILED
+    else:
+        delay = settings.MAIL_RETRY_BACKOFF * 2 ** (email.attempts - 1)
+        email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    email.save()
+
+
+def send_queued_mail(batch_size=None):
+    """
+    Sends one batch of due emails over a single mail server connection and
+    returns the number sent. Failed emails are retried with exponential
+    backoff and marked as failed once they run out of attempts.
+    """
+    batch_size = batch_size or settings.MAIL_BATCH_SIZE
+    sent = 0
+    with transaction.atomic():
+        # Other workers skip the rows locked by this one
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutboundEmail.QUEUED,
+                next_attempt_at__lte=timezone.now()
+            )[:batch_size]
+        )
+        if not batch:
+            return 0
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as error:
+            # Nothing in the batch can be sent without the mail server
+            for email in batch:
+                record_failure(email, error)
+            return 0
+        try:
+            for email in batch:
+                try:
+                    build_message(email, connection).send()
+                except Exception as error:
+                    record_failure(email, error)
+                    continue
+                email.attempts += 1
+                email.status = OutboundEmail.SENT
+                email.sent_at = timezone.now()
+                email.save()
+                sent += 1
+        finally:
+            connection.close()
+    return sent
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.core.mail import send_queued_mail
+
+
+class Command(BaseCommand):
+    help = 'Sends the emails waiting in the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='How many emails to send per connection'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the outbox instead of exiting once it is empty'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=5,
+            help='Seconds to wait between polls of an empty outbox'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            sent = send_queued_mail(batch_size=options['batch_size'])
+            total += sent
+            if sent:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write('Sent {} email(s)'.format(total))
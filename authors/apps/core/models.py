@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class TimeStampedModel(models.Model):
@@ -9,4 +10,35 @@ class TimeStampedModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        abstract=True
\ No newline at end of file
+        abstract=True
+
+class OutboundEmail(TimeStampedModel):
+    """An email waiting in, or already sent from, the outbox"""
+    QUEUED = 'queued'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (SENT, 'Sent'),
+        # Dead letters, gave up after MAIL_MAX_ATTEMPTS tries
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    html_message = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    # Comma separated list of recipient addresses
+    recipients = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+        ordering = ('next_attempt_at',)
+
+    def __str__(self):
+        return self.subject
@@ -0,0 +1,89 @@
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .mail import queue_mail, send_queued_mail
+from .models import OutboundEmail
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    """An email backend whose mail server is always down"""
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('mail server is down')
+
+
+class UnreachableEmailBackend(BaseEmailBackend):
+    """An email backend whose mail server cannot be connected to"""
+
+    def open(self):
+        raise ConnectionRefusedError('mail server is unreachable')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('never connected')
+
+
+class OutboxTest(TestCase):
+    """
+    Tests for the outbound email queue
+    """
+
+    def queue(self, recipients=('jane@doe.com',)):
+        return queue_mail(
+            'Subject', 'Message', 'no-reply@authors-heaven.com',
+            list(recipients), html_message='<p>Message</p>')
+
+    def test_queueing_does_not_send(self):
+        self.queue()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.QUEUED)
+
+    def test_worker_sends_queued_mail(self):
+        self.queue()
+        self.queue(recipients=('john@doe.com', 'jack@doe.com'))
+        self.assertEqual(send_queued_mail(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[1].to, ['john@doe.com', 'jack@doe.com'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.SENT).exists())
+
+    def test_worker_sends_in_batches(self):
+        for _ in range(3):
+            self.queue()
+        self.assertEqual(send_queued_mail(batch_size=2), 2)
+        self.assertEqual(send_queued_mail(batch_size=2), 1)
+
+    def test_mail_without_recipients_is_not_queued(self):
+        self.assertIsNone(self.queue(recipients=(None,)))
+
+    @override_settings(
+        EMAIL_BACKEND='authors.apps.core.test_mail.FailingEmailBackend',
+        MAIL_MAX_ATTEMPTS=2)
+    def test_failed_mail_is_retried_then_dead_lettered(self):
+        email = self.queue()
+        self.assertEqual(send_queued_mail(), 0)
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.QUEUED)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('mail server is down', email.last_error)
+
+        # Not due again until the backoff has passed
+        self.assertEqual(send_queued_mail(), 0)
+        self.assertEqual(OutboundEmail.objects.get().attempts, 1)
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        send_queued_mail()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.FAILED, 2))
+
+    @override_settings(EMAIL_BACKEND='authors.apps.core.test_mail.UnreachableEmailBackend')
+    def test_unreachable_mail_server_backs_off_the_batch(self):
+        self.queue()
+        self.queue()
+        self.assertEqual(send_queued_mail(), 0)
+        for email in OutboundEmail.objects.all():
+            self.assertEqual((email.status, email.attempts), (OutboundEmail.QUEUED, 1))
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            self.assertIn('mail server is unreachable', email.last_error)
+
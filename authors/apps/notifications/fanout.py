@@ -0,0 +1,129 @@
+# authors/apps/notifications/fanout.py
+# Delivers new article and comment notifications in bulk
+
+from django.conf import settings
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.html import escape
+
+from authors.apps.articles.feed import fan_out_article
+from authors.apps.authentication.models import User
+from authors.apps.core.mail import queue_mass_mail
+from authors.apps.notifications.models import UserNotifications, NotificationFanout
+
+# Stands in for the recipient's name so a batch renders the template once
+RECIPIENT_NAME = '__recipient_name__'
+
+
+def article_link(article):
+    return settings.DEFAULT_DOMAIN + "/api/articles/" + str(article.slug)
+
+
+def notify_users(recipients, article, author_id, notification):
+    """
+    Creates a notification and queues an email for every `(email, username)`
+    pair in `recipients`, rendering the email template only once
+    """
+    url = article_link(article)
+    UserNotifications.objects.bulk_create([
+        UserNotifications(
+            article=article,
+            notification=notification,
+            author_id=author_id,
+            recipient_id=email,
+            article_link=url
+        )
+        for email, username in recipients
+    ])
+    body = render_to_string('notification.html', {
+        'url': url,
+        'notification': notification,
+        'name': RECIPIENT_NAME
+    })
+    queue_mass_mail([
+        (
+            'You have a new notification',
+            'You have a new notification from authors haven',
+            'authors-haven@authors-heaven.com',
+            [email],
+            body.replace(RECIPIENT_NAME, escape(username))
+        )
+        for email, username in recipients
+    ])
+
+
+def recipients_for(job):
+    """
+    Returns the users `job` notifies, the subscribed followers of the author
+    for an article or the subscribed readers who favourited the article for
+    a comment, leaving out whoever wrote it
+    """
+    subscribers = User.objects.filter(is_subcribed=True)
+    if job.comment_id:
+        return subscribers.filter(
+            favourites__article=job.article_id
+        ).exclude(id=job.comment.author_id)
+    return subscribers.filter(profile__isfollowing=job.article.author.profile.id)
+
+
+def notification_for(job):
+    """Returns the notification text and the id stored as its author"""
+    article = job.article
+    if job.comment_id:
+        author = job.comment.author
+        return (author.username + " commented on this article about " + article.title), author.id
+    return (article.author.username + " created a new article about " + article.title), article.author_id
+
+
+def run_fanout(job, batch_size):
+    """
+    Notifies the next batch of recipients for `job` and returns how many
+    were notified, deleting the job once every recipient has been reached.
+    The first batch of a new article also writes it into the feeds of the
+    followers of its author.
+    """
+    if not job.comment_id and not job.last_user_id:
+        fan_out_article(job.article)
+    recipients = list(
+        recipients_for(job).filter(
+            id__gt=job.last_user_id
+        ).order_by('id').values_list('id', 'email', 'username')[:batch_size]
+    )
+    if recipients:
+        notification, author_id = notification_for(job)
+        notify_users(
+            [(email, username) for _, email, username in recipients],
+            job.article, author_id, notification
+        )
+    if len(recipients) < batch_size:
+        job.delete()
+    else:
+        job.last_user_id = recipients[-1][0]
+        job.save(update_fields=['last_user_id'])
+    return len(recipients)
+
+
+def pending_jobs():
+    """
+    Returns the fan-out jobs no other worker holds, locking only the job
+    row of the one taken. PostgreSQL refuses to lock the nullable side of
+    the outer join to the comment, and the article and users need no lock.
+    """
+    return NotificationFanout.objects.select_for_update(
+        skip_locked=True, of=('self',)
+    ).select_related('article__author', 'comment__author')
+
+
+def process_notifications(batch_size=None):
+    """
+    Works through the pending fan-out jobs one batch per transaction, so a
+    crashed worker resumes where it stopped. Returns the number notified.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    notified = 0
+    while True:
+        with transaction.atomic():
+            job = pending_jobs().first()
+            if job is None:
+                return notified
+            notified += run_fanout(job, batch_size)
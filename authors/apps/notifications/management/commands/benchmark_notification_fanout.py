@@ -0,0 +1,93 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from authors.apps.articles.models import ArticlesModel, Comment, Favourite
+from authors.apps.authentication.models import User
+from authors.apps.notifications.fanout import process_notifications
+from authors.apps.profiles.models import Profile
+
+
+class Rollback(Exception):
+    """Raised to throw away the data created for a benchmark run"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Times creating an article and notifying its followers for authors '
+        'with the given numbers of followers, or with --comments creating a '
+        'comment and notifying readers who favourited the article. Nothing '
+        'is kept in the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'followers', nargs='*', type=int, default=[10000, 100000],
+            help='Follower (or favouriting reader) counts to benchmark'
+        )
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument(
+            '--comments', action='store_true',
+            help='Benchmark comment notifications instead of article ones'
+        )
+
+    def handle(self, *args, **options):
+        kind = 'comment' if options['comments'] else 'article'
+        for followers in options['followers']:
+            try:
+                with transaction.atomic():
+                    create_time, fanout_time = self.run(
+                        followers, options['batch_size'], options['comments'])
+                    raise Rollback
+            except Rollback:
+                pass
+            self.stdout.write(
+                '{} users: {} created in {:.3f}s, '
+                'users notified in {:.3f}s'.format(followers, kind, create_time, fanout_time)
+            )
+
+    def run(self, followers, batch_size, comments=False):
+        author = User.objects.create_user('bench-author', 'bench-author@example.com')
+        User.objects.bulk_create([
+            User(
+                username='bench-follower-{}'.format(n),
+                email='bench-follower-{}@example.com'.format(n),
+                is_active=True,
+                is_subcribed=True
+            )
+            for n in range(followers)
+        ], batch_size=500)
+        users = User.objects.filter(username__startswith='bench-follower-')
+        Profile.objects.bulk_create(
+            [Profile(user_id=user_id) for user_id in users.values_list('id', flat=True)],
+            batch_size=500
+        )
+        if comments:
+            article = ArticlesModel.objects.create(
+                title='benchmark', description='benchmark', body='benchmark', author=author)
+            Favourite.objects.bulk_create([
+                Favourite(article=article, user_id=user_id)
+                for user_id in users.values_list('id', flat=True)
+            ], batch_size=500)
+            process_notifications()
+        else:
+            Follow = Profile.isfollowing.through
+            Follow.objects.bulk_create([
+                Follow(from_profile_id=profile_id, to_profile_id=author.profile.id)
+                for profile_id in Profile.objects.filter(
+                    user__in=users).values_list('id', flat=True)
+            ], batch_size=500)
+            # Bulk-created follows skip the signals keeping the count, which
+            # decides whether the article is written into every feed
+            Profile.objects.filter(pk=author.profile.pk).update(followers_count=followers)
+
+        start = time.perf_counter()
+        if comments:
+            Comment.objects.create(body='benchmark', author=author, article=article)
+        else:
+            ArticlesModel.objects.create(
+                title='benchmark', description='benchmark', body='benchmark', author=author)
+        created = time.perf_counter()
+        process_notifications(batch_size=batch_size)
+        return created - start, time.perf_counter() - created
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.notifications.fanout import process_notifications
+
+
+class Command(BaseCommand):
+    help = 'Delivers pending notifications to their recipients'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='How many recipients to notify per transaction'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new notifications instead of exiting'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=5,
+            help='Seconds to wait between polls when there is nothing to do'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            total += process_notifications(batch_size=options['batch_size'])
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write('Notified {} recipient(s)'.format(total))
@@ -0,0 +1,20 @@
+# Generated by Django 2.1.2 on 2026-10-18 16:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_favourite_article_user'),
+        ('notifications', '0002_notification_fanout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationfanout',
+            name='comment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='fanouts', to='articles.Comment'),
+        ),
+    ]
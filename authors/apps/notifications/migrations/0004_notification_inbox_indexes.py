@@ -0,0 +1,25 @@
+# Generated by Django 2.1.2 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_fanout_comment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usernotifications',
+            index=models.Index(fields=['recipient', '-created_at'], name='notificatio_recipie_d3ffa0_idx'),
+        ),
+        # Partial index for counting unread notifications, Django 2.1 cannot
+        # declare one on the model
+        migrations.RunSQL(
+            ['CREATE INDEX notifications_unread_idx '
+             'ON notifications_usernotifications (recipient_id) '
+             'WHERE NOT read_status'],
+            ['DROP INDEX notifications_unread_idx'],
+        ),
+    ]
@@ -3,7 +3,7 @@
 
 from django.db import models
 from authors.apps.authentication.models import User
-from authors.apps.articles.models import ArticlesModel
+from authors.apps.articles.models import ArticlesModel, Comment
 from django.utils.timezone import now
 
 
@@ -25,7 +25,29 @@ class UserNotifications(models.Model):
     class Meta:
         # Notice " - " : will order by created most recently
         ordering = ('-created_at',)
+        indexes = [
+            # Backs the cursor paginated inbox of each recipient
+            models.Index(fields=['recipient', '-created_at']),
+        ]
 
     def __str__(self):
         "return the notification"
-        return "{}".format(self.notification)
\ No newline at end of file
+        return "{}".format(self.notification)
+
+
+class NotificationFanout(models.Model):
+    """
+    A pending job, worked through in batches by `process_notifications`, to
+    notify the subscribed followers of an author about a new article or,
+    when `comment` is set, the subscribed readers who favourited the article
+    about a new comment on it
+    """
+    article = models.ForeignKey(ArticlesModel, related_name="fanouts", on_delete=models.CASCADE)
+    comment = models.ForeignKey(
+        Comment, related_name="fanouts", on_delete=models.CASCADE, null=True, blank=True)
+    # Followers are notified in user id order, up to and including this id
+    last_user_id = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('id',)
@@ -13,4 +13,12 @@ class NotificationSerializer(serializers.ModelSerializer):
         Notification fields to be returned to users
         """
         model = UserNotifications
-        fields = ("notification", "read_status", "created_at", "article", "author", "recipient", "article_link")
+        fields = ("id", "notification", "read_status", "created_at", "article", "author", "recipient", "article_link")
+
+
+class ReadNotificationsSerializer(serializers.Serializer):
+    """
+    The ids of the notifications to mark as read, all of them when omitted
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_null=True)
@@ -0,0 +1,136 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authors.apps.articles.models import ArticlesModel, Comment, Favourite
+from authors.apps.authentication.models import User
+from authors.apps.core.models import OutboundEmail
+from authors.apps.notifications.fanout import pending_jobs, process_notifications
+from authors.apps.notifications.models import UserNotifications, NotificationFanout
+
+
+class ArticleFanoutTest(TestCase):
+    """
+    Tests notifying followers about new articles in bulk
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', 'author@example.com')
+        self.followers = [self.create_follower(n) for n in range(3)]
+        self.create_follower('unsubscribed', subscribed=False)
+        stranger = User.objects.create_user('stranger', 'stranger@example.com')
+        stranger.is_subcribed = True
+        stranger.save()
+
+    def create_follower(self, name, subscribed=True):
+        user = User.objects.create_user(
+            'follower{}'.format(name), 'follower{}@example.com'.format(name))
+        user.is_subcribed = subscribed
+        user.save()
+        user.profile.follow(self.author.profile)
+        return user
+
+    def create_article(self):
+        return ArticlesModel.objects.create(
+            title='title', description='description', body='body', author=self.author)
+
+    def test_creating_an_article_only_queues_the_fanout(self):
+        self.create_article()
+        self.assertEqual(NotificationFanout.objects.count(), 1)
+        self.assertFalse(UserNotifications.objects.exists())
+
+    def test_subscribed_followers_are_notified(self):
+        self.create_article()
+        self.assertEqual(process_notifications(batch_size=2), 3)
+        recipients = set(UserNotifications.objects.values_list('recipient', flat=True))
+        self.assertEqual(recipients, {user.email for user in self.followers})
+        email = OutboundEmail.objects.get(recipients='follower1@example.com')
+        self.assertIn('follower1', email.html_message)
+        self.assertFalse(NotificationFanout.objects.exists())
+
+    def test_fanout_resumes_from_its_last_batch(self):
+        self.create_article()
+        process_notifications(batch_size=2)
+        self.create_article()
+        NotificationFanout.objects.update(last_user_id=self.followers[1].id)
+        self.assertEqual(process_notifications(), 1)
+
+    def test_query_count_does_not_grow_with_followers(self):
+        self.create_article()
+        with CaptureQueriesContext(connection) as few:
+            process_notifications()
+        for n in range(3, 10):
+            self.create_follower(n)
+        self.create_article()
+        with CaptureQueriesContext(connection) as many:
+            process_notifications()
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+
+class CommentFanoutTest(TestCase):
+    """
+    Tests notifying readers who favourited an article about new comments
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', 'author@example.com')
+        self.article = ArticlesModel.objects.create(
+            title='title', description='description', body='body', author=self.author)
+        self.readers = [self.create_reader(n) for n in range(3)]
+        process_notifications()
+        UserNotifications.objects.all().delete()
+
+    def create_reader(self, name, subscribed=True, favourite=True):
+        user = User.objects.create_user(
+            'reader{}'.format(name), 'reader{}@example.com'.format(name))
+        user.is_subcribed = subscribed
+        user.save()
+        if favourite:
+            Favourite.objects.create(user=user, article=self.article)
+        return user
+
+    def comment(self, author):
+        return Comment.objects.create(body='comment', author=author, article=self.article)
+
+    def notified(self):
+        return set(UserNotifications.objects.values_list('recipient', flat=True))
+
+    def test_readers_who_favourited_are_notified(self):
+        self.create_reader('unsubscribed', subscribed=False)
+        self.create_reader('other', favourite=False)
+        self.comment(self.author)
+        self.assertEqual(process_notifications(), 3)
+        self.assertEqual(self.notified(), {user.email for user in self.readers})
+
+    def test_commenter_is_not_notified(self):
+        self.comment(self.readers[0])
+        process_notifications()
+        self.assertEqual(self.notified(), {user.email for user in self.readers[1:]})
+
+    def test_query_count_does_not_grow_with_users(self):
+        self.comment(self.author)
+        with CaptureQueriesContext(connection) as few:
+            process_notifications()
+        for n in range(3, 10):
+            self.create_reader(n)
+            self.create_reader('other{}'.format(n), favourite=False)
+        self.comment(self.author)
+        with CaptureQueriesContext(connection) as many:
+            process_notifications()
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Locking rows needs PostgreSQL')
+class PendingJobsTest(TestCase):
+    """
+    Tests the SQL taking a fan-out job on PostgreSQL
+    """
+
+    def test_only_the_job_row_is_locked(self):
+        with CaptureQueriesContext(connection) as context:
+            list(pending_jobs()[:1])
+        sql = context.captured_queries[-1]['sql']
+        self.assertIn('LEFT OUTER JOIN "articles_comment"', sql)
+        self.assertIn('FOR UPDATE OF "notifications_notificationfanout" SKIP LOCKED', sql)
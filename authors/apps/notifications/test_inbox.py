@@ -0,0 +1,62 @@
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.articles.tests.base_tests import BaseTest
+from authors.apps.authentication.models import User
+from authors.apps.notifications.models import UserNotifications
+
+
+class TestNotificationInbox(BaseTest):
+    """
+    Tests for the paginated notification inbox
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_and_login_user(self.user2)
+        other = User.objects.get(email=self.user2['user']['email'])
+        self.token = self.create_and_login_user()
+        self.me = User.objects.get(email=self.user['user']['email'])
+        article = ArticlesModel.objects.create(
+            title='title', description='description', body='body', author=other)
+        for recipient, count in ((self.me, 15), (other, 5)):
+            for n in range(count):
+                UserNotifications.objects.create(
+                    article=article, author_id=other.id, recipient=recipient,
+                    notification='notification {}'.format(n))
+        self.inbox = reverse('notifications:notification')
+
+    def test_inbox_only_has_own_notifications(self):
+        response = self.client.get(self.inbox, {'page_size': 20})
+        self.assertEqual(len(response.data['notifications']), 15)
+
+    def test_inbox_is_paginated_with_a_cursor(self):
+        response = self.client.get(self.inbox)
+        self.assertEqual(len(response.data['notifications']), 10)
+        self.assertIn('cursor=', response.data['next'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['notifications']), 5)
+        self.assertIsNone(response.data['next'])
+
+    def test_unread_count_and_mark_as_read(self):
+        unread = reverse('notifications:unread')
+        read = reverse('notifications:read')
+        self.assertEqual(self.client.get(unread).data['unread'], 15)
+
+        ids = list(UserNotifications.objects.filter(
+            recipient=self.me).values_list('id', flat=True)[:3])
+        response = self.client.post(read, {'ids': ids}, format='json')
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(self.client.get(unread).data['unread'], 12)
+
+        response = self.client.post(read, format='json')
+        self.assertEqual(response.data['updated'], 12)
+        self.assertEqual(self.client.get(unread).data['unread'], 0)
+
+    def test_mark_as_read_rejects_invalid_ids(self):
+        for ids in ('all', ['x'], [{}]):
+            response = self.client.post(
+                reverse('notifications:read'), {'ids': ids}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('ids', response.data['errors'])
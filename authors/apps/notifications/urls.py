@@ -1,5 +1,6 @@
 from django.urls import path
-from .views import NotificationAPIView, SubscribeAPIView, UnSubscribeAPIView
+from .views import (NotificationAPIView, SubscribeAPIView, UnSubscribeAPIView,
+                    UnreadNotificationsAPIView, ReadNotificationsAPIView)
 
 app_name = 'notifications'
 
@@ -7,4 +8,6 @@ urlpatterns = [
     path('notifications/', NotificationAPIView.as_view(), name='notification'),
     path('notifications/subscribe/', SubscribeAPIView.as_view(), name='subscribe'),
     path('notifications/unsubscribe/', UnSubscribeAPIView.as_view(), name='unsubscribe'),
+    path('notifications/unread/', UnreadNotificationsAPIView.as_view(), name='unread'),
+    path('notifications/read/', ReadNotificationsAPIView.as_view(), name='read'),
 ]
\ No newline at end of file
@@ -1,7 +1,9 @@
 #  authors/apps/notifications
 # Contains the views for the notifications
 
+from django.conf import settings
 from rest_framework import generics
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.renderers import JSONRenderer
@@ -10,19 +12,73 @@ from authors.apps.authentication.models import User
 from rest_framework.permissions import IsAuthenticated
 
 from authors.apps.authentication.serializers import (UserSerializer)
-from .serializers import NotificationSerializer
+from .serializers import NotificationSerializer, ReadNotificationsSerializer
+
+
+class NotificationPagination(CursorPagination):
+    """
+    Keyset pagination over an inbox, so deep pages cost the same as the
+    first one however many notifications there are
+    """
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+    ordering = '-created_at'
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "notifications": data
+        })
 
 
 class NotificationAPIView(generics.ListAPIView):
     """
-    A View that returns notifications
+    A View that returns the notifications of the authenticated user
     """
     renderer_classes = (JSONRenderer, )
     permission_classes = (IsAuthenticated,)
-    def get(self, request, format=None):
-        notifications = UserNotifications.objects.all()
-        serializer = NotificationSerializer(notifications, many=True, read_only=True)
-        return Response({"notifications": serializer.data})
+    serializer_class = NotificationSerializer
+    pagination_class = NotificationPagination
+
+    def get_queryset(self):
+        return UserNotifications.objects.filter(recipient=self.request.user.email)
+
+
+class UnreadNotificationsAPIView(generics.GenericAPIView):
+    """
+    A view that returns how many unread notifications the user has
+    """
+    renderer_classes = (JSONRenderer, )
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        unread = UserNotifications.objects.filter(
+            recipient=request.user.email, read_status=False
+        ).count()
+        return Response({"unread": unread})
+
+
+class ReadNotificationsAPIView(generics.GenericAPIView):
+    """
+    A view for marking notifications as read, the ones whose ids are given
+    or all of them when no ids are given
+    """
+    renderer_classes = (JSONRenderer, )
+    permission_classes = (IsAuthenticated,)
+    serializer_class = ReadNotificationsSerializer
+
+    def post(self, request):
+        notifications = UserNotifications.objects.filter(
+            recipient=request.user.email, read_status=False)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.get("ids")
+        if ids is not None:
+            notifications = notifications.filter(id__in=ids)
+        updated = notifications.update(read_status=True)
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
 
 
 class SubscribeAPIView(generics.ListAPIView):
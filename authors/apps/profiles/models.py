@@ -1,11 +1,38 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from authors.apps.core.models import TimeStampedModel
 
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
 
 from authors import settings
 
+class ProfileQuerySet(models.QuerySet):
+    """Queryset helpers for profiles"""
+
+    def rebuild_follow_counts(self):
+        """
+        Recomputes the follower and following counts of these profiles from
+        the follow table and returns the number of profiles updated
+        """
+        Follow = Profile.isfollowing.through
+
+        def count_by(field):
+            return Coalesce(Subquery(
+                Follow.objects.filter(**{field: OuterRef('pk')})
+                .order_by()
+                .values(field)
+                .annotate(total=Count('pk'))
+                .values('total')
+            ), 0)
+
+        return self.update(
+            followers_count=count_by('to_profile'),
+            following_count=count_by('from_profile'),
+        )
+
+
 # Create your models here.
 class Profile(TimeStampedModel):
     """
@@ -18,14 +45,67 @@ class Profile(TimeStampedModel):
     # the Profile model back to itself.
     # symmetrical=False results in creating one row
     isfollowing= models.ManyToManyField('self', related_name='is_following',symmetrical=False)
+
+    # Denormalized from the follow table by `follow` and `unfollow`
+    followers_count = models.IntegerField(default=0)
+    following_count = models.IntegerField(default=0)
+
+    COUNTER_FIELDS = ('followers_count', 'following_count')
+
+    objects = ProfileQuerySet.as_manager()
+
     def __str__(self):
         return self.user.username
 
+    def save(self, *args, **kwargs):
+        # Never write back counts read earlier, they may be stale by now
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def follow(self, profile):
-        self.isfollowing.add(profile)
+        """Follows `profile`, returning False if it was already followed"""
+        Follow = Profile.isfollowing.through
+        with transaction.atomic():
+            _, created = Follow.objects.get_or_create(
+                from_profile_id=self.pk, to_profile_id=profile.pk)
+            if created:
+                Profile.objects.filter(pk=self.pk).update(following_count=F('following_count') + 1)
+                Profile.objects.filter(pk=profile.pk).update(followers_count=F('followers_count') + 1)
+        if created:
+            self.follows_changed('post_add', profile)
+        return created
 
     def unfollow(self, profile):
-        self.isfollowing.remove(profile)
+        """Unfollows `profile`, returning False if it was not followed"""
+        Follow = Profile.isfollowing.through
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(
+                from_profile_id=self.pk, to_profile_id=profile.pk).delete()
+            if deleted:
+                Profile.objects.filter(pk=self.pk).update(following_count=F('following_count') - 1)
+                Profile.objects.filter(pk=profile.pk).update(followers_count=F('followers_count') - 1)
+        if deleted:
+            self.follows_changed('post_remove', profile)
+        return bool(deleted)
+
+    def follows_changed(self, action, profile):
+        # Writing the follow table directly skips the signals that adding to
+        # and removing from `isfollowing` send, so they are sent here
+        m2m_changed.send(
+            sender=Profile.isfollowing.through, instance=self, action=action,
+            reverse=False, model=Profile, pk_set={profile.pk}, using=self._state.db)
+
+    def followed_usernames(self, usernames):
+        """Returns which of `usernames` this profile follows, in one query"""
+        return set(
+            Profile.isfollowing.through.objects.filter(
+                from_profile_id=self.pk, to_profile__user__username__in=list(usernames)
+            ).values_list('to_profile__user__username', flat=True)
+        )
 
     def followers(self, profile):
         return profile.is_following.all()
@@ -39,7 +39,31 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Profile
-        fields = ('username', 'bio', 'image_url', 'isfollowing', 'created_at', 'updated_at')
+        fields = (
+            'username', 'bio', 'image_url', 'isfollowing',
+            'followers_count', 'following_count', 'created_at', 'updated_at'
+        )
+        read_only_fields = ('followers_count', 'following_count')
+
+
+class ProfileSummarySerializer(serializers.ModelSerializer):
+    """
+    Serializes a profile with how many profiles follow it and it follows
+    instead of listing them, and whether the requesting user follows it
+    """
+    username = serializers.CharField(source='user.username', read_only=True)
+    followed_by_me = serializers.SerializerMethodField()
+
+    def get_followed_by_me(self, obj):
+        # Annotated by the views listing profiles
+        return getattr(obj, 'followed_by_me', False)
+
+    class Meta:
+        model = Profile
+        fields = (
+            'username', 'bio', 'image_url',
+            'followers_count', 'following_count', 'followed_by_me'
+        )
 
 class ProfileListSerializer(serializers.ModelSerializer):
     """
@@ -48,7 +72,8 @@ class ProfileListSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     bio = serializers.CharField()
     image = serializers.ImageField(default=None)
-    isfollowing = serializers.BooleanField()
+    # Annotated by the view listing profiles
+    isfollowing = serializers.BooleanField(source='followed_by_me', read_only=True)
     class Meta:
         model = Profile
         fields = ['username', 'bio', 'image','isfollowing']
@@ -4,6 +4,8 @@ from rest_framework.authtoken.models import Token
 from rest_framework.reverse import reverse
 from rest_framework import status
 import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from ..models import Profile
 from ...authentication.models import User
 
@@ -61,3 +63,43 @@ class TestProfileListApi(APITestCase):
     def test_wrong_url(self):
         response =self.client.get('/api/profile')
         self.assertEqual(response.status_code, 404)
+
+    def test_profiles_are_paged_in_username_order(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.token)
+        response = self.client.get(self.url, {'page_size': 2})
+        content = json.loads(response.content)
+        self.assertEqual(
+            [profile['username'] for profile in content['profiles']], ['kevin', 'kibitok'])
+        self.assertIsNone(content['previous'])
+        response = self.client.get(content['next'])
+        content = json.loads(response.content)
+        self.assertEqual([profile['username'] for profile in content['profiles']], ['koech'])
+        self.assertIsNone(content['next'])
+
+    def test_profiles_can_be_searched_by_username_prefix(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.token)
+        response = self.client.get(self.url, {'search': 'ko'})
+        content = json.loads(response.content)['profiles']
+        self.assertEqual([profile['username'] for profile in content], ['koech'])
+
+    def test_profiles_show_who_is_followed(self):
+        me = User.objects.get(username='username').profile
+        me.follow(User.objects.get(username='koech').profile)
+        self.client.credentials(HTTP_AUTHORIZATION=self.token)
+        content = json.loads(self.client.get(self.url).content)['profiles']
+        self.assertEqual(
+            {profile['username']: profile['isfollowing'] for profile in content},
+            {'kevin': False, 'kibitok': False, 'koech': True})
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.token)
+
+        def count_queries(page_size):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(self.url, {'page_size': page_size})
+            self.assertEqual(len(json.loads(response.content)['profiles']), page_size)
+            return len(context.captured_queries)
+
+        # Warm the authentication cache so both requests look the user up alike
+        count_queries(1)
+        self.assertEqual(count_queries(1), count_queries(3))
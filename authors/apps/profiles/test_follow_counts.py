@@ -0,0 +1,96 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from authors.apps.authentication.models import User
+from .models import Profile
+
+
+class FollowGraphTest(APITestCase):
+    """
+    Tests for follow counts and paging through follows
+    """
+
+    def setUp(self):
+        self.users = []
+        for name in ('jane', 'john', 'jack', 'jill'):
+            user = User.objects.create_user(name + 'Doe', name + '@doe.com', 'janedoe123')
+            user.is_active = True
+            user.save()
+            self.users.append(user)
+        self.jane, self.john, self.jack, self.jill = [user.profile for user in self.users]
+        self.client.credentials(HTTP_AUTHORIZATION=self.users[0].token)
+
+    def counts(self, profile):
+        profile = Profile.objects.get(pk=profile.pk)
+        return profile.followers_count, profile.following_count
+
+    def test_follows_are_counted_once(self):
+        self.assertTrue(self.jane.follow(self.john))
+        self.assertFalse(self.jane.follow(self.john))
+        self.jack.follow(self.john)
+        self.assertEqual(self.counts(self.john), (2, 0))
+        self.assertEqual(self.counts(self.jane), (0, 1))
+        self.assertTrue(self.jane.unfollow(self.john))
+        self.assertFalse(self.jane.unfollow(self.john))
+        self.assertEqual(self.counts(self.john), (1, 0))
+        self.assertEqual(self.counts(self.jane), (0, 0))
+
+    def test_follow_responses_show_the_new_counts(self):
+        url = reverse('profiles:follow', kwargs={'username': 'johnDoe'})
+        response = self.client.post(url)
+        self.assertEqual(
+            (response.data['username'], response.data['following_count']), ('janeDoe', 1))
+        response = self.client.delete(url)
+        self.assertEqual(response.data['following_count'], 0)
+
+    def test_rebuild_follow_counts(self):
+        self.jane.follow(self.john)
+        Profile.objects.update(followers_count=0, following_count=5)
+        Profile.objects.rebuild_follow_counts()
+        self.assertEqual(self.counts(self.john), (1, 0))
+        self.assertEqual(self.counts(self.jane), (0, 1))
+
+    def test_saving_a_profile_keeps_its_counts(self):
+        profile = Profile.objects.get(pk=self.john.pk)
+        self.jane.follow(self.john)
+        profile.bio = 'new bio'
+        profile.save()
+        self.assertEqual(self.counts(self.john), (1, 0))
+
+    def test_followers_are_paginated(self):
+        for profile in (self.jane, self.jack, self.jill):
+            profile.follow(self.john)
+        self.jane.follow(self.jill)
+        url = reverse('profiles:followers', kwargs={'username': 'johnDoe'})
+        page = self.client.get(url, {'page_size': 2}).data
+        self.assertEqual([p['username'] for p in page['profiles']], ['jillDoe', 'jackDoe'])
+        self.assertEqual(
+            [p['followed_by_me'] for p in page['profiles']], [True, False])
+        self.assertEqual(page['profiles'][0]['followers_count'], 1)
+        self.assertNotIn('isfollowing', page['profiles'][0])
+        page = self.client.get(page['next']).data
+        self.assertEqual([p['username'] for p in page['profiles']], ['janeDoe'])
+
+    def test_following_is_paginated(self):
+        self.john.follow(self.jack)
+        url = reverse('profiles:following', kwargs={'username': 'johnDoe'})
+        page = self.client.get(url).data
+        self.assertEqual([p['username'] for p in page['profiles']], ['jackDoe'])
+        self.assertIsNone(page['next'])
+
+    def test_follow_status_in_one_query(self):
+        self.jane.follow(self.john)
+        self.jane.follow(self.jill)
+        url = reverse('profiles:follow-status')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'usernames': 'johnDoe,jackDoe,jillDoe,nobody'})
+        self.assertEqual(response.data['following'], {
+            'johnDoe': True, 'jackDoe': False, 'jillDoe': True, 'nobody': False})
+        follow_queries = [
+            query for query in context.captured_queries
+            if 'profiles_profile_isfollowing' in query['sql']
+        ]
+        self.assertEqual(len(follow_queries), 1)
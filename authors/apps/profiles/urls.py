@@ -1,7 +1,7 @@
 from django.urls import path
 from rest_framework.urlpatterns import format_suffix_patterns
 
-from .views import ProfileAPIView, ProfileListAPIView, FollowCreate,Following,FollowedBy
+from .views import ProfileAPIView, ProfileListAPIView, FollowCreate,Following,FollowedBy,FollowStatusAPIView
 
 app_name = "profiles"
 
@@ -10,7 +10,8 @@ urlpatterns = [
     path('profiles/<username>/', ProfileAPIView.as_view(), name='user-profile'),
     path('profile/<username>/follow/', FollowCreate.as_view(), name='follow'),
     path('profile/<username>/following/', Following.as_view(), name='following'),
-    path('profile/<username>/followers/', FollowedBy.as_view(), name='followers')
+    path('profile/<username>/followers/', FollowedBy.as_view(), name='followers'),
+    path('profile/follows/', FollowStatusAPIView.as_view(), name='follow-status')
 ]
 
 urlpatterns = format_suffix_patterns(urlpatterns)
\ No newline at end of file
@@ -4,14 +4,16 @@ from rest_framework.exceptions import NotFound
 from rest_framework.serializers import ValidationError
 from rest_framework import status, generics
 from rest_framework.response import Response
-from rest_framework.pagination import LimitOffsetPagination
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework.generics import CreateAPIView, ListAPIView
 from rest_framework import status
 
 from authors.apps.authentication.models import User
 from .models import Profile
 from .renderers import ProfileJSONRenderer, ProfilesJSONRenderer
-from .serializers import ProfileSerializer, ProfileListSerializer
+from .serializers import ProfileSerializer, ProfileListSerializer, ProfileSummarySerializer
 from authors.apps.authentication.serializers import UserSerializer
 
 def current_profile(request):
@@ -59,7 +61,7 @@ class ProfileAPIView(APIView):
 class FollowCreate(CreateAPIView):
 
     permission_classes = (IsAuthenticated,)
-    serializer_class = ProfileSerializer
+    serializer_class = ProfileSummarySerializer
 
     def post(self, request, username):
         """Follow user"""
@@ -80,6 +82,8 @@ class FollowCreate(CreateAPIView):
 
         # Add user
         following_user.follow(followed_user)
+        # The counts were moved in the database, not on this instance
+        following_user.refresh_from_db(fields=['followers_count', 'following_count'])
 
         serialize = self.serializer_class(following_user, context={'request': request})
         return Response(data=serialize.data, status=status.HTTP_201_CREATED)
@@ -104,63 +108,123 @@ class FollowCreate(CreateAPIView):
 
         # unfollow user
         following_user.unfollow(followed_user)
+        # The counts were moved in the database, not on this instance
+        following_user.refresh_from_db(fields=['followers_count', 'following_count'])
 
         serialize = self.serializer_class(following_user, context={'request': request})
         return Response(data=serialize.data, status=status.HTTP_200_OK)
 
-class Following(generics.RetrieveAPIView):
+class FollowPagination(CursorPagination):
+    """Pages through follows, most recent first"""
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+    ordering = '-id'
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "profiles": data
+        })
+
+
+class FollowListAPIView(generics.ListAPIView):
     """
-    Get all the users a user follows
+    Base view paging through one side of the follows of a user, straight
+    from the follow table with each profile, its counts and whether the
+    requesting user follows it loaded in the same query
     """
     permission_classes = (IsAuthenticated,)
-    serializer_class = ProfileSerializer
+    serializer_class = ProfileSummarySerializer
+    pagination_class = FollowPagination
+    # The side of the follow table the user is on and the side listed
+    user_side = None
+    listed_side = None
 
-    def get(self, request, username):
-        """Following"""
+    def get_queryset(self):
+        try:
+            profile = followed_profile(self.kwargs['username'])
+        except Profile.DoesNotExist:
+            raise NotFound('Profile not found')
+        Follow = Profile.isfollowing.through
+        return Follow.objects.filter(**{self.user_side: profile}).select_related(
+            '{}__user'.format(self.listed_side)
+        ).annotate(followed_by_me=Exists(Follow.objects.filter(
+            from_profile=current_profile(self.request),
+            to_profile=OuterRef('{}_id'.format(self.listed_side))
+        )))
+
+    def list(self, request, *args, **kwargs):
+        profiles = []
+        for follow in self.paginate_queryset(self.get_queryset()):
+            profile = getattr(follow, self.listed_side)
+            profile.followed_by_me = follow.followed_by_me
+            profiles.append(profile)
+        serializer = self.get_serializer(profiles, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class Following(FollowListAPIView):
+    """
+    Get all the users a user follows
+    """
+    user_side = 'from_profile'
+    listed_side = 'to_profile'
 
-        following_user = current_profile(request)
-        followed_user = followed_profile(username)
 
-        following = following_user.following(followed_user)
+class FollowedBy(FollowListAPIView):
+    """
+    Get all the users who follow a user
+    """
+    user_side = 'to_profile'
+    listed_side = 'from_profile'
 
-        serializer = self.serializer_class(following, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
-class FollowedBy(generics.RetrieveAPIView):
+class FollowStatusAPIView(APIView):
     """
-    Get all the users who follow a user
+    Tells which of the users in `?usernames=a,b,c` the requesting user
+    follows, with a single query
     """
     permission_classes = (IsAuthenticated,)
-    serializer_class = ProfileSerializer
 
-    def get(self, request, username):
-        """Followers"""
-
-        following_user = current_profile(request)
-        followed_user = followed_profile(username)
+    def get(self, request):
+        usernames = [name for name in request.query_params.get('usernames', '').split(',') if name]
+        followed = current_profile(request).followed_usernames(usernames)
+        return Response(
+            {'following': {username: username in followed for username in usernames}},
+            status=status.HTTP_200_OK
+        )
 
-        follower = following_user.followers(followed_user)
+class ProfileDirectoryPagination(FollowPagination):
+    """Pages through profiles in username order"""
+    ordering = 'username'
 
-        serializer = self.serializer_class(follower, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
 class ProfileListAPIView(ListAPIView):
+    """
+    List of profiles for other users, in username order, optionally only
+    those whose username starts with `?search=`. The prefix match is served
+    by the pattern index PostgreSQL keeps on the unique username column.
+    """
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ProfilesJSONRenderer,)
-
-    def get(self, request):
-        """
-        List of profiles for other users
-        """
-        try:
-            queryset = Profile.objects.all().exclude(user=request.user)
-        except Profile.DoesNotExist:
-            message = Response(
-                    {
-                        'message': 'Profile not found'
-                    },
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        serializer = ProfileListSerializer(queryset, many=True)
-        message = Response({'profiles': serializer.data}, status=status.HTTP_200_OK)
-        return message
+    serializer_class = ProfileListSerializer
+    pagination_class = ProfileDirectoryPagination
+
+    def get_queryset(self):
+        Follow = Profile.isfollowing.through
+        queryset = Profile.objects.exclude(user=self.request.user).select_related(
+            'user'
+        ).only('bio', 'user__username').annotate(
+            # Cursors are read from and compared with the annotation
+            username=F('user__username'),
+            followed_by_me=Exists(Follow.objects.filter(
+                from_profile=current_profile(self.request),
+                to_profile=OuterRef('pk')
+            ))
+        )
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(user__username__startswith=search)
+        return queryset
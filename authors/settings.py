@@ -204,10 +204,64 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 
+# Outgoing email is queued in the outbox and sent by `send_queued_mail`,
+# failed emails are retried after MAIL_RETRY_BACKOFF seconds, doubling
+# on every attempt, until they have been tried MAIL_MAX_ATTEMPTS times
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 100))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", 5))
+MAIL_RETRY_BACKOFF = int(os.getenv("MAIL_RETRY_BACKOFF", 60))
+
+# How many recipients `process_notifications` notifies per transaction
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", 1000))
+
+# The default cache is local to each process. Cached article responses
+# and tag counts are invalidated by writes in any web worker or in the
+# workers, so they are kept in a cache every process shares, named by
+# SHARED_CACHE_BACKEND and SHARED_CACHE_LOCATION, such as memcached. Without
+# one the shared cache is local to each process too, and caching it is off
+# unless turned on below.
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND")
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': SHARED_CACHE_BACKEND or 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': os.getenv("SHARED_CACHE_LOCATION", ''),
+    },
+}
+ARTICLE_CACHE_ALIAS = 'shared'
+
+# Seconds an authenticated user and a decoded token are cached for, 0
+# turns caching off. Saving or deleting a user drops their cached copy
+# from the AUTH_CACHE_ALIAS cache every process shares.
+AUTH_CACHE_ALIAS = 'shared'
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 30 if SHARED_CACHE_BACKEND else 0))
+
+# Seconds article reads by readers who are not logged in are cached for, 0
+# turns the cache off. Writes invalidate the cached responses they affect
+# in every process, through the ARTICLE_CACHE_ALIAS cache.
+ARTICLE_CACHE_TTL = int(os.getenv("ARTICLE_CACHE_TTL", 300 if SHARED_CACHE_BACKEND else 0))
+
+# New articles are written into the home feed of each follower of their
+# author, unless the author has at least this many followers. The articles
+# of those authors are merged into the feeds of their followers when read.
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", 1000))
+
 # app default domain
 DEFAULT_DOMAIN = 'https://ah-shakas.herokuapp.com'
 
 #Words per minute(WPM)
 WPM = 250
-PAGE_SIZE = os.getenv("PAGE_SIZE")
-MAX_PAGE_SIZE = os.getenv("MAX_PAGE_SIZE")
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", 10))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
+
+# Reading stats are buffered in memory and written in bulk once this many
+# views are waiting or, from a background timer, this many seconds after
+# the first of them arrived. A crash loses the buffered views, set the
+# size to 1 to write every view. The `stats` process rolls written views
+# up into daily totals.
+STATS_BUFFER_SIZE = int(os.getenv("STATS_BUFFER_SIZE", 100))
+STATS_FLUSH_INTERVAL = int(os.getenv("STATS_FLUSH_INTERVAL", 10))
+# Days raw views are kept once they have been rolled up into daily totals
+STATS_RAW_RETENTION_DAYS = int(os.getenv("STATS_RAW_RETENTION_DAYS", 30))